@@ -0,0 +1,134 @@
+"""
+Benchmark the load time and memory of the Skelerest component for large request catalogs
+
+The synthetic catalog mimics a generated skelebot.yaml: every request has variables in its
+endpoint, params, headers, and body, and shares its header names, param names, and defaults with
+the other requests. The catalog is decoded from text for every load (as Skelebot does with its
+YAML) so that the strings it holds are not shared between requests unless the component interns
+them. Memory is traced on a separate load as tracing slows the load down considerably.
+
+With `--catalogs N` the requests are also split across N included catalog files, and the load is
+measured both without (cold) and with (warm) the cached index of the catalogs.
+
+    python jobs/benchmark_config.py --requests 10000 --catalogs 20
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skelerest.skelerest import Skelerest # noqa: E402
+
+METHODS = ["GET", "POST", "PUT", "DELETE"]
+
+def build_config(size):
+    """ Build a synthetic component config with the given number of requests """
+
+    requests = []
+    for i in range(size):
+        method = METHODS[i % len(METHODS)]
+        request = {
+            "name": f"resource-{i // len(METHODS)}",
+            "endpoint": f"https://api.example.com/v1/resource-{i // len(METHODS)}/{{id}}",
+            "method": method,
+            "params": [
+                {"name": "limit", "value": "{limit:100}"},
+                {"name": "region", "value": "{region:us-east-1}"}
+            ],
+            "headers": [
+                {"name": "Content-Type", "value": "application/json"},
+                {"name": "Authorization", "value": "Bearer {token}"}
+            ]
+        }
+        if (method in ["POST", "PUT"]):
+            request["body"] = {"parent": "{parent}", "name": "{name:default}", "enabled": True}
+        requests.append(request)
+
+    return json.dumps({"requests": requests})
+
+def measure_memory(text):
+    """ Load the component from the text of its config, returning the bytes of memory it retains """
+
+    gc.collect()
+    tracemalloc.start()
+    skelerest = Skelerest.load(json.loads(text))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The component is only released once its memory has been measured
+    del skelerest
+    return retained
+
+def measure(text):
+    """
+    Load the component from the text of its config, returning the seconds taken to load the
+    component, to add its parsers, and to look up every command
+    """
+
+    config = json.loads(text)
+    start = time.perf_counter()
+    skelerest = Skelerest.load(config)
+    elapsed = time.perf_counter() - start
+
+    parser = argparse.ArgumentParser()
+    start = time.perf_counter()
+    skelerest.addParsers(parser.add_subparsers(dest="job"))
+    parsers = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for cmd in skelerest.requests:
+        assert cmd in skelerest.commands
+    lookups = time.perf_counter() - start
+
+    return elapsed, parsers, lookups
+
+def measure_include(text, catalogs):
+    """
+    Load the component with its requests split across included catalogs, returning the seconds
+    taken to load the component without and with the cached index of the catalogs
+    """
+
+    requests = json.loads(text)["requests"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(catalogs):
+            with open(os.path.join(tmp_dir, f"catalog-{i}.yaml"), "w") as catalog_file:
+                # JSON is a subset of YAML, and is much faster to write
+                json.dump({"requests": requests[i::catalogs]}, catalog_file)
+
+        config = {"include": [os.path.join(tmp_dir, "*.yaml")]}
+        with mock.patch("skelerest.catalog.INDEX_FILE", os.path.join(tmp_dir, "index.json")):
+            start = time.perf_counter()
+            Skelerest.load(config)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            Skelerest.load(config)
+            warm = time.perf_counter() - start
+
+    return cold, warm
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", default=10000, type=int, help="Number of synthetic requests (DEFAULT: 10000)")
+    parser.add_argument("--repeat", default=3, type=int, help="Number of runs, the best of which is reported (DEFAULT: 3)")
+    parser.add_argument("--catalogs", default=0, type=int, help="Number of included catalogs the requests are also split across (DEFAULT: 0)")
+    args = parser.parse_args()
+
+    text = build_config(args.requests)
+    elapsed, parsers, lookups = [min(times) for times in zip(*[measure(text) for i in range(args.repeat)])]
+    retained = measure_memory(text)
+    print(f"requests : {args.requests}")
+    print(f"load     : {elapsed:.3f}s")
+    print(f"memory   : {retained / 1024 / 1024:.2f} MiB ({retained // args.requests} bytes per request)")
+    print(f"parsers  : {parsers:.3f}s")
+    print(f"commands : {lookups:.3f}s to look up every command")
+    if (args.catalogs > 0):
+        cold, warm = measure_include(text, args.catalogs)
+        print(f"include  : {cold:.3f}s without the index, {warm:.3f}s with the index ({args.catalogs} catalogs)")
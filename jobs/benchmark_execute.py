@@ -0,0 +1,164 @@
+"""
+Benchmark the end to end execution of Skelerest commands against the local stub API
+
+Every scenario runs the real `Skelerest.execute` path (rendering, sending, and writing the output
+of the requests) against a stub server on a background thread, so the overhead of the plugin and
+the features built for throughput can be measured offline. The best time of each scenario is
+reported, and can be saved and compared against a baseline to catch regressions.
+
+    python jobs/benchmark_execute.py --rows 500 --save baseline.json
+    python jobs/benchmark_execute.py --rows 500 --baseline baseline.json --tolerance 0.25
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from skelerest.skelerest import Skelerest # noqa: E402
+from skelerest.stub import StubServer # noqa: E402
+
+LATENCY = 20
+ITEMS = 20000
+EVENTS = 2000
+UPLOAD_MIB = 64
+
+def build_config(url):
+    """ Build the component config with a request for every route of the stub used by the scenarios """
+
+    return {"requests": [
+        {"name": "echo", "endpoint": f"{url}/echo/{{id:0}}", "method": "GET",
+         "params": [{"name": "latency", "value": "{latency:0}"}]},
+        {"name": "items", "endpoint": f"{url}/items/{{count}}", "method": "GET",
+         "extract": {"id": "$.id", "owner": "$.owner.id"}},
+        {"name": "events", "endpoint": f"{url}/stream/{{count}}", "method": "GET", "stream": "ndjson"},
+        {"name": "upload", "endpoint": f"{url}/upload", "method": "PUT", "file": "{path}"}
+    ]}
+
+class Runner:
+    """ Executes Skelerest commands in-process, as Skelebot would from the command line """
+
+    skelerest = None
+    parser = None
+    directory = None
+
+    def __init__(self, url, directory):
+        self.skelerest = Skelerest.load(build_config(url))
+        self.parser = argparse.ArgumentParser()
+        self.skelerest.addParsers(self.parser.add_subparsers(dest="job"))
+        self.directory = directory
+
+    def execute(self, argv):
+        """ Execute a command, returning its output (and failing if the command fails) """
+
+        args = self.parser.parse_args(argv + ["--no-daemon"])
+        args.sr_stdout = io.StringIO()
+        args.sr_stderr = io.StringIO()
+        self.skelerest.execute(None, args)
+        return args.sr_stdout.getvalue()
+
+    def write_batch(self, rows, latency):
+        """ Write a batch file with the given number of rows """
+
+        path = os.path.join(self.directory, f"batch-{len(os.listdir(self.directory))}.jsonl")
+        with open(path, "w") as batch_file:
+            batch_file.writelines([json.dumps({"id": i, "latency": latency}) + "\n" for i in range(rows)])
+        return path
+
+    def single(self, rows):
+        """ Execute a separate command for every request (the per-command overhead) """
+
+        for i in range(rows):
+            self.execute(["get-echo", "--format", "quiet", "--id", str(i)])
+        return rows, "requests"
+
+    def batch(self, rows):
+        """ Execute a batch sequentially through a pooled session """
+
+        self.execute(["get-echo", "--format", "quiet", "--batch", self.write_batch(rows, 0)])
+        return rows, "requests"
+
+    def concurrent(self, rows):
+        """ Execute a batch of slow requests with the adaptive concurrency limit """
+
+        self.execute(["get-echo", "--format", "quiet", "--concurrency", "16",
+                      "--batch", self.write_batch(rows, LATENCY)])
+        return rows, "requests"
+
+    def workers(self, rows):
+        """ Execute a batch of slow requests sharded across worker processes """
+
+        self.execute(["get-echo", "--format", "quiet", "--workers", "4",
+                      "--batch", self.write_batch(rows, LATENCY)])
+        return rows, "requests"
+
+    def extract(self, rows):
+        """ Extract columns from a large JSON array into CSV """
+
+        output = self.execute(["get-items", "--format", "csv", "--count", str(ITEMS)])
+        assert output.count("\n") == ITEMS + 1
+        return ITEMS, "items"
+
+    def stream(self, rows):
+        """ Consume a stream of newline-delimited JSON events """
+
+        output = self.execute(["get-events", "--format", "jsonl", "--count", str(EVENTS)])
+        assert output.count("\n") == EVENTS + 1
+        return EVENTS, "events"
+
+    def upload(self, rows):
+        """ Stream a large file from disk """
+
+        path = os.path.join(self.directory, "upload.bin")
+        if (not os.path.exists(path)):
+            with open(path, "wb") as upload_file:
+                for i in range(UPLOAD_MIB):
+                    upload_file.write(os.urandom(1024 * 1024))
+        self.execute(["put-upload", "--format", "quiet", "--path", path])
+        return UPLOAD_MIB, "MiB"
+
+SCENARIOS = ["single", "batch", "concurrent", "workers", "extract", "stream", "upload"]
+
+def compare(results, baseline, tolerance):
+    """ Get the scenarios that are slower than the baseline by more than the tolerance """
+
+    return [name for name, seconds in results.items()
+            if (name in baseline) and (seconds > baseline[name] * (1 + tolerance))]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", default=500, type=int, help="Number of requests in the request scenarios (DEFAULT: 500)")
+    parser.add_argument("--repeat", default=3, type=int, help="Number of runs, the best of which is reported (DEFAULT: 3)")
+    parser.add_argument("--scenario", default=None, action="append", choices=SCENARIOS, help="Only run this scenario (repeatable)")
+    parser.add_argument("--save", default=None, metavar="FILE", help="Save the results to this JSON file")
+    parser.add_argument("--baseline", default=None, metavar="FILE", help="Fail if any scenario is slower than in this JSON file")
+    parser.add_argument("--tolerance", default=0.25, type=float, help="Fraction by which a scenario may be slower than the baseline (DEFAULT: 0.25)")
+    args = parser.parse_args()
+
+    results = {}
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp_dir:
+        runner = Runner(server.get_url(), tmp_dir)
+        for name in (args.scenario or SCENARIOS):
+            times = []
+            for i in range(args.repeat):
+                start = time.perf_counter()
+                count, unit = getattr(runner, name)(args.rows)
+                times.append(time.perf_counter() - start)
+
+            results[name] = round(min(times), 6)
+            print(f"{name:<10} : {results[name]:.3f}s ({count / results[name]:,.0f} {unit}/s)")
+
+    if (args.save is not None):
+        with open(args.save, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+
+    if (args.baseline is not None):
+        with open(args.baseline) as baseline_file:
+            slower = compare(results, json.load(baseline_file), args.tolerance)
+        if (slower):
+            print(f"Slower than the baseline by more than {args.tolerance:.0%}: {', '.join(slower)}")
+            sys.exit(1)
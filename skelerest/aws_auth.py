@@ -4,12 +4,22 @@ import base64
 import datetime
 import hashlib
 import hmac
-import boto3
+import time
+import threading
+from collections import namedtuple
 from urllib.parse import urlparse
 
 ALGORITHM = "AWS4-HMAC-SHA256"
 CONTENT_TYPE = "application/json"
 SERVICE = "execute-api"
+REFRESH_AHEAD = 15 * 60
+RETRY_INTERVAL = 30
+MIN_INTERVAL = 1
+PROVIDERS = {}
+PROVIDERS_LOCK = threading.Lock()
+SIGNING_KEYS = {}
+SIGNING_KEYS_LOCK = threading.Lock()
+SIGNING_KEYS_SIZE = 64
 
 def sign(key, string):
     """
@@ -53,6 +63,10 @@ def get_signature_key(key, date_stamp, region):
     """
     Generate the signature key for the AWS Auth.
 
+    The keys are cached by secret key, date, and region, so that requests signed for several
+    regions only derive each key once per day. Only the keys of the current date are kept (up to
+    a small number of them), so the cache stays bounded in a long running process.
+
     Parameters
     ----------
     key : str
@@ -68,15 +82,178 @@ def get_signature_key(key, date_stamp, region):
         The signed key for AWS service Auth
     """
 
-    date_key = sign(('AWS4' + key).encode('utf-8'), date_stamp).digest()
-    region_key = sign(date_key, region).digest()
-    service_key = sign(region_key, SERVICE).digest()
-    signed_key = sign(service_key, 'aws4_request').digest()
-    return signed_key
+    cache_key = (key, date_stamp, region)
+    signing_key = SIGNING_KEYS.get(cache_key)
+    if (signing_key is None):
+        date_key = sign(('AWS4' + key).encode('utf-8'), date_stamp).digest()
+        region_key = sign(date_key, region).digest()
+        service_key = sign(region_key, SERVICE).digest()
+        signing_key = sign(service_key, 'aws4_request').digest()
+        with SIGNING_KEYS_LOCK:
+            stale = [cached for cached in SIGNING_KEYS if cached[1] != date_stamp]
+            if (stale) or (len(SIGNING_KEYS) >= SIGNING_KEYS_SIZE):
+                SIGNING_KEYS.clear()
+            SIGNING_KEYS[cache_key] = signing_key
+    return signing_key
+
+class Credentials(namedtuple("Credentials", ["access_key", "secret_key", "token", "expiry"])):
+    """
+    Immutable snapshot of the credentials of a profile
+
+    The keys, the session token (None for long-term credentials), and the expiry (as a Unix
+    timestamp, None for credentials that do not expire) are swapped in as a single object, so a
+    signer always reads a matching key pair.
+    """
+
+    __slots__ = ()
+
+def resolve_credentials(profile):
+    """
+    Resolve the current credentials of a profile through a new boto3 session
+
+    A new session is used for every refresh, so that temporary credentials (such as assumed-role
+    or SSO credentials) are fetched anew rather than taken from the cache of the previous session.
+
+    Parameters
+    ----------
+    profile : str
+        The name of the AWS profile to be used for Auth
+
+    Returns
+    -------
+    credentials : Credentials
+        The snapshot of the credentials of the profile
+    """
+
+    # boto3 is slow to import, so it is only imported once credentials are needed
+    import boto3
+    credentials = boto3.Session(profile_name=profile).get_credentials()
+    frozen = credentials.get_frozen_credentials()
+
+    # botocore only exposes the expiry of temporary credentials through this attribute
+    expiry = getattr(credentials, "_expiry_time", None)
+    expiry = None if (expiry is None) else expiry.timestamp()
+    return Credentials(frozen.access_key, frozen.secret_key, frozen.token, expiry)
+
+class CredentialProvider:
+    """
+    Hands out the current credentials of a profile, refreshing them ahead of their expiry
+
+    Temporary credentials are refreshed on a background thread before they expire, so signers
+    never wait on a refresh and long runs do not stall (or fail with a wave of 403s) when the
+    credentials expire mid-run. Signers read the current snapshot without taking a lock. Only if
+    the snapshot has expired anyway (such as when every background refresh failed) does a single
+    signer refresh it while the others wait for that refresh.
+    """
+
+    profile = None
+    refresh_ahead = None
+    current = None
+    lock = None
+    stopped = None
+    thread = None
+    pid = None
+
+    def __init__(self, profile, refresh_ahead=REFRESH_AHEAD):
+        """
+        Resolve the credentials of the profile and start refreshing them in the background
+
+        Parameters
+        ----------
+        profile : str
+            The name of the AWS profile to be used for Auth
+        refresh_ahead : float (optional)
+            The number of seconds before their expiry at which the credentials are refreshed
+        """
+
+        self.profile = profile
+        self.refresh_ahead = refresh_ahead
+        self.lock = threading.Lock()
+        self.refresh(None)
+        self.start()
+
+    def get(self):
+        """
+        Get the current credentials of the profile
+
+        Returns
+        -------
+        credentials : Credentials
+            The snapshot of the credentials of the profile
+        """
+
+        # Threads do not survive a fork, so worker processes restart the refresh in their own thread
+        if (self.pid != os.getpid()):
+            self.start()
+
+        current = self.current
+        if (current.expiry is not None) and (time.time() >= current.expiry):
+            current = self.refresh(current)
+        return current
+
+    def refresh(self, stale):
+        """
+        Replace the stale credentials with newly resolved credentials
+
+        Parameters
+        ----------
+        stale : Credentials
+            The credentials to be replaced (no refresh happens if they were already replaced)
+
+        Returns
+        -------
+        credentials : Credentials
+            The current credentials after the refresh
+        """
+
+        with self.lock:
+            if (self.current is stale):
+                self.current = resolve_credentials(self.profile)
+            return self.current
+
+    def start(self):
+        """ Start refreshing the credentials on a background thread (if they expire) """
+
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        if (self.current.expiry is not None):
+            self.thread = threading.Thread(target=self.__run, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """ Stop refreshing the credentials in the background """
+
+        self.stopped.set()
+        if (self.thread is not None):
+            self.thread.join()
+
+    def __run(self):
+        """ Refresh the credentials ahead of each expiry until stopped, retrying failed refreshes """
+
+        stopped = self.stopped
+        while (True):
+            current = self.current
+            remaining = current.expiry - time.time()
+            # Credentials that live shorter than the refresh window are refreshed halfway through
+            delay = max(remaining - self.refresh_ahead, remaining / 2, MIN_INTERVAL)
+            if (stopped.wait(delay)):
+                return
+
+            try:
+                self.refresh(current)
+            except Exception:
+                # The current credentials are kept (they may still be valid) until the retry
+                if (stopped.wait(RETRY_INTERVAL)):
+                    return
 
 def get_credentials(profile):
     """
-    Creates a session based on the given profile name and obtains the Auth credentials.
+    Get the current credentials of the given profile
+
+    A provider is created for each profile (the first time its credentials are needed) that keeps
+    its credentials fresh, so signing many requests only resolves them once per expiry.
 
     Parameters
     ----------
@@ -85,12 +262,18 @@ def get_credentials(profile):
 
     Returns
     -------
-    credentials : botocore.credentials.Credentials
-        The AWS credentials object from which the access key and secret key can be obtained
+    credentials : Credentials
+        The snapshot of the credentials, from which the access key, secret key, and session token
+        can be obtained
     """
 
-    session = boto3.Session(profile_name=profile)
-    return session.get_credentials()
+    provider = PROVIDERS.get(profile)
+    if (provider is None):
+        with PROVIDERS_LOCK:
+            if (profile not in PROVIDERS):
+                PROVIDERS[profile] = CredentialProvider(profile)
+            provider = PROVIDERS[profile]
+    return provider.get()
 
 def split_endpoint(endpoint):
     """
@@ -112,10 +295,17 @@ def split_endpoint(endpoint):
     url = urlparse(endpoint)
     return url.hostname, url.path
 
-def add_aws_headers(endpoint, profile, region, method, params, headers, body=""):
+def add_aws_headers(endpoint, profile, region, method, params, headers, body="",
+                    content_type=CONTENT_TYPE):
     """
     Add AWS Auth headers needed for making requests against AWS APIs
 
+    Requests are signed for the API Gateway (execute-api) service. Streaming bodies (uploads) are
+    hashed in chunks as they are read from disk, so that signing a large upload does not hold it
+    in memory, and their hash is also sent in the x-amz-content-sha256 header. Temporary
+    credentials send their session token in the x-amz-security-token header. Both headers are
+    part of the signed headers.
+
     Parameters
     ----------
     endpoint : str
@@ -130,8 +320,10 @@ def add_aws_headers(endpoint, profile, region, method, params, headers, body="")
         TODO The dict of query parameters for the request
     headers : dict
         The dict of header parameters for the request
-    body : str (optional)
-        The string representation of the request body
+    body : str or StreamingBody (optional)
+        The string representation of the request body, or the streaming body of an upload
+    content_type : str (optional)
+        The Content-Type of the request body that is signed (DEFAULT: application/json)
 
     Returns
     -------
@@ -139,7 +331,7 @@ def add_aws_headers(endpoint, profile, region, method, params, headers, body="")
         The dict of header parameters for the request with the addition of AWS Authorization
     """
 
-    # Obtain Credentials from AWS Profile
+    # Obtain Credentials from AWS Profile (a single snapshot, so the keys always match)
     credentials = get_credentials(profile)
     access_key = credentials.access_key
     secret_key = credentials.secret_key
@@ -151,11 +343,17 @@ def add_aws_headers(endpoint, profile, region, method, params, headers, body="")
 
     # Build the Authorization Header for AWS Requests
     host, uri = split_endpoint(endpoint)
-    signed_headers = "content-type;host;x-amz-date"
-    payload_hash = hash(body)
+    payload_hash = hash(body) if isinstance(body, str) else body.digest()
+    amz_headers = {"x-amz-date": amz_date}
+    if (not isinstance(body, str)):
+        amz_headers["x-amz-content-sha256"] = payload_hash
+    if (credentials.token):
+        amz_headers["x-amz-security-token"] = credentials.token
+    canonical = dict(amz_headers, **{"content-type": content_type, "host": host})
+    signed_headers = ";".join(sorted(canonical))
     signing_key = get_signature_key(secret_key, date_stamp, region)
     canonical_querystring = ""
-    canonical_headers = f"content-type:{CONTENT_TYPE}\nhost:{host}\nx-amz-date:{amz_date}\n"
+    canonical_headers = "".join([f"{name}:{canonical[name]}\n" for name in sorted(canonical)])
     canonical_request = f"{method}\n{uri}\n{canonical_querystring}\n{canonical_headers}\n{signed_headers}\n{payload_hash}"
     credential_scope = f"{date_stamp}/{region}/{SERVICE}/aws4_request"
     string_to_sign = f"{ALGORITHM}\n{amz_date}\n{credential_scope}\n{hash(canonical_request)}"
@@ -163,8 +361,9 @@ def add_aws_headers(endpoint, profile, region, method, params, headers, body="")
     authorization_header = f"{ALGORITHM} Credential={access_key}/{credential_scope}, SignedHeaders={signed_headers}, Signature={signature}"
 
     # Add the necessary AWS Auth Headers
-    headers["content-type"] = CONTENT_TYPE
-    headers["x-amz-date"] = amz_date
+    headers = {name: value for name, value in headers.items() if name.lower() != "content-type"}
+    headers["content-type"] = content_type
+    headers.update(amz_headers)
     headers["Authorization"] = authorization_header
 
     return headers
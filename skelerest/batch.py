@@ -0,0 +1,72 @@
+import csv
+import json
+
+def read_rows(path, select=None):
+    """
+    Read the variable values for each request in a batch file
+
+    CSV files (.csv) use the header row for the variable names. Every other file is read as JSON
+    Lines, with one object of variable values per line. Rows are read lazily so that batch files
+    of any size can be processed in constant memory, and rows that are not selected are skipped
+    without being parsed (where the format allows it).
+
+    Parameters
+    ----------
+    path : str
+        The path of the batch file
+    select : function (optional)
+        Called with the offset of each row, only rows for which it returns True are read
+
+    Returns
+    -------
+    rows : generator<tuple>
+        The offset of each row in the batch file and its variable values (by name)
+    """
+
+    with open(path, newline="") as batch_file:
+        if (path.lower().endswith(".csv")):
+            for offset, row in enumerate(csv.DictReader(batch_file)):
+                if (select is None) or (select(offset)):
+                    yield offset, row
+        else:
+            offset = 0
+            for line in batch_file:
+                if (line.strip()):
+                    if (select is None) or (select(offset)):
+                        yield offset, json.loads(line)
+                    offset += 1
+
+def get_row_values(req, values, row):
+    """
+    Merge the values from a batch row over the values provided through the CLI
+
+    Columns in the batch row can use either the variable name or its CLI form (with dashes
+    converted to underscores), with the variable name taking precedence if both are present. The
+    columns are looked up through the variable table of the request, so the work for each row
+    depends on the number of columns rather than the number of variables of the request.
+
+    Parameters
+    ----------
+    req : RestRequest
+        The request whose variables are populated
+    values : dict
+        The values of the variables (by name) provided through the CLI
+    row : dict
+        The values of the variables provided by the batch row
+
+    Returns
+    -------
+    values : dict
+        The values of the variables (by name) to be used for the row
+    """
+
+    if (not row):
+        return values
+
+    values = dict(values)
+    for column, value in row.items():
+        var = req.get_variable(column)
+        if (var is not None) and ((column == var.name) or (var.name not in row)):
+            values[var.name] = value
+
+    return values
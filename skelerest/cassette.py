@@ -0,0 +1,216 @@
+import os
+import json
+import base64
+import hashlib
+
+VOLATILE_HEADERS = ["authorization", "x-amz-date", "x-amz-security-token"]
+SECRET_HEADERS = ["cookie", "set-cookie", "proxy-authorization"]
+SECRET_MARKERS = ["token", "secret", "key", "password", "auth", "session", "credential"]
+REDACTED = "REDACTED"
+RECORD = "record"
+REPLAY = "replay"
+
+def is_secret(name):
+    """
+    Determine if a header holds a credential (such as an API key, a cookie, or a token)
+
+    Parameters
+    ----------
+    name : str
+        The lowercase name of the header
+
+    Returns
+    -------
+    secret : bool
+        True for the common credential headers and any header whose name mentions a token, secret,
+        key, password, auth, session, or credential
+    """
+
+    return (name in SECRET_HEADERS) or any(marker in name for marker in SECRET_MARKERS)
+
+def redact(headers):
+    """ Replace the values of the secret headers (see is_secret) so they are never written out """
+    return {name: REDACTED if is_secret(name.lower()) else value for name, value in headers.items()}
+
+def canonical_request(method, endpoint, params, headers, body):
+    """
+    Build the canonical form of a rendered request
+
+    Query parameters and headers are sorted (with header names lowercased) and the headers that
+    change on every execution (such as the AWS Authorization header) are removed, so that the same
+    request always has the same canonical form. The values of the headers that hold credentials
+    (such as x-api-key or cookie) are redacted, so recordings can be kept (and replayed) without
+    the credentials.
+
+    Parameters
+    ----------
+    method : str
+        The REST method used in the API request
+    endpoint : str
+        The http URI endpoint through which the API is accessed
+    params : dict
+        A dict of the query parameters used in the REST request
+    headers : dict
+        A dict of the header parameters used in the REST request
+    body : str or StreamingBody
+        The string representation of the request body (uploads are represented by the
+        description of their files)
+
+    Returns
+    -------
+    request : dict
+        The canonical Dictionary representation of the request
+    """
+
+    headers = redact({name.lower(): str(value) for name, value in headers.items()})
+    return {
+        "method": method.upper(),
+        "endpoint": endpoint,
+        "params": {name: str(value) for name, value in sorted(params.items())},
+        "headers": {name: value for name, value in sorted(headers.items()) if name not in VOLATILE_HEADERS},
+        "body": str(body)
+    }
+
+def request_key(request):
+    """
+    Hash a canonical request into the key used to store its response
+
+    Parameters
+    ----------
+    request : dict
+        The canonical Dictionary representation of the request
+
+    Returns
+    -------
+    key : str
+        The SHA-256 hex digest of the canonical request
+    """
+
+    return hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()
+
+class CassetteResponse:
+    """ A response that has been replayed from a cassette instead of being sent over the network """
+
+    status_code = None
+    headers = None
+    content = None
+
+    def __init__(self, status_code, headers, content):
+        """
+        Initialize the response with the recorded values
+
+        Parameters
+        ----------
+        status_code : int
+            The recorded HTTP status code
+        headers : dict
+            The recorded response headers
+        content : bytes
+            The recorded response body
+        """
+
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.text)
+
+class Cassette:
+    """ Stores the responses to rendered requests on disk so that they can be replayed offline """
+
+    directory = None
+    mode = None
+
+    def __init__(self, directory, mode):
+        """
+        Initialize the cassette with the directory in which the responses are stored
+
+        Parameters
+        ----------
+        directory : str
+            The directory that holds a JSON file for each recorded request
+        mode : str
+            Either 'record' (send requests and store the responses) or 'replay' (only read the
+            stored responses)
+        """
+
+        self.directory = directory
+        self.mode = mode
+
+    def get_path(self, key):
+        """ Get the path of the file that holds the recording for the given request key """
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(self, request, response):
+        """
+        Record the response for a canonical request
+
+        Parameters
+        ----------
+        request : dict
+            The canonical Dictionary representation of the request
+        response : requests.Response
+            The response returned by the API for the request
+
+        Returns
+        -------
+        path : str
+            The path of the file that holds the recording
+        """
+
+        content = response.content
+        try:
+            body, encoding = content.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode("ascii"), "base64"
+
+        recording = {
+            "request": request,
+            "response": {
+                "status": response.status_code,
+                "headers": redact(dict(response.headers)),
+                "encoding": encoding,
+                "body": body
+            }
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(request_key(request))
+        with open(path, "w") as recording_file:
+            json.dump(recording, recording_file, indent=2, sort_keys=True)
+        return path
+
+    def load(self, request):
+        """
+        Replay the recorded response for a canonical request
+
+        Parameters
+        ----------
+        request : dict
+            The canonical Dictionary representation of the request
+
+        Returns
+        -------
+        response : CassetteResponse
+            The recorded response, or None if the request has not been recorded
+        """
+
+        path = self.get_path(request_key(request))
+        if (not os.path.exists(path)):
+            return None
+
+        with open(path) as recording_file:
+            recorded = json.load(recording_file)["response"]
+
+        body = recorded["body"]
+        content = base64.b64decode(body) if (recorded["encoding"] == "base64") else body.encode("utf-8")
+        return CassetteResponse(recorded["status"], recorded["headers"], content)
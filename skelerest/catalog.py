@@ -0,0 +1,222 @@
+import os
+import glob
+import json
+import yaml
+from schema import Schema, And
+from .rest_request import RestRequest
+from .commands import get_command
+
+INDEX_FILE = ".skelerest-index.json"
+INDEX_VERSION = 1
+LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader) # The C loader is only present with LibYAML
+
+def expand_includes(patterns):
+    """
+    Expand the include globs of the component into the paths of the catalog files
+
+    Parameters
+    ----------
+    patterns : list<str>
+        The glob patterns of the catalog files (relative to the project)
+
+    Returns
+    -------
+    paths : list<str>
+        The paths of the matching catalog files in order (each pattern sorted, without duplicates)
+    """
+
+    paths = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            if (path not in paths):
+                paths.append(path)
+    return paths
+
+def get_signature(path):
+    """ Get the modification time and size of a catalog file, which change when it is edited """
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+def describe(req):
+    """
+    Describe a request with the details needed to add its CLI parser without loading it
+
+    Parameters
+    ----------
+    req : RestRequest
+        The request being described
+
+    Returns
+    -------
+    entry : dict
+        The method, endpoint, and variables (name and default value) of the request
+    """
+
+    return {
+        "method": req.method,
+        "endpoint": req.endpoint,
+        "variables": [[var.name, var.default] for var in req.variables]
+    }
+
+class Catalog:
+    """
+    A YAML file holding a list of requests that is included by the component
+
+    The requests of the catalog are only validated and loaded when one of its commands is
+    executed, and are loaded again if the file changes (such as while the daemon is running).
+    """
+
+    schema = Schema({
+        'requests': And(list, error='Catalog \'requests\' must be a list')
+    }, ignore_extra_keys=True)
+
+    path = None
+    signature = None
+    requests = None
+
+    def __init__(self, path):
+        """
+        Initialize the catalog with the path of its file (without loading it)
+
+        Parameters
+        ----------
+        path : str
+            The path of the catalog file
+        """
+
+        self.path = path
+
+    def get_requests(self):
+        """
+        Get the requests of the catalog, loading them if the file has not been loaded or has changed
+
+        Returns
+        -------
+        requests : dict
+            The requests of the catalog by their command name
+        """
+
+        signature = get_signature(self.path)
+        if (self.requests is None) or (signature != self.signature):
+            with open(self.path) as catalog_file:
+                config = yaml.load(catalog_file, Loader=LOADER) or {}
+
+            self.schema.validate(config)
+            requests = {}
+            for req in RestRequest.loadList(config["requests"]):
+                requests.setdefault(get_command(req), req)
+
+            self.requests = requests
+            self.signature = signature
+
+        return self.requests
+
+class CatalogIndex:
+    """
+    Index of the commands in the catalogs included by the component
+
+    The index holds the details needed to add the CLI parser of every command in the catalogs
+    (see describe) and is cached in a JSON file, so that only the catalogs that changed since the
+    index was written need to be loaded. This keeps the startup of every command independent of
+    the number of requests in the catalogs.
+    """
+
+    path = None
+    catalogs = None
+    commands = None
+
+    def __init__(self, path=None):
+        """
+        Initialize an empty index
+
+        Parameters
+        ----------
+        path : str (optional)
+            The path of the JSON file in which the index is cached (DEFAULT: .skelerest-index.json)
+        """
+
+        self.path = INDEX_FILE if (path is None) else path
+        self.catalogs = {}
+        self.commands = {}
+
+    def load(self, patterns):
+        """
+        Index the catalogs matching the include globs, reusing the cached index where possible
+
+        The cache is rewritten when any catalog had to be loaded, and is skipped if it can not be
+        written (such as in a read-only project).
+
+        Parameters
+        ----------
+        patterns : list<str>
+            The glob patterns of the catalog files
+        """
+
+        cached = self.__read_cache()
+        entries = {}
+        for path in expand_includes(patterns):
+            catalog = Catalog(path)
+            signature = get_signature(path)
+            entry = cached.get(path)
+            if (entry is None) or (entry["signature"] != signature):
+                requests = catalog.get_requests()
+                entry = {
+                    "signature": catalog.signature,
+                    "commands": {cmd: describe(req) for cmd, req in requests.items()}
+                }
+
+            entries[path] = entry
+            self.catalogs[path] = catalog
+            for cmd, command in entry["commands"].items():
+                if (cmd not in self.commands):
+                    self.commands[cmd] = dict(command, catalog=path)
+
+        if (entries != cached):
+            self.__write_cache(entries)
+
+    def get_request(self, command):
+        """
+        Get the request of a command, loading the catalog that holds it
+
+        Parameters
+        ----------
+        command : str
+            The name of the command
+
+        Returns
+        -------
+        req : RestRequest
+            The request of the command (None if the command is not in any of the catalogs, or its
+            catalog has been removed since it was indexed)
+        """
+
+        entry = self.commands.get(command)
+        if (entry is None):
+            return None
+
+        try:
+            return self.catalogs[entry["catalog"]].get_requests().get(command)
+        except FileNotFoundError:
+            return None
+
+    def __read_cache(self):
+        """ Read the catalog entries of the cached index (empty if there is no usable cache) """
+
+        try:
+            with open(self.path) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+        if (not isinstance(index, dict)) or (index.get("version") != INDEX_VERSION):
+            return {}
+        return index.get("catalogs", {})
+
+    def __write_cache(self, entries):
+        """ Write the catalog entries to the cached index """
+
+        try:
+            with open(self.path, "w") as index_file:
+                json.dump({"version": INDEX_VERSION, "catalogs": entries}, index_file)
+        except OSError:
+            pass
@@ -0,0 +1,124 @@
+import os
+
+FLUSH_EVERY = 100
+BLOCK_SIZE = 4096
+FAILURES = ["error", "open"]
+
+def is_success(status):
+    """ Determine if the outcome of a request (status code, 'error', or 'open') was successful """
+    return (status not in FAILURES) and (int(status) < 400)
+
+class Checkpoint:
+    """
+    Journal of the batch rows that have been completed and their outcomes
+
+    Each line of the journal holds the offset of a row in the batch file and the status code of
+    its response (or 'error' if no response was received, or 'open' if the request was
+    short-circuited by the breaker of its host), such as '1234 200'. The journal is only
+    ever appended to, so the last entry for an offset is its most recent outcome.
+    """
+
+    path = None
+    journal = None
+    pending = None
+
+    def __init__(self, path):
+        """
+        Initialize the checkpoint with the path of its journal
+
+        Parameters
+        ----------
+        path : str
+            The path of the journal file
+        """
+
+        self.path = path
+        self.pending = 0
+
+    def load(self):
+        """
+        Load the most recent outcome of every row in the journal
+
+        Lines that are incomplete (from a run that was interrupted mid-write) are ignored.
+
+        Returns
+        -------
+        outcomes : dict
+            The most recent status (int, 'error', or 'open') of each row by offset
+        """
+
+        outcomes = {}
+        if (os.path.exists(self.path)):
+            with open(self.path) as journal:
+                for line in journal:
+                    entry = line.split()
+                    if (len(entry) == 2) and (line.endswith("\n")):
+                        status = entry[1]
+                        outcomes[int(entry[0])] = status if (status in FAILURES) else int(status)
+
+        return outcomes
+
+    def open(self, resume=False):
+        """
+        Open the journal for writing
+
+        Parameters
+        ----------
+        resume : bool (optional)
+            Append to the existing journal instead of starting a new one (after cutting off its
+            incomplete last line, so that the next entry does not run into it)
+        """
+
+        if (resume) and (os.path.exists(self.path)):
+            self.__trim()
+        self.journal = open(self.path, "a" if resume else "w")
+
+    def __trim(self):
+        """ Truncate the journal to the end of its last complete line """
+
+        with open(self.path, "rb+") as journal:
+            end = journal.seek(0, os.SEEK_END)
+            position = end
+            while (position > 0):
+                start = max(0, position - BLOCK_SIZE)
+                journal.seek(start)
+                newline = journal.read(position - start).rfind(b"\n")
+                if (newline >= 0):
+                    position = start + newline + 1
+                    break
+                position = start
+
+            if (position < end):
+                journal.truncate(position)
+
+    def write(self, offset, status):
+        """
+        Record the outcome of a row
+
+        Parameters
+        ----------
+        offset : int
+            The offset of the row in the batch file
+        status : int or str
+            The status code of the response ('error' if no response was received, or 'open' if the
+            request was short-circuited)
+        """
+
+        self.journal.write(f"{offset} {status}\n")
+        self.pending += 1
+        if (self.pending >= FLUSH_EVERY):
+            self.flush()
+
+    def flush(self):
+        """ Write all of the recorded outcomes to disk """
+
+        self.journal.flush()
+        self.pending = 0
+
+    def close(self):
+        """ Flush and close the journal """
+
+        if (self.journal is not None):
+            self.flush()
+            self.journal.close()
+            self.journal = None
@@ -0,0 +1,189 @@
+import time
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+OPEN = "open"
+THRESHOLD = 0.5
+OPEN_SECONDS = 30
+WINDOW = 20
+MIN_REQUESTS = 10
+PROBES = 3
+
+def is_failure(status):
+    """ Determine if the outcome of a request counts against the health of its host (errors and 5xx) """
+    return (status == "error") or ((status != OPEN) and (status >= 500))
+
+def get_host(endpoint):
+    """ Get the host (and port) that an endpoint is sent to """
+    return urlsplit(endpoint).netloc
+
+class CircuitBreaker:
+    """
+    Short-circuits the requests to a host once too many of its recent requests have failed
+
+    The breaker starts out closed, letting every request through while it tracks the outcomes of
+    the most recent requests. Once the failure rate over that window reaches the threshold the
+    breaker opens and every request is rejected immediately. After the open duration it becomes
+    half-open and lets a few probe requests through: if they all succeed the breaker closes again,
+    and if any of them fails it opens for another full duration.
+    """
+
+    threshold = None
+    open_seconds = None
+    min_requests = None
+    probes = None
+    outcomes = None
+    opened = None
+    probing = None
+    succeeded = None
+    lock = None
+
+    def __init__(self, threshold=THRESHOLD, open_seconds=OPEN_SECONDS, window=WINDOW,
+                 min_requests=MIN_REQUESTS, probes=PROBES):
+        """
+        Initialize the breaker in the closed state
+
+        Parameters
+        ----------
+        threshold : float (optional)
+            The failure rate (0 - 1) over the window at which the breaker opens
+        open_seconds : float (optional)
+            The number of seconds that the breaker stays open before probing the host
+        window : int (optional)
+            The number of recent outcomes over which the failure rate is calculated
+        min_requests : int (optional)
+            The number of outcomes required in the window before the breaker can open
+        probes : int (optional)
+            The number of successful probe requests required to close a half-open breaker
+        """
+
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.min_requests = min(min_requests, window)
+        self.probes = probes
+        self.outcomes = deque(maxlen=window)
+        self.probing = 0
+        self.succeeded = 0
+        self.lock = threading.Lock()
+
+    def get_state(self):
+        """ Get the state of the breaker ('closed', 'open', or 'half-open') """
+
+        with self.lock:
+            if (self.opened is None):
+                return "closed"
+            return "open" if (time.monotonic() - self.opened < self.open_seconds) else "half-open"
+
+    def allow(self):
+        """
+        Determine if a request to the host can be sent (reserving a probe when half-open)
+
+        Returns
+        -------
+        allowed : bool
+            False if the request should be short-circuited
+        """
+
+        with self.lock:
+            if (self.opened is None):
+                return True
+            if (time.monotonic() - self.opened < self.open_seconds):
+                return False
+            if (self.probing + self.succeeded >= self.probes):
+                return False
+            self.probing += 1
+            return True
+
+    def record(self, status):
+        """
+        Record the outcome of a request that was allowed through the breaker
+
+        Parameters
+        ----------
+        status : int or str
+            The status code of the response (or 'error' if no response was received)
+
+        Returns
+        -------
+        opened : bool
+            True if the outcome opened the breaker
+        """
+
+        failure = is_failure(status)
+        with self.lock:
+            if (self.opened is not None):
+                if (time.monotonic() - self.opened < self.open_seconds):
+                    # Requests that were already in-flight when the breaker opened are not probes
+                    return False
+
+                self.probing = max(0, self.probing - 1)
+                if (failure):
+                    self.__open()
+                    return True
+
+                self.succeeded += 1
+                if (self.succeeded >= self.probes):
+                    self.opened = None
+                    self.outcomes.clear()
+                return False
+
+            self.outcomes.append(failure)
+            if (len(self.outcomes) >= self.min_requests):
+                if (sum(self.outcomes) / len(self.outcomes) >= self.threshold):
+                    self.__open()
+                    return True
+            return False
+
+    def __open(self):
+        """ Open the breaker for the full duration (the lock must be held) """
+
+        self.opened = time.monotonic()
+        self.probing = 0
+        self.succeeded = 0
+
+class CircuitBreakers:
+    """ Holds a separate circuit breaker for every host that requests are sent to """
+
+    settings = None
+    breakers = None
+    lock = None
+
+    def __init__(self, threshold=THRESHOLD, open_seconds=OPEN_SECONDS, **settings):
+        """
+        Initialize the set of breakers with the settings that each breaker is created with
+
+        Parameters
+        ----------
+        threshold : float (optional)
+            The failure rate (0 - 1) over the window at which a breaker opens
+        open_seconds : float (optional)
+            The number of seconds that a breaker stays open before probing its host
+        settings : dict (optional)
+            Other settings passed to each CircuitBreaker
+        """
+
+        self.settings = dict(settings, threshold=threshold, open_seconds=open_seconds)
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    def get(self, endpoint):
+        """
+        Get the breaker for the host of an endpoint (creating it the first time the host is seen)
+
+        Parameters
+        ----------
+        endpoint : str
+            The http URI endpoint that the request is sent to
+
+        Returns
+        -------
+        breaker : CircuitBreaker
+            The breaker for the host of the endpoint
+        """
+
+        host = get_host(endpoint)
+        with self.lock:
+            if (host not in self.breakers):
+                self.breakers[host] = CircuitBreaker(**self.settings)
+            return self.breakers[host]
@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from .checkpoint import is_success
+
+COALESCE_METHODS = ["GET", "PUT", "DELETE"]
+CACHE_SIZE = 10000
+
+def trim_record(record):
+    """
+    Get the fields of a successful record that are needed to write it for the rows that reuse it
+
+    The raw content of the response is dropped, as is the body once the rows have been extracted
+    from it, so that the cache of completed flights does not hold every response in full.
+
+    Parameters
+    ----------
+    record : dict
+        The record of the response (see build_record)
+
+    Returns
+    -------
+    record : dict
+        The record without its raw content (and without its body if it holds extracted rows)
+    """
+
+    dropped = ["content", "body"] if ("extracted" in record) else ["content"]
+    return {key: value for key, value in record.items() if key not in dropped}
+
+class Flight:
+    """ A request that is being (or has been) sent on behalf of every row that rendered it """
+
+    status = None
+    record = None
+    done = None
+
+    def __init__(self):
+        self.done = threading.Event()
+
+    def wait(self):
+        """
+        Wait for the request to complete
+
+        Returns
+        -------
+        status : int or str
+            The outcome of the request (see Skelerest.__execute_row)
+        record : dict
+            The record of the response (None if no response was received)
+        """
+
+        self.done.wait()
+        return self.status, self.record
+
+class Coalescer:
+    """
+    Collapses identical requests so that each one is only sent once
+
+    Requests are identified by the hash of their rendered (unsigned) form. The first row to render
+    a request leads its flight and sends it, while rows that render the same request wait for the
+    flight in progress or reuse the outcome of a recent successful flight. Successful flights are
+    kept (with their records trimmed to the fields that are written) in a bounded LRU cache so
+    that memory stays constant for batches of any size, while failed requests are sent again for
+    later rows.
+    """
+
+    size = None
+    inflight = None
+    completed = None
+    lock = None
+
+    def __init__(self, size=CACHE_SIZE):
+        """
+        Initialize the coalescer with an empty cache
+
+        Parameters
+        ----------
+        size : int (optional)
+            The maximum number of completed flights that are kept for reuse
+        """
+
+        self.size = size
+        self.inflight = {}
+        self.completed = OrderedDict()
+        self.lock = threading.Lock()
+
+    def join(self, key):
+        """
+        Join the flight of a request, starting a new one if there is none to join
+
+        Parameters
+        ----------
+        key : str
+            The hash of the rendered request
+
+        Returns
+        -------
+        leader : bool
+            True if the caller started the flight and must send the request (and then finish it)
+        flight : Flight
+            The flight of the request
+        """
+
+        with self.lock:
+            if (key in self.completed):
+                self.completed.move_to_end(key)
+                return False, self.completed[key]
+            if (key in self.inflight):
+                return False, self.inflight[key]
+
+            flight = Flight()
+            self.inflight[key] = flight
+            return True, flight
+
+    def finish(self, key, flight, status, record):
+        """
+        Complete a flight with the outcome of its request, releasing the rows waiting on it
+
+        Parameters
+        ----------
+        key : str
+            The hash of the rendered request
+        flight : Flight
+            The flight that was started by join
+        status : int or str
+            The outcome of the request
+        record : dict
+            The record of the response (None if no response was received)
+        """
+
+        success = (status is not None) and (is_success(status))
+        flight.status = status
+        flight.record = trim_record(record) if (success) and (record is not None) else record
+        with self.lock:
+            self.inflight.pop(key, None)
+            if (success):
+                self.completed[key] = flight
+                if (len(self.completed) > self.size):
+                    self.completed.popitem(last=False)
+        flight.done.set()
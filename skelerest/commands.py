@@ -0,0 +1,49 @@
+COMMAND_TEMPLATE = "{method}-{name}"
+
+def get_command(req):
+    """ Get the name of the CLI command of a request (such as get-my-api-data) """
+    return COMMAND_TEMPLATE.format(method=req.method.lower(), name=req.name)
+
+class CommandIndex:
+    """
+    Read-only view of the commands provided by the component
+
+    Skelebot checks whether a job belongs to the component with `job in component.commands`, so
+    the commands are looked up through the dictionary of requests (by command name) rather than
+    kept in a separate list that would be scanned for every lookup. The commands of the included
+    catalogs are looked up through the index of the catalogs, without loading them.
+    """
+
+    requests = None
+    extra = None
+    catalogs = None
+
+    def __init__(self, requests, extra=None, catalogs=None):
+        """
+        Initialize the index over the requests of the component
+
+        Parameters
+        ----------
+        requests : dict
+            The requests of the component by their command name
+        extra : list<str> (optional)
+            The names of the commands that are not requests (such as the daemon)
+        catalogs : dict (optional)
+            The index entries of the commands in the included catalogs by their command name
+        """
+
+        self.requests = requests
+        self.extra = [] if (extra is None) else extra
+        self.catalogs = {} if (catalogs is None) else catalogs
+
+    def __contains__(self, command):
+        return (command in self.requests) or (command in self.catalogs) or (command in self.extra)
+
+    def __iter__(self):
+        yield from self.requests
+        yield from (command for command in self.catalogs if (command not in self.requests))
+        yield from self.extra
+
+    def __len__(self):
+        catalogs = [command for command in self.catalogs if (command not in self.requests)]
+        return len(self.requests) + len(catalogs) + len(self.extra)
@@ -0,0 +1,94 @@
+import json
+import difflib
+
+MAX_DIFF_LINES = 50
+
+def normalize_body(body):
+    """
+    Format a response body so that equivalent JSON documents compare equal line by line
+
+    Parameters
+    ----------
+    body : str
+        The text of the response body
+
+    Returns
+    -------
+    lines : list<str>
+        The lines of the body (pretty printed with sorted keys if it is JSON)
+    """
+
+    if (body is None):
+        return []
+
+    try:
+        body = json.dumps(json.loads(body), indent=2, sort_keys=True)
+    except ValueError:
+        pass
+    return body.splitlines()
+
+def diff_bodies(base, other, base_name, other_name, max_lines=MAX_DIFF_LINES):
+    """
+    Build the unified diff between the bodies of two responses
+
+    Parameters
+    ----------
+    base : str
+        The body of the response that the other is compared against
+    other : str
+        The body of the response being compared
+    base_name : str
+        The name of the target of the base response
+    other_name : str
+        The name of the target of the other response
+    max_lines : int (optional)
+        The maximum number of diff lines that are kept
+
+    Returns
+    -------
+    diff : list<str>
+        The lines of the unified diff (empty if the bodies are the same)
+    """
+
+    diff = difflib.unified_diff(normalize_body(base), normalize_body(other), base_name, other_name,
+                                lineterm="")
+    lines = []
+    for line in diff:
+        if (len(lines) >= max_lines):
+            lines.append("...")
+            break
+        lines.append(line)
+    return lines
+
+def build_comparison(records):
+    """
+    Compare the responses of the same request sent to several targets
+
+    The first target is used as the base that the bodies of the other targets are compared to.
+
+    Parameters
+    ----------
+    records : list<dict>
+        The record of each target in order (see build_record), with a 'target' name added
+
+    Returns
+    -------
+    comparison : list<dict>
+        The target, status, elapsed seconds, size, and body diff (against the first target) of
+        each response
+    """
+
+    comparison = []
+    for record in records:
+        row = {
+            "target": record["target"],
+            "status": record["status"],
+            "elapsed": record["elapsed"],
+            "bytes": record["bytes"]
+        }
+        if (record is not records[0]):
+            row["diff"] = diff_bodies(records[0]["body"], record["body"], records[0]["target"],
+                                      record["target"])
+        comparison.append(row)
+
+    return comparison
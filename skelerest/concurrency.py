@@ -0,0 +1,154 @@
+import math
+import threading
+from collections import deque
+
+WINDOW = 50
+TOLERANCE = 2.0
+MIN_INCREASE = 0.005
+BACKOFF = 0.5
+
+def is_overload(status):
+    """
+    Determine if a status signals that the upstream is overloaded
+
+    Parameters
+    ----------
+    status : int or str
+        The status code of the response (or 'error' if no response was received)
+
+    Returns
+    -------
+    overload : bool
+        True for 429 (Too Many Requests), any 5xx status code, or an error without a response
+    """
+
+    return (status == "error") or (status == 429) or (status >= 500)
+
+def percentile(values, pct):
+    """
+    Calculate a percentile of a list of values (nearest rank)
+
+    Parameters
+    ----------
+    values : list<float>
+        The values from which the percentile is calculated
+    pct : int
+        The percentile to be calculated (0 - 100)
+
+    Returns
+    -------
+    value : float
+        The value at the given percentile
+    """
+
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+class AdaptiveLimiter:
+    """
+    Limits the number of in-flight requests, adapting the limit to the observed latency and errors
+
+    The limit follows an AIMD (additive increase, multiplicative decrease) scheme. Each successful
+    request grows the limit by 1/limit (so roughly by one for every full round of requests) as long
+    as the p99 latency over the recent window stays within a tolerance of the best p99 observed
+    (increases of less than 5ms are ignored as jitter).
+    When the p99 latency rises above that tolerance, or a request fails with a 429 or 5xx status,
+    the limit is multiplied by the backoff factor (at most once per round of requests). If the
+    latency stays high at the minimum limit it is accepted as the new baseline.
+    """
+
+    limit = None
+    min_limit = None
+    max_limit = None
+    inflight = None
+    tolerance = None
+    backoff = None
+    latencies = None
+    baseline = None
+    since_decrease = None
+    condition = None
+
+    def __init__(self, max_limit, min_limit=1, initial=None, window=WINDOW, tolerance=TOLERANCE,
+                 backoff=BACKOFF):
+        """
+        Initialize the limiter with the bounds of the concurrency limit
+
+        Parameters
+        ----------
+        max_limit : int
+            The maximum number of requests that can be in-flight at once
+        min_limit : int (optional)
+            The minimum number of requests that are allowed to be in-flight at once
+        initial : int (optional)
+            The initial limit (defaults to the minimum limit)
+        window : int (optional)
+            The number of recent latencies used to calculate the p99 latency
+        tolerance : float (optional)
+            The ratio over the best observed p99 latency at which the limit is reduced
+        backoff : float (optional)
+            The factor by which the limit is multiplied when it is reduced
+        """
+
+        self.min_limit = min_limit
+        self.max_limit = max(min_limit, max_limit)
+        self.limit = float(min_limit if (initial is None) else min(max(initial, min_limit), self.max_limit))
+        self.inflight = 0
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.latencies = deque(maxlen=window)
+        self.since_decrease = 0
+        self.condition = threading.Condition()
+
+    def get_limit(self):
+        """ Get the current number of requests that are allowed to be in-flight at once """
+        return int(self.limit)
+
+    def acquire(self):
+        """ Block until another request is allowed to be in-flight """
+
+        with self.condition:
+            while (self.inflight >= int(self.limit)):
+                self.condition.wait()
+            self.inflight += 1
+
+    def release(self, elapsed, status):
+        """
+        Release an in-flight request and adapt the limit based on its outcome
+
+        Parameters
+        ----------
+        elapsed : float
+            The number of seconds it took to receive the response (None if the request was not
+            sent, in which case the limit is not adapted)
+        status : int or str
+            The status code of the response (or 'error' if no response was received)
+        """
+
+        with self.condition:
+            self.inflight -= 1
+            if (elapsed is None):
+                self.condition.notify_all()
+                return
+
+            self.since_decrease += 1
+            self.latencies.append(elapsed)
+
+            congested = False
+            if (len(self.latencies) == self.latencies.maxlen):
+                p99 = percentile(self.latencies, 99)
+                if (self.baseline is None) or (p99 < self.baseline):
+                    self.baseline = p99
+                congested = (p99 > self.baseline * self.tolerance) and (p99 - self.baseline > MIN_INCREASE)
+                if (congested) and (self.limit <= self.min_limit):
+                    # Accept the new latency as normal once the limit can not be reduced any further
+                    self.baseline = p99
+
+            if (is_overload(status)) or (congested):
+                if (self.since_decrease >= int(self.limit)):
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                    self.since_decrease = 0
+            elif (status < 400):
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+            self.condition.notify_all()
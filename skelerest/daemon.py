@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import socket
+import hashlib
+import argparse
+import socketserver
+from .scheduler import Scheduler
+
+SOCKET = ".skelerest.sock"
+POOL_SIZE = 10
+PATH_ARGS = ["sr_batch", "sr_checkpoint", "sr_record", "sr_replay", "sr_metrics_file"]
+COMPONENT_SETTINGS = ["connectTimeout", "readTimeout", "deadline", "targets"]
+
+def fingerprint(skelerest, req):
+    """
+    Hash the configuration of a request so the daemon can tell if its copy is out of date
+
+    The component-level settings that apply to the request (its default timeouts, deadline, and
+    targets) are part of the fingerprint, so changing them also makes the daemon's copy stale.
+
+    Parameters
+    ----------
+    skelerest : Skelerest
+        The component holding the request
+    req : RestRequest
+        The request for which the fingerprint is calculated
+
+    Returns
+    -------
+    fingerprint : str
+        The SHA-256 hex digest of the request and component configuration
+    """
+
+    settings = {name: getattr(skelerest, name) for name in COMPONENT_SETTINGS}
+    if (settings["targets"] is not None):
+        settings["targets"] = [target.toDict() for target in settings["targets"]]
+    document = {"request": req.toDict(), "component": settings}
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def send(connection, message):
+    """ Send a single message (a line of JSON) over the socket connection """
+    connection.sendall((json.dumps(message, default=str) + "\n").encode("utf-8"))
+
+class DaemonStream:
+    """ Stream that sends everything written to it to the client connected to the daemon """
+
+    connection = None
+    name = None
+
+    def __init__(self, connection, name):
+        """
+        Initialize the stream with the client connection and the name of the stream
+
+        Parameters
+        ----------
+        connection : socket.socket
+            The connection to the client
+        name : str
+            The name of the stream on the client ('stdout' or 'stderr')
+        """
+
+        self.connection = connection
+        self.name = name
+
+    def write(self, text):
+        if (text):
+            send(self.connection, {self.name: text})
+
+    def flush(self):
+        return None
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """ Executes a single command forwarded to the daemon, streaming the output to the client """
+
+    def handle(self):
+        message = json.loads(self.rfile.readline().decode("utf-8"))
+        skelerest = self.server.skelerest
+        args = argparse.Namespace(**message["args"])
+        req = skelerest.get_request(args.job)
+        if (req is None) or (fingerprint(skelerest, req) != message["fingerprint"]):
+            send(self.connection, {"stale": True})
+            return
+
+        args.sr_no_daemon = True
+        args.sr_stdout = DaemonStream(self.connection, "stdout")
+        args.sr_stderr = DaemonStream(self.connection, "stderr")
+        code = 0
+        try:
+            skelerest.execute(None, args)
+        except SystemExit as error:
+            code = error.code if isinstance(error.code, int) else 1
+        except Exception as error:
+            args.sr_stderr.write(f"{type(error).__name__}: {error}\n")
+            code = 1
+
+        send(self.connection, {"code": code})
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server that holds the component used to execute the forwarded commands
+
+    Each command is executed on a thread of its own, so several commands (such as batches of
+    different priorities) run side by side through the same pooled session and scheduler.
+    """
+
+    daemon_threads = True
+    skelerest = None
+
+    def __init__(self, path, skelerest):
+        """
+        Initialize the server on the socket path with the component
+
+        Parameters
+        ----------
+        path : str
+            The path of the Unix socket
+        skelerest : Skelerest
+            The component that executes the forwarded commands
+        """
+
+        self.skelerest = skelerest
+        super().__init__(path, DaemonHandler)
+
+def is_running(path):
+    """
+    Determine if a daemon is accepting connections on the socket
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket
+
+    Returns
+    -------
+    running : bool
+        True if a daemon accepted the connection
+    """
+
+    if (not os.path.exists(path)):
+        return False
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+        return True
+    except OSError:
+        return False
+
+def serve(skelerest, path=SOCKET, pool_size=POOL_SIZE):
+    """
+    Serve the commands of the component on a Unix socket until interrupted
+
+    Commands are executed concurrently with the component kept in memory, so the loaded
+    requests, their compiled templates, the pooled session, and the AWS credentials stay warm
+    between commands. The requests of every command share the connections of the pooled session
+    through a scheduler, which hands the connections to the requests of the highest priority
+    first and shares them by weight within a priority class.
+
+    Parameters
+    ----------
+    skelerest : Skelerest
+        The component that executes the forwarded commands
+    path : str (optional)
+        The path of the Unix socket
+    pool_size : int (optional)
+        The number of connections shared by the commands
+    """
+
+    if (os.path.exists(path)):
+        os.remove(path)
+
+    server = DaemonServer(path, skelerest)
+    skelerest.open_session(pool_size)
+    skelerest.scheduler = Scheduler(pool_size)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        skelerest.close_session()
+        skelerest.scheduler = None
+        if (os.path.exists(path)):
+            os.remove(path)
+
+def forward(path, args, skelerest, req):
+    """
+    Forward a command to the daemon, writing its output as it is streamed back
+
+    Parameters
+    ----------
+    path : str
+        The path of the Unix socket
+    args : argparse.Namespace
+        The arguments passed through the CLI
+    skelerest : Skelerest
+        The component holding the request
+    req : RestRequest
+        The request that the command executes
+
+    Returns
+    -------
+    code : int
+        The exit code of the command, or None if no daemon (with an up to date copy of the
+        request and component settings) was available to execute it
+    """
+
+    if (not os.path.exists(path)):
+        return None
+
+    values = {name: value for name, value in vars(args).items() if name not in ["sr_stdout", "sr_stderr"]}
+    for name in PATH_ARGS:
+        if (values.get(name) is not None):
+            values[name] = os.path.abspath(values[name])
+
+    try:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+
+    with connection:
+        send(connection, {"args": values, "fingerprint": fingerprint(skelerest, req)})
+        for line in connection.makefile("r", encoding="utf-8"):
+            message = json.loads(line)
+            if ("stdout" in message):
+                sys.stdout.write(message["stdout"])
+            elif ("stderr" in message):
+                sys.stderr.write(message["stderr"])
+            elif ("code" in message):
+                sys.stdout.flush()
+                return message["code"]
+            else:
+                return None
+
+    # The command may have been partially executed, so it is not executed again locally
+    sys.stderr.write("|SKELEREST| ERROR: The connection to the daemon was lost\n")
+    return 1
@@ -0,0 +1,129 @@
+import time
+from requests.exceptions import Timeout
+from .metrics import Metrics
+
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+class DeadlineExceeded(Timeout):
+    """ Raised when a request would be sent after the deadline of the run has passed """
+
+class Execution:
+    """
+    Holds the state shared by every request that is sent while executing a single command
+
+    The execution also enforces the timeouts of the run. Every request is sent with the connect
+    and read timeouts, capped by the time that remains before the deadline (if there is one) so
+    that the whole run has a bounded latency.
+    """
+
+    req = None
+    args = None
+    values = None
+    writer = None
+    cassette = None
+    timeout = None
+    expires = None
+    expired = None
+    circuits = None
+    target = None
+    records = None
+    coalescer = None
+    watch = None
+    stream = None
+    priority = None
+    weight = None
+    metrics = None
+
+    def __init__(self, req, args, values, writer, cassette=None, timeout=None, expires=None,
+                 circuits=None, target=None, coalescer=None):
+        """
+        Initialize the execution with the request, the CLI arguments, and the run settings
+
+        Parameters
+        ----------
+        req : RestRequest
+            The request to be executed
+        args : argparse.Namespace
+            The arguments passed through the CLI
+        values : dict
+            The values of the variables (by name) provided through the CLI
+        writer : OutputWriter
+            The writer that the results are written to (replaced for each chunk of a worker)
+        cassette : Cassette (optional)
+            The cassette that the responses are recorded to or replayed from
+        timeout : tuple (optional)
+            The connect and read timeouts (in seconds) of each request
+        expires : float (optional)
+            The time (from time.monotonic) at which the deadline of the run passes
+        circuits : CircuitBreakers (optional)
+            The circuit breakers of the hosts that the requests are sent to
+        target : RestTarget (optional)
+            The target that every request is sent to (if the request has targets)
+        coalescer : Coalescer (optional)
+            The coalescer that collapses the rows that render the same request
+        """
+
+        self.req = req
+        self.args = args
+        self.values = values
+        self.writer = writer
+        self.cassette = cassette
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT) if (timeout is None) else timeout
+        self.expires = expires
+        self.expired = False
+        self.circuits = circuits
+        self.target = target
+        self.coalescer = coalescer
+        self.metrics = Metrics()
+
+    def get_remaining(self):
+        """ Get the number of seconds left before the deadline (None if there is no deadline) """
+
+        if (self.expires is None):
+            return None
+        return self.expires - time.monotonic()
+
+    def get_timeout(self):
+        """
+        Get the connect and read timeouts for a request that is about to be sent
+
+        Returns
+        -------
+        timeout : tuple
+            The connect and read timeouts (in seconds), capped by the time left before the deadline
+
+        Raises
+        ------
+        DeadlineExceeded
+            If the deadline of the run has already passed
+        """
+
+        remaining = self.get_remaining()
+        if (remaining is None):
+            return self.timeout
+        if (remaining <= 0):
+            raise DeadlineExceeded("The deadline of the run was exceeded")
+        return tuple(min(timeout, remaining) for timeout in self.timeout)
+
+    def until_expired(self, rows):
+        """
+        Pass through the rows of a batch until the deadline of the run passes
+
+        Parameters
+        ----------
+        rows : iterable<tuple>
+            The offset and variable values of each row of the batch
+
+        Returns
+        -------
+        rows : generator<tuple>
+            The rows that were reached before the deadline (`expired` is set if any were cut off)
+        """
+
+        for row in rows:
+            remaining = self.get_remaining()
+            if (remaining is not None) and (remaining <= 0):
+                self.expired = True
+                return
+            yield row
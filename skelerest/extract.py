@@ -0,0 +1,119 @@
+import re
+import json
+from .jsonpath import compile_path, find
+
+DECODER = json.JSONDecoder()
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+def iter_items(text):
+    """
+    Decode the items of a JSON document one at a time
+
+    A document holding a top-level array is decoded incrementally, one element at a time, so that
+    only a single element of a huge array is parsed into memory at once. Any other document is
+    decoded as a single item.
+
+    Parameters
+    ----------
+    text : str
+        The JSON document
+
+    Returns
+    -------
+    items : generator<object>
+        The elements of the top-level array, or the whole document if it is not an array
+
+    Raises
+    ------
+    ValueError
+        If the text is not a valid JSON document
+    """
+
+    position = WHITESPACE.match(text).end()
+    if (not text.startswith("[", position)):
+        yield json.loads(text)
+        return
+
+    position = WHITESPACE.match(text, position + 1).end()
+    if (text.startswith("]", position)):
+        return
+
+    while (True):
+        item, position = DECODER.raw_decode(text, position)
+        yield item
+
+        position = WHITESPACE.match(text, position).end()
+        if (text.startswith("]", position)):
+            return
+        if (not text.startswith(",", position)):
+            raise ValueError(f"Expecting ',' delimiter at position {position}")
+        position = WHITESPACE.match(text, position + 1).end()
+
+class Projection:
+    """
+    Projects the fields of a JSON response into the columns of flat rows
+
+    Each column is a JSONPath expression (see compile_path) that is compiled once, when the request
+    is loaded, and evaluated against every response. A column holds the value that matches its path,
+    a list if several values match, or None if nothing matches.
+    """
+
+    columns = None
+
+    def __init__(self, mapping):
+        """
+        Compile the JSONPath expression of each column
+
+        Parameters
+        ----------
+        mapping : dict
+            The JSONPath expression of each column by the name of the column
+
+        Raises
+        ------
+        ValueError
+            If any of the expressions is not part of the supported JSONPath subset
+        """
+
+        self.columns = [(name, compile_path(path)) for name, path in mapping.items()]
+
+    def project(self, document):
+        """
+        Project a JSON document into a single row
+
+        Parameters
+        ----------
+        document : object
+            The parsed JSON document
+
+        Returns
+        -------
+        row : dict
+            The value of each column by the name of the column (in the order of the mapping)
+        """
+
+        row = {}
+        for name, steps in self.columns:
+            values = find(document, steps)
+            row[name] = None if (not values) else values[0] if (len(values) == 1) else values
+        return row
+
+    def extract(self, text):
+        """
+        Extract the rows of a response body (a row for each element of a top-level array)
+
+        Parameters
+        ----------
+        text : str
+            The body of the response
+
+        Returns
+        -------
+        rows : list<dict>
+            The projected rows (None if the body is not valid JSON)
+        """
+
+        try:
+            return [self.project(item) for item in iter_items(text)]
+        except ValueError:
+            return None
@@ -0,0 +1,111 @@
+import queue
+import threading
+
+HEDGE_METHODS = ["GET"]
+
+class Hedge:
+    """
+    Races a request against a duplicate that is only sent if the first one is slow to respond
+
+    The first attempt is sent straight away and, if it has not responded within the delay, a
+    second attempt is sent. Whichever attempt responds first is used. Responses are received as
+    streams, so the losing attempt is closed without reading its body (requests can not be
+    interrupted while waiting for the headers, so a slow loser is closed as soon as it responds or
+    its read timeout is reached).
+    """
+
+    send = None
+    delay = None
+    results = None
+    lock = None
+    decided = None
+    hedged = None
+
+    def __init__(self, send, delay):
+        """
+        Initialize the hedge with the function that sends a single attempt of the request
+
+        Parameters
+        ----------
+        send : function
+            Sends the request (as a stream) and returns the response
+        delay : float
+            The number of seconds to wait for the first attempt before the second one is sent
+        """
+
+        self.send = send
+        self.delay = delay
+        self.results = queue.Queue()
+        self.lock = threading.Lock()
+        self.decided = False
+        self.hedged = False
+
+    def __attempt(self):
+        """ Send a single attempt, handing over its outcome unless the race is already decided """
+
+        try:
+            outcome = (self.send(), None)
+        except Exception as error:
+            outcome = (None, error)
+
+        with self.lock:
+            if (not self.decided):
+                self.results.put(outcome)
+                return
+
+        if (outcome[0] is not None):
+            outcome[0].close()
+
+    def __start(self):
+        """ Start an attempt on a background thread """
+
+        thread = threading.Thread(target=self.__attempt, daemon=True)
+        thread.start()
+
+    def __decide(self):
+        """ Close every response that lost the race """
+
+        with self.lock:
+            self.decided = True
+        while (not self.results.empty()):
+            response, error = self.results.get()
+            if (response is not None):
+                response.close()
+
+    def run(self):
+        """
+        Send the request, hedging it with a second attempt if the first one is slow
+
+        Returns
+        -------
+        response : requests.Response
+            The first response that was received (with its body read)
+
+        Raises
+        ------
+        Exception
+            The error of the last attempt if none of the attempts received a response
+        """
+
+        self.__start()
+        pending = 1
+        while (True):
+            try:
+                response, error = self.results.get(timeout=None if (self.hedged) else self.delay)
+            except queue.Empty:
+                self.hedged = True
+                self.__start()
+                pending += 1
+                continue
+
+            pending -= 1
+            if (error is None):
+                break
+            if (pending == 0):
+                # Requests that fail before the hedge is sent are not retried
+                self.__decide()
+                raise error
+
+        self.__decide()
+        response.content # Reads the body of the winning response from the stream
+        return response
@@ -0,0 +1,189 @@
+import re
+import json
+
+OPERATORS = {
+    "==": lambda value, expected: value == expected,
+    "!=": lambda value, expected: value != expected,
+    ">=": lambda value, expected: value >= expected,
+    "<=": lambda value, expected: value <= expected,
+    ">": lambda value, expected: value > expected,
+    "<": lambda value, expected: value < expected
+}
+STEP_REGEX = re.compile(r"\.\.([\w-]+|\*)|\.([\w-]+|\*)|\[\s*(\*|-?\d+|'[^']*'|\"[^\"]*\")\s*\]")
+CONDITION_REGEX = re.compile(r"^\s*(\$.*?)\s*(==|!=|>=|<=|>|<)\s*(.+?)\s*$")
+WILDCARD = "*"
+
+def compile_path(path):
+    """
+    Compile a JSONPath expression into the list of steps used to find its values
+
+    The supported subset of JSONPath covers the root (`$`), child names (`.name` or `['name']`),
+    array indexes (`[0]` or `[-1]`), wildcards (`.*` or `[*]`), and recursive descent (`..name`).
+
+    Parameters
+    ----------
+    path : str
+        The JSONPath expression (such as `$.items[0].status`)
+
+    Returns
+    -------
+    steps : list<tuple>
+        Whether each step is a recursive descent and the name, index, or wildcard it selects
+
+    Raises
+    ------
+    ValueError
+        If the expression is not part of the supported JSONPath subset
+    """
+
+    path = path.strip()
+    if (not path.startswith("$")):
+        raise ValueError(f"JSONPath '{path}' must start with '$'")
+
+    steps = []
+    position = 1
+    while (position < len(path)):
+        match = STEP_REGEX.match(path, position)
+        if (match is None):
+            raise ValueError(f"Invalid JSONPath '{path}' at position {position}")
+
+        descent, name, selector = match.groups()
+        if (descent is not None):
+            steps.append((True, descent))
+        elif (name is not None):
+            steps.append((False, name))
+        elif (selector[0] in ["'", '"']):
+            steps.append((False, selector[1:-1]))
+        elif (selector == WILDCARD):
+            steps.append((False, WILDCARD))
+        else:
+            steps.append((False, int(selector)))
+        position = match.end()
+
+    return steps
+
+def select(value, selector):
+    """ Select the children of a JSON value matching a name, index, or wildcard """
+
+    if (selector == WILDCARD):
+        if isinstance(value, dict):
+            return list(value.values())
+        return list(value) if isinstance(value, list) else []
+    if isinstance(selector, int):
+        if (isinstance(value, list)) and (-len(value) <= selector < len(value)):
+            return [value[selector]]
+        return []
+    if (isinstance(value, dict)) and (selector in value):
+        return [value[selector]]
+    return []
+
+def descend(value):
+    """ Get a JSON value followed by all of its descendants (depth first) """
+
+    values = [value]
+    children = value.values() if isinstance(value, dict) else value if isinstance(value, list) else []
+    for child in children:
+        values.extend(descend(child))
+    return values
+
+def find(document, path):
+    """
+    Find the values of a JSON document that match a JSONPath expression
+
+    Parameters
+    ----------
+    document : object
+        The parsed JSON document
+    path : str or list<tuple>
+        The JSONPath expression or its compiled steps (see compile_path)
+
+    Returns
+    -------
+    values : list
+        The matching values in document order (empty if nothing matches)
+    """
+
+    steps = compile_path(path) if isinstance(path, str) else path
+    values = [document]
+    for recursive, selector in steps:
+        if (recursive):
+            values = [node for value in values for node in descend(value)]
+        values = [child for value in values for child in select(value, selector)]
+    return values
+
+def parse_literal(text):
+    """ Parse the literal of a condition as JSON, falling back to a (quote-stripped) string """
+
+    try:
+        return json.loads(text)
+    except ValueError:
+        if (len(text) > 1) and (text[0] == text[-1] == "'"):
+            return text[1:-1]
+        return text
+
+class Condition:
+    """
+    A condition on a JSON document made of a JSONPath expression and an optional comparison
+
+    Conditions such as `$.status == "done"` or `$.progress >= 100` hold when any of the values
+    matching the path satisfy the comparison, while a bare path (such as `$.result`) holds when
+    any of its values is truthy.
+    """
+
+    text = None
+    steps = None
+    operator = None
+    expected = None
+
+    def __init__(self, text):
+        """
+        Parse the condition
+
+        Parameters
+        ----------
+        text : str
+            The condition (a JSONPath expression, optionally followed by an operator and a JSON
+            literal)
+
+        Raises
+        ------
+        ValueError
+            If the condition can not be parsed
+        """
+
+        self.text = text
+        match = CONDITION_REGEX.match(text)
+        if (match is None):
+            self.steps = compile_path(text)
+        else:
+            self.steps = compile_path(match.group(1))
+            self.operator = OPERATORS[match.group(2)]
+            self.expected = parse_literal(match.group(3))
+
+    def matches(self, document):
+        """
+        Determine if the condition holds for a JSON document
+
+        Parameters
+        ----------
+        document : object
+            The parsed JSON document
+
+        Returns
+        -------
+        matches : bool
+            True if any of the values matching the path satisfy the condition
+        """
+
+        for value in find(document, self.steps):
+            if (self.operator is None):
+                if (value):
+                    return True
+                continue
+
+            try:
+                if (self.operator(value, self.expected)):
+                    return True
+            except TypeError:
+                continue
+        return False
@@ -0,0 +1,255 @@
+import os
+import tempfile
+import threading
+
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+TEXTFILE_NAME = "skelerest.prom"
+
+class Metrics:
+    """ Holds the request counters and latency histograms for the requests executed by Skelerest """
+
+    buckets = None
+    counts = None
+    histograms = None
+    hedges = None
+    first_events = None
+    lock = None
+
+    def __init__(self, buckets=BUCKETS):
+        """
+        Initialize the empty counters and histograms
+
+        Parameters
+        ----------
+        buckets : list<float> (optional)
+            The upper bounds (in seconds) of the latency histogram buckets
+        """
+
+        self.buckets = sorted(buckets)
+        self.counts = {}
+        self.histograms = {}
+        self.hedges = {}
+        self.first_events = {}
+        self.lock = threading.Lock()
+
+    def observe(self, command, method, status, elapsed):
+        """
+        Record the outcome and latency of a single request
+
+        Parameters
+        ----------
+        command : str
+            The Skelebot command that triggered the request
+        method : str
+            The REST method used in the API request
+        status : int or str
+            The status code of the response (or 'error' if no response was received)
+        elapsed : float
+            The number of seconds it took to receive the response
+        """
+
+        count_key = (command, method, str(status))
+        with self.lock:
+            self.counts[count_key] = self.counts.get(count_key, 0) + 1
+            self.__add(self.histograms, (command, method), elapsed)
+
+    def observe_first_event(self, command, method, elapsed):
+        """
+        Record the time it took to receive the first event of a streaming response
+
+        Parameters
+        ----------
+        command : str
+            The Skelebot command that triggered the request
+        method : str
+            The REST method used in the API request
+        elapsed : float
+            The number of seconds from sending the request to receiving its first event
+        """
+
+        with self.lock:
+            self.__add(self.first_events, (command, method), elapsed)
+
+    def observe_hedge(self, command, method):
+        """
+        Record that a duplicate (hedged) request was sent because the first attempt was slow
+
+        Parameters
+        ----------
+        command : str
+            The Skelebot command that triggered the request
+        method : str
+            The REST method used in the API request
+        """
+
+        with self.lock:
+            self.hedges[(command, method)] = self.hedges.get((command, method), 0) + 1
+
+    def get_hedges(self, command):
+        """ Get the number of hedged requests recorded for a command (across all methods) """
+
+        with self.lock:
+            return sum([count for (cmd, method), count in self.hedges.items() if cmd == command])
+
+    def reset(self):
+        """ Clear all of the recorded counters and histograms """
+
+        with self.lock:
+            self.counts = {}
+            self.histograms = {}
+            self.hedges = {}
+            self.first_events = {}
+
+    def collect(self):
+        """
+        Take the recorded counters and histograms, clearing them from the registry
+
+        Returns
+        -------
+        counts : dict
+            The request counts by (command, method, status)
+        histograms : dict
+            The latency histograms by (command, method)
+        hedges : dict
+            The hedged request counts by (command, method)
+        first_events : dict
+            The time to first event histograms of streaming responses by (command, method)
+        """
+
+        with self.lock:
+            counts, histograms, hedges, first_events = self.counts, self.histograms, self.hedges, self.first_events
+            self.counts = {}
+            self.histograms = {}
+            self.hedges = {}
+            self.first_events = {}
+        return counts, histograms, hedges, first_events
+
+    def merge(self, counts, histograms, hedges=None, first_events=None):
+        """
+        Add counters and histograms collected by another registry (such as in a worker process)
+
+        Parameters
+        ----------
+        counts : dict
+            The request counts by (command, method, status)
+        histograms : dict
+            The latency histograms by (command, method), with the same buckets as this registry
+        hedges : dict (optional)
+            The hedged request counts by (command, method)
+        first_events : dict (optional)
+            The time to first event histograms by (command, method), with the same buckets
+        """
+
+        with self.lock:
+            for key, count in counts.items():
+                self.counts[key] = self.counts.get(key, 0) + count
+            self.__merge(self.histograms, histograms)
+            self.__merge(self.first_events, first_events or {})
+            for key, count in (hedges or {}).items():
+                self.hedges[key] = self.hedges.get(key, 0) + count
+
+    def to_openmetrics(self):
+        """
+        Render the counters and histograms in the OpenMetrics text exposition format
+
+        Returns
+        -------
+        text : str
+            The OpenMetrics representation of the recorded metrics
+        """
+
+        lines = [
+            "# TYPE skelerest_requests counter",
+            "# HELP skelerest_requests Number of REST requests executed by Skelerest."
+        ]
+        with self.lock:
+            for (command, method, status), count in sorted(self.counts.items()):
+                labels = f'command="{command}",method="{method}",status="{status}"'
+                lines.append(f"skelerest_requests_total{{{labels}}} {count}")
+
+            lines.append("# TYPE skelerest_request_duration_seconds histogram")
+            lines.append("# HELP skelerest_request_duration_seconds Latency of REST requests executed by Skelerest.")
+            lines.extend(self.__render("skelerest_request_duration_seconds", self.histograms))
+
+            if (self.first_events):
+                lines.append("# TYPE skelerest_first_event_seconds histogram")
+                lines.append("# HELP skelerest_first_event_seconds Time to the first event of streaming responses.")
+                lines.extend(self.__render("skelerest_first_event_seconds", self.first_events))
+
+            if (self.hedges):
+                lines.append("# TYPE skelerest_hedged_requests counter")
+                lines.append("# HELP skelerest_hedged_requests Number of duplicate requests sent because the first attempt was slow.")
+            for (command, method), count in sorted(self.hedges.items()):
+                labels = f'command="{command}",method="{method}"'
+                lines.append(f"skelerest_hedged_requests_total{{{labels}}} {count}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def __add(self, histograms, key, elapsed):
+        """ Add an observation to the histogram of a (command, method) key """
+
+        if (key not in histograms):
+            histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+
+        histogram = histograms[key]
+        for i, bound in enumerate(self.buckets):
+            if (elapsed <= bound):
+                histogram["buckets"][i] += 1
+        histogram["sum"] += elapsed
+        histogram["count"] += 1
+
+    def __merge(self, histograms, others):
+        """ Add the histograms collected by another registry to the histograms of this one """
+
+        for key, other in others.items():
+            if (key not in histograms):
+                histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            histogram = histograms[key]
+            histogram["buckets"] = [a + b for a, b in zip(histogram["buckets"], other["buckets"])]
+            histogram["sum"] += other["sum"]
+            histogram["count"] += other["count"]
+
+    def __render(self, name, histograms):
+        """ Render the lines of a histogram metric in the OpenMetrics format """
+
+        lines = []
+        for (command, method), histogram in sorted(histograms.items()):
+            labels = f'command="{command}",method="{method}"'
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{{labels}}} {histogram["count"]}')
+        return lines
+
+    def write(self, path):
+        """
+        Atomically write the metrics to a file so that collectors never read a partial file
+
+        If the path is a directory (such as the directory of a node_exporter textfile collector)
+        the metrics are written to a 'skelerest.prom' file inside of it.
+
+        Parameters
+        ----------
+        path : str
+            The file or directory path that the metrics are written to
+
+        Returns
+        -------
+        path : str
+            The path of the file that was written
+        """
+
+        if (os.path.isdir(path)):
+            path = os.path.join(path, TEXTFILE_NAME)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".skelerest-", suffix=".tmp")
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(self.to_openmetrics())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+        return path
+
+REGISTRY = Metrics()
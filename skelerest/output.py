@@ -0,0 +1,476 @@
+import sys
+import csv
+import json
+import threading
+from .cassette import redact
+
+FORMATS = ["text", "json", "jsonl", "csv", "quiet"]
+PREFIX = "|SKELEREST| "
+BUFFER_SIZE = 64
+
+class OutputWriter:
+    """ Base writer for the results of Skelerest requests (buffers all output to the stream) """
+
+    indent = None
+    stream = None
+    error_stream = None
+    buffer = None
+    buffer_size = None
+    lock = None
+
+    def __init__(self, stream=None, error_stream=None, buffer_size=BUFFER_SIZE):
+        """
+        Initialize the writer with the stream that the output is written to
+
+        Parameters
+        ----------
+        stream : file (optional)
+            The file-like object that the output is written to (defaults to stdout)
+        error_stream : file (optional)
+            The file-like object that errors are written to (defaults to stderr)
+        buffer_size : int (optional)
+            The number of chunks held in memory before they are written to the stream
+        """
+
+        self.stream = sys.stdout if (stream is None) else stream
+        self.error_stream = sys.stderr if (error_stream is None) else error_stream
+        self.buffer = []
+        self.buffer_size = buffer_size
+        self.lock = threading.RLock()
+
+    def write(self, text):
+        """
+        Add a chunk of text to the buffer, writing the buffer to the stream once it is full
+
+        Parameters
+        ----------
+        text : str
+            The text to be written to the stream
+        """
+
+        with self.lock:
+            self.buffer.append(text)
+            if (len(self.buffer) >= self.buffer_size):
+                self.flush()
+
+    def flush(self):
+        """ Write all of the buffered text to the stream in a single call """
+
+        with self.lock:
+            if (self.buffer):
+                self.stream.write("".join(self.buffer))
+                self.buffer = []
+            self.stream.flush()
+
+    def message(self, message):
+        """
+        Write an informational message (ignored by the structured formats)
+
+        Parameters
+        ----------
+        message : str
+            The message to be displayed
+        """
+
+        return None
+
+    def error(self, message):
+        """
+        Report an error that prevented a request from completing (written to stderr)
+
+        Parameters
+        ----------
+        message : str
+            The description of the error
+        """
+
+        self.error_stream.write(f"{PREFIX}ERROR: {message}\n")
+
+    def request(self, method, endpoint, params, headers, body):
+        """
+        Write the details of a request that is about to be executed
+
+        Parameters
+        ----------
+        method : str
+            The REST method used in the API request (GET, POST, PUT, or DELETE)
+        endpoint : str
+            The http URI endpoint through which the API can be accessed
+        params : dict
+            A dict of the query parameters used in the REST request
+        headers : dict
+            A dict of the header parameters used in the REST request
+        body : str
+            The string representation of the POST/PUT body of the request
+        """
+
+        return None
+
+    def header(self, columns):
+        """
+        Write the header of the rows extracted from the responses (once, before any request)
+
+        Parameters
+        ----------
+        columns : list<str>
+            The names of the columns extracted from the responses
+        """
+
+        return None
+
+    def record(self, record):
+        """
+        Write the structured record for a completed request
+
+        Parameters
+        ----------
+        record : dict
+            The record built from the request and its response (see build_record), holding the
+            `extracted` rows in place of the body if the fields of the response were extracted
+        """
+
+        return None
+
+    def event(self, event):
+        """
+        Write an event of a streaming response as soon as it is received
+
+        Parameters
+        ----------
+        event : dict
+            The index, elapsed seconds, and data of the event (see EventStream), holding the
+            `extracted` rows in place of the data if the fields of the event were extracted
+        """
+
+        return None
+
+    def plan(self, plan):
+        """
+        Write the plan for a request that was rendered but not sent (always as a line of JSON)
+
+        Parameters
+        ----------
+        plan : dict
+            The fully rendered request (see build_plan)
+        """
+
+        self.write(json.dumps(plan) + "\n")
+
+    def comparison(self, comparison):
+        """
+        Write the side-by-side comparison of a request sent to several targets
+
+        Parameters
+        ----------
+        comparison : list<dict>
+            The status, timing, and body diff of each target (see build_comparison)
+        """
+
+        self.write(json.dumps({"comparison": comparison}, indent=self.indent) + "\n")
+
+    def summary(self, summary):
+        """
+        Write the summary of a run of several requests
+
+        Parameters
+        ----------
+        summary : dict
+            The counts (and other statistics) collected over the run
+        """
+
+        self.write(json.dumps({"summary": summary}, indent=self.indent) + "\n")
+
+class TextWriter(OutputWriter):
+    """ Writes human readable output where each line is given a 'skelerest' prefix """
+
+    def message(self, message):
+        message = message.replace("\n", f"\n{PREFIX}")
+        self.write(f"{PREFIX}{message}\n")
+
+    def error(self, message):
+        self.message(f"ERROR: {message}")
+        self.flush()
+
+    def request(self, method, endpoint, params, headers, body):
+        lines = [f"{method} {endpoint}", "PARAMS"]
+        lines.extend([f"- {name} : {value}" for name, value in params.items()])
+        lines.append("HEADERS")
+        lines.extend([f"- {name} : {value}" for name, value in redact(headers).items()])
+        if (body != "None"):
+            lines.append(f"BODY:\n{body}")
+        self.message("\n".join(lines))
+
+    def record(self, record):
+        status = "SUCCESS" if record["ok"] else "ERROR"
+        if (record.get("hedged")):
+            self.message("HEDGED")
+        if (record.get("coalesced")):
+            self.message("COALESCED")
+        if ("events" in record):
+            self.message(f"{status}: {record['status']}: {record['events']} events, first event after {record['first_event']}s")
+            return
+
+        if ("content" in record):
+            self.message(f"{status}: {record['status']}:\n{record['content']}")
+        else:
+            # The records reused by coalesced rows do not keep the raw content of the response
+            self.message(f"{status}: {record['status']}")
+        if ("extracted" in record):
+            self.message("\n".join([json.dumps(row, default=str) for row in record["extracted"]]))
+        elif (record["ok"]) and (record["body"] is not None):
+            self.message(record["body"])
+
+    def event(self, event):
+        title = f"EVENT {event['index']} ({event['elapsed']}s)"
+        if ("type" in event):
+            title = f"{title} {event['type']}"
+        if ("extracted" in event):
+            data = "\n".join([json.dumps(row, default=str) for row in event["extracted"]])
+        else:
+            data = event["data"] if isinstance(event["data"], str) else json.dumps(event["data"])
+        self.message(f"{title}:\n{data}")
+
+    def comparison(self, comparison):
+        lines = ["COMPARISON"]
+        for row in comparison:
+            lines.append(f"- {row['target']} : {row['status']} in {row['elapsed']}s ({row['bytes']} bytes)")
+            if ("diff" in row):
+                lines.extend(row["diff"] if (row["diff"]) else ["  SAME BODY"])
+        self.message("\n".join(lines))
+
+    def summary(self, summary):
+        self.message("SUMMARY: " + ", ".join([f"{name} : {value}" for name, value in summary.items()]))
+
+class JsonWriter(OutputWriter):
+    """ Writes each record as an indented JSON document """
+
+    indent = 2
+
+    def record(self, record):
+        if ("extracted" in record):
+            for row in record["extracted"]:
+                self.write(json.dumps(row, indent=self.indent, default=str) + "\n")
+            return
+
+        record = {key: value for key, value in record.items() if key != "content"}
+        self.write(json.dumps(record, indent=self.indent, default=str) + "\n")
+
+    def event(self, event):
+        if ("extracted" in event):
+            for row in event["extracted"]:
+                self.write(json.dumps(row, indent=self.indent, default=str) + "\n")
+            return
+
+        self.write(json.dumps({"event": event}, indent=self.indent, default=str) + "\n")
+
+class JsonlWriter(JsonWriter):
+    """ Writes each record as a single line of JSON """
+
+    indent = None
+
+class CsvWriter(OutputWriter):
+    """
+    Writes only the rows extracted from the responses as CSV (with the other output dropped)
+
+    Responses whose fields were not extracted (such as failed requests) are reported as errors,
+    and the events of streaming responses are written as rows as they arrive.
+    Values that are not strings are written as JSON, and missing values as empty cells.
+    """
+
+    table = None
+
+    def __init__(self, stream=None, error_stream=None, buffer_size=BUFFER_SIZE):
+        super().__init__(stream=stream, error_stream=error_stream, buffer_size=buffer_size)
+        self.table = csv.writer(self, lineterminator="\n")
+
+    def header(self, columns):
+        self.table.writerow(columns)
+
+    def record(self, record):
+        if ("events" in record):
+            return
+        if ("extracted" not in record):
+            self.error(f"{record['method']} {record['endpoint']} : {record['status']}")
+            return
+
+        self.__write_rows(record["extracted"])
+
+    def event(self, event):
+        if ("extracted" in event):
+            self.__write_rows(event["extracted"])
+
+    def __write_rows(self, rows):
+        """ Write the extracted rows, with the values that are not strings written as JSON """
+
+        for row in rows:
+            self.table.writerow([cell if isinstance(cell, str) else "" if (cell is None) else json.dumps(cell)
+                               for cell in row.values()])
+
+    def comparison(self, comparison):
+        return None
+
+    def summary(self, summary):
+        return None
+
+class QuietWriter(OutputWriter):
+    """ Writes nothing at all, relying on the exit code to report failures """
+
+    def write(self, text):
+        return None
+
+    def error(self, message):
+        return None
+
+WRITERS = {
+    "text": TextWriter,
+    "json": JsonWriter,
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+    "quiet": QuietWriter
+}
+
+def get_writer(format, stream=None, error_stream=None):
+    """
+    Obtain the OutputWriter for the given output format
+
+    Parameters
+    ----------
+    format : str
+        The name of the output format (text, json, jsonl, csv, or quiet)
+    stream : file (optional)
+        The file-like object that the output is written to (defaults to stdout)
+    error_stream : file (optional)
+        The file-like object that errors are written to (defaults to stderr)
+
+    Returns
+    -------
+    writer : OutputWriter
+        The writer that produces the requested output format
+    """
+
+    return WRITERS[format](stream=stream, error_stream=error_stream)
+
+def build_plan(command, method, endpoint, params, headers, body):
+    """
+    Build the plan for a request that has been fully rendered (and signed) but not sent
+
+    Parameters
+    ----------
+    command : str
+        The Skelebot command that triggered the request
+    method : str
+        The REST method used in the API request
+    endpoint : str
+        The populated http URI endpoint
+    params : dict
+        The populated query parameters
+    headers : dict
+        The populated header parameters (including any AWS Authorization headers)
+    body : str or StreamingBody
+        The populated JSON body (or 'None' if the request has no body), or the streaming body of
+        an upload (which is described rather than read)
+
+    Returns
+    -------
+    plan : dict
+        The Dictionary containing everything that would be sent for the request (with the values
+        of the headers that hold credentials redacted)
+    """
+
+    return {
+        "command": command,
+        "method": method,
+        "endpoint": endpoint,
+        "params": params,
+        "headers": redact(headers),
+        "body": None if (body == "None") else str(body)
+    }
+
+def build_stream_record(command, method, endpoint, response, elapsed, events, first_event, size):
+    """
+    Build the structured record for a streaming response once its stream has ended
+
+    Parameters
+    ----------
+    command : str
+        The Skelebot command that triggered the request
+    method : str
+        The REST method used in the API request
+    endpoint : str
+        The http URI endpoint through which the API was accessed
+    response : requests.Response
+        The response whose events were streamed (and whose body has already been consumed)
+    elapsed : float
+        The number of seconds from sending the request to the end of the stream
+    events : int
+        The number of events that were received
+    first_event : float
+        The number of seconds from sending the request to receiving the first event (None if
+        no events were received)
+    size : int
+        The number of bytes that were received in the stream
+
+    Returns
+    -------
+    record : dict
+        The Dictionary containing the status, timing, and headers of the response (with the
+        events written as they were received rather than held in the body)
+    """
+
+    return {
+        "command": command,
+        "method": method,
+        "endpoint": endpoint,
+        "status": response.status_code,
+        "ok": response.ok,
+        "elapsed": round(elapsed, 6),
+        "headers": dict(response.headers),
+        "bytes": size,
+        "body": None,
+        "content": None,
+        "events": events,
+        "first_event": None if (first_event is None) else round(first_event, 6)
+    }
+
+def build_record(command, method, endpoint, response, elapsed, hedged=None):
+    """
+    Build the structured record for a single request and its response
+
+    Parameters
+    ----------
+    command : str
+        The Skelebot command that triggered the request
+    method : str
+        The REST method used in the API request
+    endpoint : str
+        The http URI endpoint through which the API was accessed
+    response : requests.Response
+        The response that was returned by the API
+    elapsed : float
+        The number of seconds it took to receive the response
+    hedged : bool (optional)
+        Whether a duplicate request was sent because the first attempt was slow (only included
+        in the record for requests that are hedged)
+
+    Returns
+    -------
+    record : dict
+        The Dictionary containing the status, timing, headers, and body of the response
+    """
+
+    content = response.content
+    record = {
+        "command": command,
+        "method": method,
+        "endpoint": endpoint,
+        "status": response.status_code,
+        "ok": response.ok,
+        "elapsed": round(elapsed, 6),
+        "headers": dict(response.headers),
+        "bytes": len(content) if isinstance(content, (bytes, str)) else None,
+        "body": response.text,
+        "content": content
+    }
+    if (hedged is not None):
+        record["hedged"] = hedged
+    return record
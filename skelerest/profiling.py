@@ -0,0 +1,232 @@
+import io
+import pstats
+import cProfile
+import tracemalloc
+from .output import PREFIX
+
+CPROFILE = "cprofile"
+TRACEMALLOC = "tracemalloc"
+PROFILE_MODES = [CPROFILE, TRACEMALLOC]
+PROFILE_FILES = {CPROFILE: "skelerest.pstats", TRACEMALLOC: "skelerest.snapshot"}
+PROFILE_ARGS = ["--sr-profile", "--profile"]
+TOP = 20
+ACTIVE = {}
+
+def get_mode(argv):
+    """
+    Find the profiling mode requested on a command line (before it has been parsed)
+
+    Parameters
+    ----------
+    argv : list<str>
+        The command line arguments
+
+    Returns
+    -------
+    mode : str
+        The profiling mode (cprofile if `--profile` is given without a mode), or None if the
+        command is not profiled
+    """
+
+    for i, arg in enumerate(argv):
+        if (arg.split("=", 1)[0] in PROFILE_ARGS) and ("=" in arg):
+            return arg.split("=", 1)[1]
+        if (arg in PROFILE_ARGS):
+            following = argv[i + 1] if (i + 1 < len(argv)) else None
+            return following if (following in PROFILE_MODES) else CPROFILE
+    return None
+
+def start_profiler(argv):
+    """
+    Start profiling if it is requested on the command line, so that the work done before the
+    command line is parsed (such as loading the component and adding its parsers) is profiled
+
+    Parameters
+    ----------
+    argv : list<str>
+        The command line arguments
+
+    Returns
+    -------
+    profiler : Profiler
+        The profiler that was started (None if the command is not profiled)
+    """
+
+    mode = get_mode(argv)
+    if (mode not in PROFILE_MODES) or ("profiler" in ACTIVE):
+        return None
+
+    ACTIVE["profiler"] = Profiler(mode).start()
+    return ACTIVE["profiler"]
+
+def confirm_profiler(argv, commands):
+    """
+    Stop the profiler that was started early unless the command line runs one of the commands
+
+    The commands of the component are only known once it has been loaded, so a profiler that was
+    started for another Skelebot job (which happens to take a `--profile` argument) is stopped and
+    discarded as soon as the component is loaded.
+
+    Parameters
+    ----------
+    argv : list<str>
+        The command line arguments
+    commands : CommandIndex
+        The commands of the component
+
+    Returns
+    -------
+    profiler : Profiler
+        The profiler that keeps running (None if the command is not profiled)
+    """
+
+    profiler = ACTIVE.get("profiler")
+    if (profiler is not None) and (not any(arg in commands for arg in argv)):
+        ACTIVE.pop("profiler").stop()
+        return None
+    return profiler
+
+def get_profiler(mode):
+    """
+    Get the running profiler for a command, starting one if profiling was not started early
+
+    Parameters
+    ----------
+    mode : str
+        The profiling mode (cprofile or tracemalloc)
+
+    Returns
+    -------
+    profiler : Profiler
+        The running profiler (no longer held as the active profiler)
+    """
+
+    profiler = ACTIVE.pop("profiler", None)
+    if (profiler is not None) and (profiler.mode == mode):
+        return profiler
+    if (profiler is not None):
+        profiler.stop()
+    return Profiler(mode).start()
+
+class Profiler:
+    """
+    Profiles the time (with cProfile) or the memory allocations (with tracemalloc) of a command
+
+    The cProfile mode writes a pstats file and reports the time spent in each phase of the
+    execution (such as rendering and signing the requests) along with the functions with the most
+    cumulative time. The tracemalloc mode writes a snapshot of the allocations and reports the
+    peak memory along with the lines that allocated the most memory.
+    """
+
+    mode = None
+    profile = None
+    snapshot = None
+    peak = None
+
+    def __init__(self, mode):
+        """
+        Initialize the profiler
+
+        Parameters
+        ----------
+        mode : str
+            The profiling mode (cprofile or tracemalloc)
+        """
+
+        self.mode = mode
+
+    def start(self):
+        """ Start profiling, returning the profiler """
+
+        if (self.mode == CPROFILE):
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif (not tracemalloc.is_tracing()):
+            tracemalloc.start()
+        return self
+
+    def stop(self):
+        """ Stop profiling, taking the snapshot and the peak memory in the tracemalloc mode """
+
+        if (self.mode == CPROFILE):
+            self.profile.disable()
+        elif (tracemalloc.is_tracing()):
+            self.snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")
+            ])
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def write(self, path=None):
+        """
+        Write the pstats file (cprofile) or the allocation snapshot (tracemalloc)
+
+        Parameters
+        ----------
+        path : str (optional)
+            The path of the file (DEFAULT: skelerest.pstats or skelerest.snapshot)
+
+        Returns
+        -------
+        path : str
+            The path of the file that was written
+        """
+
+        path = PROFILE_FILES[self.mode] if (path is None) else path
+        if (self.mode == CPROFILE):
+            self.profile.dump_stats(path)
+        else:
+            self.snapshot.dump(path)
+        return path
+
+    def get_report(self, phases, top=TOP):
+        """
+        Build the report of the profile
+
+        Parameters
+        ----------
+        phases : list<tuple>
+            The name and function of each phase of the execution (reported in the cprofile mode)
+        top : int (optional)
+            The number of functions (or lines) with the most time (or memory) that are reported
+
+        Returns
+        -------
+        report : str
+            The lines of the report, each with the 'skelerest' prefix
+        """
+
+        lines = self.__get_time_report(phases, top) if (self.mode == CPROFILE) else self.__get_memory_report(top)
+        return "".join([f"{PREFIX}{line}\n" for line in lines])
+
+    def __get_time_report(self, phases, top):
+        """ Build the report of the time spent in each phase and the functions with the most time """
+
+        output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=output)
+        lines = ["PROFILE PHASES (calls, cumulative seconds)"]
+        for name, function in phases:
+            code = function.__code__
+            entry = stats.stats.get((code.co_filename, code.co_firstlineno, code.co_name))
+            calls, cumulative = (0, 0.0) if (entry is None) else (entry[1], entry[3])
+            lines.append(f"- {name} : {calls} calls, {cumulative:.6f}s")
+
+        stats.strip_dirs().sort_stats("cumulative").print_stats(top)
+        lines.append(f"PROFILE TOP {top} FUNCTIONS (by cumulative time)")
+        lines.extend([line for line in output.getvalue().splitlines() if line.strip()])
+        return lines
+
+    def __get_memory_report(self, top):
+        """ Build the report of the peak memory and the lines that allocated the most memory """
+
+        statistics = self.snapshot.statistics("lineno")
+        lines = [
+            f"PROFILE PEAK MEMORY : {self.peak / 1024 / 1024:.2f} MiB",
+            f"PROFILE TOP {top} ALLOCATIONS (by size of the memory still allocated)"
+        ]
+        for statistic in statistics[:top]:
+            frame = statistic.traceback[0]
+            lines.append(f"- {frame.filename}:{frame.lineno} : {statistic.size / 1024:.1f} KiB in {statistic.count} blocks")
+        return lines
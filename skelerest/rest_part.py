@@ -0,0 +1,68 @@
+from schema import Schema, SchemaError, And, Optional
+from skelebot.objects.skeleYaml import SkeleYaml
+
+class RestPart(SkeleYaml):
+    """ Holds a single part of a multipart/form-data request body (a value or a file on disk) """
+
+    schema = Schema({
+        'name': And(str, error='RestPart \'name\' must be a String'),
+        Optional('value'): And(str, error='RestPart \'value\' must be a String'),
+        Optional('file'): And(str, error='RestPart \'file\' must be a String'),
+        Optional('contentType'): And(str, error='RestPart \'contentType\' must be a String'),
+        Optional('filename'): And(str, error='RestPart \'filename\' must be a String')
+    }, ignore_extra_keys=True)
+
+    name = None
+    value = None
+    file = None
+    contentType = None
+    filename = None
+
+    def __init__(self, name, value=None, file=None, contentType=None, filename=None):
+        """
+        Initialize the RestPart with its name and either a value or the path of a file
+
+        Parameters
+        ----------
+        name : str
+            The name of the form field
+        value : str (optional)
+            The value of the form field
+        file : str (optional)
+            The path of the file that is streamed as the content of the part
+        contentType : str (optional)
+            The Content-Type of the file (DEFAULT: guessed from the filename)
+        filename : str (optional)
+            The filename sent for the file (DEFAULT: the name of the file on disk)
+        """
+
+        self.name = name
+        self.value = value
+        self.file = file
+        self.contentType = contentType
+        self.filename = filename
+
+    def __str__(self):
+        """ Overwrite the __str__ method to create a simple string representation of the part """
+        return " ".join([str(item) for item in [self.name, self.value, self.file, self.filename] if item is not None])
+
+    @classmethod
+    def load(cls, config):
+        """
+        Load the class from values provided in a Dictionary config
+
+        Parameters
+        ----------
+        config : dict
+            Dictionary of values used to initialize the class
+
+        Returns
+        -------
+        restPart : RestPart
+            The class object initialized with values from the config Dictionary
+        """
+
+        cls.validate(config)
+        if (("value" in config) == ("file" in config)):
+            raise SchemaError(f"RestPart '{config['name']}' must have either a 'value' or a 'file'")
+        return cls(**config)
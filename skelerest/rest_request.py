@@ -1,10 +1,17 @@
 import re
+import sys
 import json
 import copy
 from enum import Enum
-from schema import Schema, And, Or, Optional
+from schema import Schema, SchemaError, And, Or, Optional
 from skelebot.objects.skeleYaml import SkeleYaml
 from .rest_tuple import RestTuple
+from .rest_target import RestTarget
+from .rest_part import RestPart
+from .upload import file_body, multipart_body
+from .extract import Projection
+from .stream import STREAM_FORMATS
+from .scheduler import PRIORITIES
 
 VARIABLE_REGEX = "{[a-zA-Z]+:?[^}]+?}"
 
@@ -12,11 +19,15 @@ class RestRequest(SkeleYaml):
     """ Holds the information required for a single pre-configured REST request """
 
     class RestVar:
-        """ Holds the information for variables inside the RestRequest """
+        """
+        Holds the information for variables inside the RestRequest
+
+        Large configs hold a variable for every request, so the variables are kept in slots rather
+        than an attribute dictionary and their names and defaults are interned (variables such as
+        `{id}` or `{limit:100}` repeat across many requests).
+        """
 
-        name = None
-        default = None
-        location = None
+        __slots__ = ("name", "default", "location")
 
         class Location(Enum):
             """ Enum for the different variable locations in the RestRequest """
@@ -40,8 +51,8 @@ class RestRequest(SkeleYaml):
                 The Location of the variable inside the RestRequest class
             """
 
-            self.name = name
-            self.default = default
+            self.name = sys.intern(name)
+            self.default = default if (default is None) else sys.intern(default)
             self.location = location
 
         def get_clean_name(self):
@@ -57,7 +68,19 @@ class RestRequest(SkeleYaml):
         Optional('body'): Or(dict, str, error='SkeleRequest \'body\' must be a Dictionary or String'),
         Optional('aws'): And(bool, error='SkeleRequest \'aws\' must be a boolean'),
         Optional('awsProfile'): And(str, error='SkeleRequest \'awsProfile\' must be a String'),
-        Optional('awsRegion'): And(str, error='SkeleRequest \'awsRegion\' must be a String')
+        Optional('awsRegion'): And(str, error='SkeleRequest \'awsRegion\' must be a String'),
+        Optional('connectTimeout'): And(Or(int, float), lambda t: t > 0, error='SkeleRequest \'connectTimeout\' must be a positive number'),
+        Optional('readTimeout'): And(Or(int, float), lambda t: t > 0, error='SkeleRequest \'readTimeout\' must be a positive number'),
+        Optional('deadline'): And(Or(int, float), lambda t: t > 0, error='SkeleRequest \'deadline\' must be a positive number'),
+        Optional('hedgeAfterMs'): And(int, lambda t: t > 0, error='SkeleRequest \'hedgeAfterMs\' must be a positive integer'),
+        Optional('targets'): And(list, error='SkeleRequest \'targets\' must be a list'),
+        Optional('file'): And(str, error='SkeleRequest \'file\' must be a String'),
+        Optional('multipart'): And(list, error='SkeleRequest \'multipart\' must be a list'),
+        Optional('contentType'): And(str, error='SkeleRequest \'contentType\' must be a String'),
+        Optional('extract'): And({str: str}, error='SkeleRequest \'extract\' must be a mapping of column names to JSONPaths'),
+        Optional('stream'): And(str, lambda s: s in STREAM_FORMATS, error='SkeleRequest \'stream\' must be one of: sse, ndjson'),
+        Optional('priority'): And(str, lambda p: p in PRIORITIES, error='SkeleRequest \'priority\' must be one of: high, normal, low'),
+        Optional('weight'): And(Or(int, float), lambda w: w > 0, error='SkeleRequest \'weight\' must be a positive number')
     }, ignore_extra_keys=True)
 
     name = None
@@ -69,11 +92,28 @@ class RestRequest(SkeleYaml):
     aws = None
     awsProfile = None
     awsRegion = None
+    connectTimeout = None
+    readTimeout = None
+    deadline = None
+    hedgeAfterMs = None
+    targets = None
+    file = None
+    multipart = None
+    contentType = None
+    extract = None
+    stream = None
+    priority = None
+    weight = None
+    projection = None # Should not be present in the converted dict
     body_content = None # Should not be present in the converted dict
     variables = None # Should not be present in the converted dict
+    variable_map = None # Should not be present in the converted dict
+    template = None # Should not be present in the converted dict
 
     def __init__(self, name, endpoint, method, params=None, headers=None, body=None, aws=False,
-                 awsProfile=None, awsRegion="us-east-1"):
+                 awsProfile=None, awsRegion="us-east-1", connectTimeout=None, readTimeout=None,
+                 deadline=None, hedgeAfterMs=None, targets=None, file=None, multipart=None,
+                 contentType=None, extract=None, stream=None, priority=None, weight=None):
         """
         Initialize the RestRequest with all necessary and optional details
 
@@ -97,22 +137,61 @@ class RestRequest(SkeleYaml):
             A Dictionary representing the POST/PUT body of the request or a string with the path to
             the JSON request body file
             TODO
+        connectTimeout : float (optional)
+            The number of seconds to wait for a connection to the API (overrides the component)
+        readTimeout : float (optional)
+            The number of seconds to wait for the API to send data (overrides the component)
+        deadline : float (optional)
+            The number of seconds that a whole run of the request may take (overrides the component)
+        hedgeAfterMs : int (optional)
+            The number of milliseconds after which a duplicate of a slow GET request is sent
+        targets : list<RestTarget> (optional)
+            The hosts and/or AWS regions that the request is sent to (overrides the component)
+        file : str (optional)
+            The path of a file that is streamed from disk as the raw binary body of the request
+        multipart : list<RestPart> (optional)
+            The parts of a multipart/form-data body, with the file parts streamed from disk
+        contentType : str (optional)
+            The Content-Type of the file body (DEFAULT: application/octet-stream)
+        extract : dict (optional)
+            The JSONPath of each column projected from the responses by the name of the column
+        stream : str (optional)
+            The format (sse or ndjson) of the events that are streamed in the response
+        priority : str (optional)
+            The priority class (high, normal, or low) of the request in the daemon's scheduler
+        weight : float (optional)
+            The share of the daemon's connections given to the request within its priority class
         """
 
         self.name = name
         self.endpoint = endpoint
-        self.method = method
+        self.method = sys.intern(method)
         self.params = params
         self.headers = headers
         self.aws = aws
-        self.awsProfile = awsProfile
-        self.awsRegion = awsRegion
+        self.awsProfile = awsProfile if (awsProfile is None) else sys.intern(awsProfile)
+        self.awsRegion = awsRegion if (awsRegion is None) else sys.intern(awsRegion)
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.deadline = deadline
+        self.hedgeAfterMs = hedgeAfterMs
+        self.targets = targets
+        self.file = file
+        self.multipart = multipart
+        self.contentType = contentType
+        self.extract = extract
+        self.stream = stream
+        self.priority = priority
+        self.weight = weight
+        self.projection = None if (extract is None) else Projection(extract)
         self.body = body
         self.__load_body(self.body)
         self.__scan_variables(self.endpoint, RestRequest.RestVar.Location.ENDPOINT)
         self.__scan_variables(self.params, RestRequest.RestVar.Location.PARAMS)
         self.__scan_variables(self.headers, RestRequest.RestVar.Location.HEADERS)
         self.__scan_variables(self.body_content, RestRequest.RestVar.Location.BODY)
+        self.__scan_variables(self.file, RestRequest.RestVar.Location.BODY)
+        self.__scan_variables(self.multipart, RestRequest.RestVar.Location.BODY)
 
     def __load_body(self, body):
         """
@@ -140,7 +219,8 @@ class RestRequest(SkeleYaml):
         for curly braces such as `{var_name:default_value}`. Once the variables are located the
         names and default values (if provided as default values are optional) are parsed out and
         RestVar objects are created for each variable with the given location. These variables are
-        then appended to the variables list in the class itself.
+        then appended to the variables list in the class itself, unless a variable with the same
+        name was already found (a variable can be used in several places of the request).
 
         Parameters
         ----------
@@ -159,14 +239,46 @@ class RestRequest(SkeleYaml):
             var_list = [var.replace("{", "") for var in var_list]
             var_list = [var.replace("}", "") for var in var_list]
 
+            names = [variable.name for variable in variables]
             for var in var_list:
                 var = var.split(":")
                 name = var[0]
                 default = var[1] if len(var) > 1 else None
-                variables.append(RestRequest.RestVar(name, default, location))
+                if (name not in names):
+                    names.append(name)
+                    variables.append(RestRequest.RestVar(name, default, location))
 
         self.variables = variables
 
+    def get_variable(self, name):
+        """
+        Look up a variable of the request by its name
+
+        The lookup table is only built for requests whose variables are looked up, so that large
+        configs do not hold a table for every request.
+
+        Parameters
+        ----------
+        name : str
+            The name of the variable as written in the config or as used in the CLI (with dashes
+            converted to underscores)
+
+        Returns
+        -------
+        variable : RestRequest.RestVar
+            The variable with the given name (None if the request has no such variable)
+        """
+
+        if (self.variable_map is None):
+            variable_map = {}
+            for var in self.variables:
+                variable_map[var.get_clean_name()] = var
+            for var in self.variables:
+                variable_map[var.name] = var
+            self.variable_map = variable_map
+
+        return self.variable_map.get(name)
+
     def __get_dict(self, tuples):
         """
         Converts a list of RestTuples into a Dictionary
@@ -212,14 +324,199 @@ class RestRequest(SkeleYaml):
 
         return self.__get_dict(self.headers)
     
+    def __compile(self, content):
+        """
+        Compile content of the request into a template that can be rendered repeatedly
+
+        The content is split on the variables it contains, so that rendering only requires the
+        variable slots to be filled in and the parts to be joined back together.
+
+        Parameters
+        ----------
+        content : str
+            The string representation of the content (endpoint, param, header, or body)
+
+        Returns
+        -------
+        template : tuple
+            The list of literal parts and the list of (index, name, default) variable slots
+        """
+
+        parts = re.split(f"({VARIABLE_REGEX})", content)
+        slots = []
+        for i in range(1, len(parts), 2):
+            var = parts[i][1:-1].split(":", 1)
+            slots.append((i, var[0], var[1] if len(var) > 1 else None))
+
+        return parts, slots
+
+    def __fill(self, template, values):
+        """
+        Fill the variable slots of a compiled template with the given values
+
+        Parameters
+        ----------
+        template : tuple
+            The compiled template (see __compile)
+        values : dict
+            The values of the variables by name, variables that are not present fall back to
+            their default value (or are left as-is when they have no default)
+
+        Returns
+        -------
+        rendered : str
+            The content with all of the variables replaced by their values
+        """
+
+        parts, slots = template
+        if (not slots):
+            return parts[0]
+
+        parts = list(parts)
+        for i, name, default in slots:
+            value = values.get(name, default)
+            if (value is not None):
+                parts[i] = str(value)
+        return "".join(parts)
+
+    def __clean_body(self, body):
+        """
+        Clean the body of the request for use in JSON payloads
+
+        Parameters
+        ----------
+        body : str
+            The string representation of the request body
+
+        Returns
+        -------
+        clean : str
+            The clean version of the request body ready for use in a request
+        """
+
+        clean = body
+        clean = clean.replace("'", "\"")
+        clean = clean.replace("True", "true")
+        clean = clean.replace("False", "false")
+        return clean
+
+    def __compile_upload(self):
+        """
+        Compile the file path or the multipart parts of the request into templates
+
+        Returns
+        -------
+        template : tuple or list
+            The template of the file path, the templates of the name, value, file, and filename of
+            each part (with its content type), or None if the request does not upload a body
+        """
+
+        if (self.file is not None):
+            return self.__compile(self.file)
+        if (self.multipart is None):
+            return None
+
+        parts = []
+        for part in self.multipart:
+            templates = [None if (item is None) else self.__compile(item)
+                         for item in [part.name, part.value, part.file, part.filename]]
+            parts.append((*templates, part.contentType))
+        return parts
+
+    def __render_upload(self, template, values):
+        """
+        Render the streaming body of a request that uploads a file or a multipart body
+
+        Parameters
+        ----------
+        template : tuple or list
+            The compiled file path or parts (see __compile_upload)
+        values : dict
+            The values of the variables by name
+
+        Returns
+        -------
+        body : StreamingBody
+            The body that is streamed from disk when the request is sent
+        """
+
+        if (self.file is not None):
+            return file_body(self.__fill(template, values), self.contentType)
+
+        parts = []
+        for name, value, file, filename, content_type in template:
+            part = {"name": self.__fill(name, values), "contentType": content_type}
+            for key, item in [("value", value), ("file", file), ("filename", filename)]:
+                part[key] = None if (item is None) else self.__fill(item, values)
+            parts.append(part)
+        return multipart_body(parts)
+
+    def render(self, values):
+        """
+        Render the request with the given variable values
+
+        The endpoint, each param and header, and the body are compiled into templates the first
+        time the request is rendered, so rendering many sets of values only pays the cost of
+        filling in the variables. Requests that upload a file or a multipart body are rendered
+        with a streaming body (and its Content-Type header unless one is configured), which only
+        reads the files from disk as the request is sent.
+
+        Parameters
+        ----------
+        values : dict
+            The values of the variables by name (as written in the config)
+
+        Returns
+        -------
+        endpoint : str
+            The populated endpoint
+        params : dict
+            The populated query parameters
+        headers : dict
+            The populated header parameters
+        body : str or StreamingBody
+            The populated JSON body (or 'None' if the request has no body), or the streaming body
+            of an upload
+        """
+
+        if (self.template is None):
+            self.template = (
+                self.__compile(self.endpoint),
+                [(self.__compile(name), self.__compile(value)) for name, value in self.get_params_dict().items()],
+                [(self.__compile(name), self.__compile(value)) for name, value in self.get_headers_dict().items()],
+                self.__compile(str(self.body_content)),
+                self.__compile_upload()
+            )
+
+        endpoint, params, headers, body, upload = self.template
+        endpoint = self.__fill(endpoint, values)
+        params = {self.__fill(name, values): self.__fill(value, values) for name, value in params}
+        headers = {self.__fill(name, values): self.__fill(value, values) for name, value in headers}
+        if (upload is None):
+            body = self.__clean_body(self.__fill(body, values))
+        else:
+            body = self.__render_upload(upload, values)
+            if ("content-type" not in [name.lower() for name in headers]):
+                headers["Content-Type"] = body.content_type
+        return endpoint, params, headers, body
+
     def toDict(self):
         bc = self.body_content
         vrs = self.variables
+        vmp = self.variable_map
+        tmp = self.template
+        prj = self.projection
         self.body_content = None
         self.variables = None
+        self.variable_map = None
+        self.template = None
+        self.projection = None
         dct = super().toDict()
         self.body_content = bc
         self.variables = vrs
+        self.variable_map = vmp
+        self.template = tmp
+        self.projection = prj
         return dct
 
     @classmethod
@@ -239,10 +536,22 @@ class RestRequest(SkeleYaml):
         """
 
         cls.validate(config)
+        if (len([attr for attr in ["body", "file", "multipart"] if attr in config]) > 1):
+            raise SchemaError("SkeleRequest 'body', 'file', and 'multipart' can not be combined")
+        if ("extract" in config):
+            try:
+                Projection(config["extract"])
+            except ValueError as error:
+                raise SchemaError(f"SkeleRequest 'extract' is invalid: {error}")
+
         values = {}
         for attr, value in config.items():
             if (attr == "params" or attr == "headers"):
                 values[attr] = RestTuple.loadList(value)
+            elif (attr == "targets"):
+                values[attr] = RestTarget.loadList(value)
+            elif (attr == "multipart"):
+                values[attr] = RestPart.loadList(value)
             else:
                 values[attr] = value
 
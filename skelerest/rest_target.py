@@ -0,0 +1,67 @@
+from urllib.parse import urlsplit, urlunsplit
+from schema import Schema, And, Optional
+from skelebot.objects.skeleYaml import SkeleYaml
+
+class RestTarget(SkeleYaml):
+    """ Holds the host and/or AWS region that a REST request can be sent to """
+
+    schema = Schema({
+        Optional('name'): And(str, error='RestTarget \'name\' must be a String'),
+        Optional('host'): And(str, error='RestTarget \'host\' must be a String'),
+        Optional('awsRegion'): And(str, error='RestTarget \'awsRegion\' must be a String'),
+        Optional('awsProfile'): And(str, error='RestTarget \'awsProfile\' must be a String')
+    }, ignore_extra_keys=True)
+
+    name = None
+    host = None
+    awsRegion = None
+    awsProfile = None
+
+    def __init__(self, name=None, host=None, awsRegion=None, awsProfile=None):
+        """
+        Initialize the RestTarget with the host and AWS settings that override those of the request
+
+        Parameters
+        ----------
+        name : str (optional)
+            The name of the target (defaults to the host or the AWS region)
+        host : str (optional)
+            The host (with an optional scheme and port) that replaces the host of the endpoint
+        awsRegion : str (optional)
+            The AWS region used to sign the request
+        awsProfile : str (optional)
+            The AWS profile used to sign the request
+        """
+
+        self.name = name
+        self.host = host
+        self.awsRegion = awsRegion
+        self.awsProfile = awsProfile
+
+    def get_name(self):
+        """ Get the name of the target as shown in the output """
+        return self.name or self.host or self.awsRegion
+
+    def apply(self, endpoint):
+        """
+        Point an endpoint at the host of the target
+
+        Parameters
+        ----------
+        endpoint : str
+            The rendered http URI endpoint of the request
+
+        Returns
+        -------
+        endpoint : str
+            The endpoint with its host (and scheme if the target has one) replaced
+        """
+
+        if (self.host is None):
+            return endpoint
+
+        url = urlsplit(endpoint)
+        if ("://" in self.host):
+            host = urlsplit(self.host)
+            return urlunsplit((host.scheme, host.netloc, url.path, url.query, url.fragment))
+        return urlunsplit((url.scheme, self.host, url.path, url.query, url.fragment))
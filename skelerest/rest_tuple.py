@@ -1,8 +1,14 @@
+import sys
 from schema import Schema, And
 from skelebot.objects.skeleYaml import SkeleYaml
 
 class RestTuple(SkeleYaml):
-    """ Holds the information for name value pairs for REST requests (query/header parameters) """
+    """
+    Holds the information for name value pairs for REST requests (query/header parameters)
+
+    The names and values are interned as the same pairs (such as a Content-Type header) tend to be
+    repeated across the requests of large configs.
+    """
     
     schema = Schema({
         'name': And(str, error='RestTuple \'name\' must be a String'),
@@ -24,8 +30,8 @@ class RestTuple(SkeleYaml):
             The value of the pair
         """
 
-        self.name = name
-        self.value = value
+        self.name = sys.intern(name)
+        self.value = sys.intern(value)
 
     def __str__(self):
         """ Overwrite the __str__ method to create a simple string representation of the tuple """
@@ -0,0 +1,90 @@
+import heapq
+import itertools
+import threading
+import weakref
+
+HIGH = "high"
+NORMAL = "normal"
+LOW = "low"
+PRIORITIES = [HIGH, NORMAL, LOW]
+
+class Scheduler:
+    """
+    Shares a fixed number of in-flight request slots between the commands running in a process
+
+    Requests that find a free slot (with nobody waiting) are sent straight away. Otherwise they
+    wait, and every freed slot goes to the waiting request of the highest priority class, so that
+    latency-sensitive requests skip ahead of bulk traffic. Within a class, the slots are shared
+    between the flows (the commands) in proportion to their weights through weighted fair
+    queueing: each request of a flow is tagged with a virtual finish time that advances by
+    1/weight, and the request with the earliest tag is served first. A flow that was idle starts
+    from the virtual time of its class, so it can not claim the slots it did not use.
+    """
+
+    capacity = None
+    inflight = None
+    waiting = None
+    clocks = None
+    finishes = None
+    sequence = None
+    condition = None
+
+    def __init__(self, capacity):
+        """
+        Initialize the scheduler with the number of slots
+
+        Parameters
+        ----------
+        capacity : int
+            The maximum number of requests that are in-flight at once (such as the size of the
+            shared connection pool)
+        """
+
+        self.capacity = max(1, capacity)
+        self.inflight = 0
+        self.waiting = []
+        self.clocks = {priority: 0.0 for priority in PRIORITIES}
+        self.finishes = weakref.WeakKeyDictionary()
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+
+    def acquire(self, flow, priority=NORMAL, weight=1):
+        """
+        Block until a slot is granted to a request of the flow
+
+        Parameters
+        ----------
+        flow : object
+            The flow that the request belongs to (such as the execution of a command), which is
+            only referenced weakly
+        priority : str (optional)
+            The priority class of the request (high, normal, or low)
+        weight : float (optional)
+            The share of the slots of the class that the flow is given relative to other flows
+        """
+
+        with self.condition:
+            start = max(self.finishes.get(flow, 0.0), self.clocks[priority])
+            finish = start + 1 / weight
+            self.finishes[flow] = finish
+            ticket = (PRIORITIES.index(priority), finish, next(self.sequence))
+            heapq.heappush(self.waiting, ticket)
+            while (self.waiting[0] is not ticket) or (self.inflight >= self.capacity):
+                self.condition.wait()
+
+            heapq.heappop(self.waiting)
+            self.clocks[priority] = start
+            self.inflight += 1
+            # The next request in line may fit into another free slot
+            self.condition.notify_all()
+
+    def release(self):
+        """ Release the slot of a request that is no longer in-flight """
+
+        with self.condition:
+            self.inflight -= 1
+            self.condition.notify_all()
+
+    def get_waiting(self):
+        """ Get the number of requests that are waiting for a slot """
+        return len(self.waiting)
@@ -1,14 +1,64 @@
-import json
-import ast
-import boto3
+import sys
+import time
+import argparse
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests as request_api
-from schema import Schema, And, Optional
+from requests.exceptions import RequestException
+from schema import Schema, And, Or, Optional
 from skelebot.objects.component import Activation, Component
 from skelebot.objects.skeleYaml import SkeleYaml
 from .rest_request import RestRequest
-from .aws_auth import add_aws_headers
+from .rest_target import RestTarget
+from .aws_auth import add_aws_headers, CONTENT_TYPE
+from .output import FORMATS, PREFIX, get_writer, build_record, build_stream_record, build_plan
+from .metrics import REGISTRY
+from .cassette import Cassette, canonical_request, request_key, RECORD, REPLAY
+from .batch import read_rows, get_row_values
+from .concurrency import AdaptiveLimiter
+from .checkpoint import Checkpoint, is_success
+from .workers import chunk_rows, init_worker, execute_chunk
+from .daemon import SOCKET, POOL_SIZE, serve, forward, is_running
+from .execution import Execution, CONNECT_TIMEOUT, READ_TIMEOUT
+from .circuit import CircuitBreakers, get_host, OPEN, THRESHOLD, OPEN_SECONDS
+from .hedge import Hedge, HEDGE_METHODS
+from .compare import build_comparison
+from .coalesce import Coalescer, COALESCE_METHODS
+from .commands import CommandIndex, get_command
+from .watch import Watch, BACKOFF_LIMIT
+from .upload import StreamingBody
+from .stream import EventStream, STREAM_FORMATS
+from .catalog import CatalogIndex
+from .profiling import PROFILE_MODES, CPROFILE, start_profiler, confirm_profiler, get_profiler
+from .scheduler import PRIORITIES, NORMAL
 
-COMMAND_TEMPLATE = "{method}-{name}"
+SERVE_COMMAND = "skelerest-serve"
+CHECKPOINT_SUFFIX = ".checkpoint"
+OPTION_PREFIX = "sr-"
+
+def get_option_names(name, claimed=None):
+    """
+    Get the option strings of an option that Skelerest adds to its commands
+
+    Parameters
+    ----------
+    name : str
+        The name of the option (such as 'format')
+    claimed : list<str> (optional)
+        The option strings of the request variables of the command
+
+    Returns
+    -------
+    names : list<str>
+        The prefixed option string (such as '--sr-format'), followed by the plain option string if
+        it is not claimed by a variable
+    """
+
+    names = [f"--{OPTION_PREFIX}{name}"]
+    if (f"--{name}" not in (claimed or [])):
+        names.append(f"--{name}")
+    return names
 
 class Skelerest(Component):
     """ Component Class for configuring and executing REST reqeuests through Skelebot """
@@ -17,67 +67,85 @@ class Skelerest(Component):
     commands = None
 
     schema = Schema({
-        'requests': And(list, error='Skelerest \'requests\' must be a list')
+        Optional('requests'): And(list, error='Skelerest \'requests\' must be a list'),
+        Optional('include'): And([str], error='Skelerest \'include\' must be a list of Strings'),
+        Optional('connectTimeout'): And(Or(int, float), lambda t: t > 0, error='Skelerest \'connectTimeout\' must be a positive number'),
+        Optional('readTimeout'): And(Or(int, float), lambda t: t > 0, error='Skelerest \'readTimeout\' must be a positive number'),
+        Optional('deadline'): And(Or(int, float), lambda t: t > 0, error='Skelerest \'deadline\' must be a positive number'),
+        Optional('targets'): And(list, error='Skelerest \'targets\' must be a list')
     }, ignore_extra_keys=True)
 
     requests = None
+    include = None
+    connectTimeout = None
+    readTimeout = None
+    deadline = None
+    targets = None
+    catalogs = None # Should not be present in the converted dict
+    session = None # Should not be present in the converted dict
+    scheduler = None # Should not be present in the converted dict
 
-    def __init__(self, requests=None):
+    def __init__(self, requests=None, connectTimeout=None, readTimeout=None, deadline=None,
+                 targets=None, include=None):
         """
         Initialize the Skelerest Component with the list of requests
 
+        The catalogs matching the include globs are indexed (through the cached index) so that
+        their commands are available, but their requests are only loaded once one of their
+        commands is executed.
+
         Parameters
         ----------
         requests : list<RestRequest>
             list of RestRequest objects to perform CRUD operations in an API
+        connectTimeout : float (optional)
+            The default number of seconds to wait for a connection to the API
+        readTimeout : float (optional)
+            The default number of seconds to wait for the API to send data
+        deadline : float (optional)
+            The default number of seconds that a whole run (including every row of a batch) may take
+        targets : list<RestTarget> (optional)
+            The default hosts and/or AWS regions that every request is sent to
+        include : list<str> (optional)
+            The glob patterns of YAML catalog files holding more requests
         """
 
+        self.connectTimeout = connectTimeout
+        self.readTimeout = readTimeout
+        self.deadline = deadline
+        self.targets = targets
+        self.include = include
         self.requests = {}
-        for req in requests:
-            self.requests[COMMAND_TEMPLATE.format(method=req.method.lower(), name=req.name)] = req
+        for req in ([] if (requests is None) else requests):
+            self.requests[get_command(req)] = req
 
-        self.commands = list(self.requests.keys())
-
-    def __display(self, message):
-        """
-        Print a single message with a 'skelerest' prefix
-
-        Parameters
-        ----------
-        message : str
-            The message to be displayed via a  print command
-        """
+        catalogs = None
+        if (include is not None):
+            self.catalogs = CatalogIndex()
+            self.catalogs.load(include)
+            catalogs = self.catalogs.commands
 
-        message = message.replace("\n", "\n|SKELEREST| ")
-        print(f"|SKELEREST| {message}")
+        self.commands = CommandIndex(self.requests, [SERVE_COMMAND], catalogs)
 
-    def __show_execution(self, method, endpoint, params, headers, body):
+    def get_request(self, command):
         """
-        Display the execution of the REST command for the user
+        Get the request of a command, loading it from its catalog if it is not configured inline
 
         Parameters
         ----------
-        method : str
-            The REST method used in the API request (GET, POST, PUT, or DELETE)
-        endpoint : str
-            The http URI endpoint through which the API can be accessed
-        params : dict
-            A dict of the query parameters used in the REST request
-        headers : dict
-            A dict of the header parameters used in the REST request
-        body : dict
-            A Dictionary representing the POST/PUT body of the request
+        command : str
+            The name of the command
+
+        Returns
+        -------
+        req : RestRequest
+            The request of the command (None if the component has no such command)
         """
 
-        self.__display(f"{method} {endpoint}")
-        self.__display(f"PARAMS")
-        for name, value in params.items():
-            self.__display(f"- {name} : {value}")
-        self.__display(f"HEADERS")
-        for name, value in headers.items():
-            self.__display(f"- {name} : {value}")
-        if (body != "None"):
-            self.__display(f"BODY:\n{body}")
+        req = self.requests.get(command)
+        if (req is None) and (self.catalogs is not None):
+            req = self.catalogs.get_request(command)
+        return req
 
     def addParsers(self, subparsers):
         """
@@ -86,7 +154,8 @@ class Skelerest(Component):
         Each request in the component is translated to a command in the Skelebot CLI using the
         REST method and the name provided for the request (get-my-api-data). For each request
         there are parameters generated from all scanned variables in the configuration. These are
-        optional parameters unless a default value is specified.
+        optional parameters unless a default value is specified. The commands of the included
+        catalogs are added from the index of the catalogs, without loading their requests.
 
         Parameters
         ----------
@@ -94,39 +163,108 @@ class Skelerest(Component):
             The ArgumentParser in Skelebot on which the Skelerest commands will be added
         """
 
-        for cmd, req in self.requests.items():
-            help_message = f"{req.method.upper()} to {req.endpoint}"
-            restparser = subparsers.add_parser(cmd, help=help_message)
-            for var in req.variables:
-                name = f"--{var.name}"
-                if (var.default is None):
-                    restparser.add_argument(name, required=True, help="REQUIRED")
+        for cmd, method, endpoint, variables in self.__get_parser_details():
+            help_message = f"{method.upper()} to {endpoint}"
+            # The options of the component give way to the variables of the request that share their
+            # names, and are always available with the prefix (such as --sr-format)
+            claimed = [f"--{var_name}" for var_name, default in variables]
+            restparser = subparsers.add_parser(cmd, help=help_message, add_help=False)
+            restparser.add_argument(*[name for name in ["-h", "--help"] if name not in claimed], action="help",
+                                    help="show this help message and exit")
+            for var_name, default in variables:
+                name = f"--{var_name}"
+                if (default is None):
+                    # Required variables are validated on execution as they can come from a batch file
+                    restparser.add_argument(name, default=None, help="REQUIRED")
                 else:
-                    restparser.add_argument(name, default=var.default, help=f"DEFAULT: {var.default}")
+                    restparser.add_argument(name, default=default, help=f"DEFAULT: {default}")
+            restparser.add_argument(*get_option_names("format", claimed), default="text", choices=FORMATS,
+                                    help="Output format for the request results (DEFAULT: text)")
+            restparser.add_argument(*get_option_names("metrics-file", claimed), default=None,
+                                    help="Write OpenMetrics request counters and latencies to this file or textfile collector directory")
+            restparser.add_argument(*get_option_names("batch", claimed), default=None, metavar="FILE",
+                                    help="Execute the request for every row of variables in this CSV or JSON Lines file")
+            restparser.add_argument(*get_option_names("concurrency", claimed), default=1, type=int, metavar="N",
+                                    help="Maximum number of batch requests in-flight at once, adapted to the latency and errors of the API (DEFAULT: 1)")
+            restparser.add_argument(*get_option_names("workers", claimed), default=1, type=int, metavar="N",
+                                    help="Number of processes that the batch is sharded across (DEFAULT: 1)")
+            restparser.add_argument(*get_option_names("checkpoint", claimed), default=None, metavar="FILE",
+                                    help="Journal of the completed batch rows (DEFAULT: the batch file with a .checkpoint suffix)")
+            resume_group = restparser.add_mutually_exclusive_group()
+            resume_group.add_argument(*get_option_names("resume", claimed), action="store_true",
+                                      help="Skip the batch rows that were already completed according to the checkpoint")
+            resume_group.add_argument(*get_option_names("retry-failed", claimed), action="store_true",
+                                      help="Only execute the batch rows that failed according to the checkpoint")
+            restparser.add_argument(*get_option_names("dry-run", claimed), action="store_true",
+                                    help="Write the rendered requests as JSON Lines plans instead of sending them")
+            restparser.add_argument(*get_option_names("connect-timeout", claimed), default=None, type=float, metavar="SECONDS",
+                                    help=f"Seconds to wait for a connection to the API (DEFAULT: {CONNECT_TIMEOUT})")
+            restparser.add_argument(*get_option_names("read-timeout", claimed), default=None, type=float, metavar="SECONDS",
+                                    help=f"Seconds to wait for the API to send data (DEFAULT: {READ_TIMEOUT})")
+            restparser.add_argument(*get_option_names("deadline", claimed), default=None, type=float, metavar="SECONDS",
+                                    help="Seconds that the whole run may take, rows that are not reached in time are left for --resume")
+            restparser.add_argument(*get_option_names("target", claimed), default=None, action="append", metavar="NAME",
+                                    help="Only send the request to this target (can be repeated, DEFAULT: every configured target)")
+            restparser.add_argument(*get_option_names("circuit-threshold", claimed), default=THRESHOLD, type=float, metavar="RATE",
+                                    help=f"Failure rate of a host at which its batch requests are short-circuited (DEFAULT: {THRESHOLD})")
+            restparser.add_argument(*get_option_names("circuit-open", claimed), default=OPEN_SECONDS, type=float, metavar="SECONDS",
+                                    help=f"Seconds that a host is short-circuited before it is probed again (DEFAULT: {OPEN_SECONDS})")
+            restparser.add_argument(*get_option_names("no-circuit-breaker", claimed), action="store_true",
+                                    help="Send every batch request even if its host keeps failing")
+            restparser.add_argument(*get_option_names("no-coalesce", claimed), action="store_true",
+                                    help="Send every batch row even if it renders the same GET, PUT, or DELETE request as another row")
+            restparser.add_argument(*get_option_names("watch", claimed), default=None, type=float, metavar="SECONDS",
+                                    help="Poll the GET request every this many seconds (backing off while it is unchanged), writing only the responses that change")
+            restparser.add_argument(*get_option_names("until", claimed), default=None, metavar="CONDITION",
+                                    help="Stop watching once the response body meets this JSONPath condition (such as '$.status == \"done\"')")
+            restparser.add_argument(*get_option_names("max-interval", claimed), default=None, type=float, metavar="SECONDS",
+                                    help=f"Maximum seconds between polls while the response is unchanged (DEFAULT: {BACKOFF_LIMIT} times the --watch interval)")
+            restparser.add_argument(*get_option_names("priority", claimed), default=None, choices=PRIORITIES,
+                                    help="Priority class of the requests among the commands running in the daemon (DEFAULT: normal)")
+            restparser.add_argument(*get_option_names("weight", claimed), default=None, type=float, metavar="N",
+                                    help="Share of the daemon's connections given to the requests within their priority class (DEFAULT: 1)")
+            restparser.add_argument(*get_option_names("stream", claimed), default=None, choices=STREAM_FORMATS,
+                                    help="Write the events of a streaming (sse or ndjson) response as they arrive")
+            restparser.add_argument(*get_option_names("profile", claimed), default=None, nargs="?", const=CPROFILE, choices=PROFILE_MODES,
+                                    help="Profile the time (cprofile) or memory (tracemalloc) of the command")
+            restparser.add_argument(*get_option_names("profile-file", claimed), default=None, metavar="FILE",
+                                    help="Write the pstats file or allocation snapshot of --profile to this file")
+            restparser.add_argument(*get_option_names("socket", claimed), default=SOCKET, metavar="PATH",
+                                    help=f"Socket of the Skelerest daemon that the command is forwarded to when it is running (DEFAULT: {SOCKET})")
+            restparser.add_argument(*get_option_names("no-daemon", claimed), action="store_true",
+                                    help="Execute the command in this process even if the Skelerest daemon is running")
+            restparser.set_defaults(sr_stdout=None, sr_stderr=None)
+            cassette_group = restparser.add_mutually_exclusive_group()
+            cassette_group.add_argument(*get_option_names("record", claimed), default=None, metavar="DIR",
+                                        help="Record the responses to this directory for later replay")
+            cassette_group.add_argument(*get_option_names("replay", claimed), default=None, metavar="DIR",
+                                        help="Replay the responses recorded in this directory instead of sending the request")
+
+        serveparser = subparsers.add_parser(SERVE_COMMAND, help="Run the Skelerest daemon that keeps the requests, sessions, and credentials warm")
+        serveparser.add_argument(*get_option_names("socket"), default=SOCKET, metavar="PATH",
+                                 help=f"Path of the Unix socket that the daemon listens on (DEFAULT: {SOCKET})")
+        serveparser.add_argument(*get_option_names("pool-size"), default=POOL_SIZE, type=int, metavar="N",
+                                 help=f"Number of connections shared by the commands running in the daemon (DEFAULT: {POOL_SIZE})")
 
         return subparsers
 
-    def __clean_body(self, body):
+    def __get_parser_details(self):
         """
-        Clean the body of the request for use in JSON payloads
-
-        Parameters
-        ----------
-        body : str
-            The string representation of the request body
+        Get the details needed to add the parser of every command (inline requests first)
 
         Returns
         -------
-        clean : str
-            The clean version of the request body ready for use in a request
+        details : generator<tuple>
+            The command, method, endpoint, and variables (name and default value) of each request
         """
 
-        clean = body
-        clean = clean.replace("'", "\"")
-        clean = clean.replace("True", "true")
-        clean = clean.replace("False", "false")
-        return clean
+        for cmd, req in self.requests.items():
+            yield cmd, req.method, req.endpoint, [(var.name, var.default) for var in req.variables]
 
+        if (self.catalogs is not None):
+            for cmd, entry in self.catalogs.commands.items():
+                if (cmd not in self.requests):
+                    yield cmd, entry["method"], entry["endpoint"], entry["variables"]
 
     def execute(self, config, args, host=None):
         """
@@ -134,10 +272,57 @@ class Skelerest(Component):
 
         Based on the command that was passed to the Skelebot CLI (in args) the associated request
         is executed after populating all of the given variables with the values provided (or
-        default values).
+        default values). When a batch file is provided with `--batch`, the request is executed
+        once for every row in the file, with the values in the row taking precedence over the
+        values provided through the CLI. Batches can be executed concurrently (up to the
+        `--concurrency` limit) with the number of in-flight requests adapted to the latency and
+        errors of the API, or sharded across several processes with `--workers`. Batches send their
+        requests through a pooled session, with a circuit breaker for each host that
+        short-circuits its requests while it keeps failing. The outcome of every row is written to a checkpoint journal so that an
+        interrupted batch can be continued with `--resume`, or its failed rows executed again with
+        `--retry-failed`. With `--dry-run` the fully rendered (and signed) requests
+        are written as JSON Lines request plans instead of being sent.
+
+        When targets (hosts and/or AWS regions) are configured on the request or the component, the
+        request is sent to every target (or those selected with `--target`) concurrently, with
+        each target rendered and signed separately, and a side-by-side comparison of the status,
+        latency, and body of the responses is written.
+
+        The results are written in the output format selected with the `--format` argument (text,
+        json, jsonl, csv, or quiet). If the response code from any request is 400 or above, an error
+        is reported and the CLI exits with a non-zero status code. For requests that `extract`
+        fields from their responses only the extracted rows of successful responses are written,
+        which is the only output of the csv format.
+
+        When the Skelerest daemon is running (started with the `skelerest-serve` command), the
+        command is forwarded to it over its Unix socket so that it is executed with warm sessions
+        and credentials, unless `--no-daemon` is provided. The daemon runs the commands forwarded
+        to it side by side, sharing its connections between their requests by the `priority`
+        class and `weight` of each request (overridden with `--priority` and `--weight`).
+
+        Every request is sent with a connect and read timeout, and the whole run can be bounded
+        with a deadline (rows of a batch that are not reached in time are left for `--resume`).
+        These are configured on the request or the component, and overridden through the CLI.
+        GET requests configured with `hedgeAfterMs` send a duplicate request when the first one
+        is slow to respond, using whichever response arrives first.
+
+        Requests configured with `stream` (or run with `--stream`) read their response as a
+        stream of Server-Sent Events or newline-delimited JSON, writing each event as soon as it
+        arrives and reporting the time to the first event along with the total time.
+
+        With `--watch` a GET request is polled (as a conditional request) until its response meets
+        the `--until` JSONPath condition, writing only the responses that change.
 
-        If the response code from the request is 400 or above, an error message is printed and the
-        CLI exits with a non-zero status code.
+        Responses can be recorded to a directory with `--record` and replayed from it with
+        `--replay`, in which case no request is sent (and no AWS signing is performed).
+
+        Every request is counted and timed in the metrics registry, which is written out in the
+        OpenMetrics format when the `--metrics-file` argument is provided.
+
+        With `--profile` the command is profiled (with cProfile or tracemalloc) from the moment the
+        component is loaded, and the profile is written to a file with a report of the time spent
+        in each phase (or the peak memory) written to stderr. Profiled commands are not forwarded
+        to the daemon.
 
         Parameters
         ----------
@@ -146,66 +331,882 @@ class Skelerest(Component):
         args : argparse.Namespace
             The arguments passed through the CLI that correspond to the variables in the request
         host : str (optional)
-            An alternate host on which to execute the requests (NOT IN USE)
+            The Skelebot (Docker) host, which is not used as requests are always sent from the
+            local machine (the hosts that requests are sent to are configured as targets)
         """
 
-        req = self.requests[args.job]
-        endpoint = req.endpoint
+        if (args.job == SERVE_COMMAND):
+            self.__serve(args)
+            return
+        if (args.sr_profile is None):
+            self.__execute(args)
+            return
+
+        profiler = get_profiler(args.sr_profile)
+        try:
+            self.__execute(args)
+        finally:
+            profiler.stop()
+            path = profiler.write(args.sr_profile_file)
+            stream = sys.stderr if (args.sr_stderr is None) else args.sr_stderr
+            stream.write(profiler.get_report(self.__get_phases()))
+            stream.write(f"{PREFIX}PROFILE WRITTEN TO {path}\n")
+
+    def __execute(self, args):
+        """ Execute the request of the command (see execute) """
+
+        req = self.get_request(args.job)
+        if (req is None):
+            writer = get_writer(args.sr_format, stream=args.sr_stdout, error_stream=args.sr_stderr)
+            writer.error(f"The request of {args.job} is no longer in its catalog")
+            exit(1)
+
+        # Worker processes are forked, which is not safe inside of the threads of the daemon, and
+        # watches would keep polling in the daemon after the client is interrupted
+        watched = (args.sr_watch is not None) or (args.sr_until is not None)
+        forwardable = (args.sr_profile is None) and (args.sr_workers <= 1) and (not watched)
+        if (not args.sr_no_daemon) and (forwardable):
+            code = forward(args.sr_socket, args, self, req)
+            if (code is not None):
+                if (code != 0):
+                    exit(code)
+                return
+
+        summary = {"requests": 0, "succeeded": 0, "failed": 0}
+        writer = get_writer(args.sr_format, stream=args.sr_stdout, error_stream=args.sr_stderr)
+        session = self.session
+        execution = self.get_execution(args, writer, self.__get_expires(req, args))
+        targets = self.__get_targets(req, args)
+        if (args.sr_target is not None) and (len(targets) != len(set(args.sr_target))):
+            known = [target.get_name() for target in targets]
+            writer.error(f"Unknown targets: {', '.join([name for name in args.sr_target if name not in known])}")
+            exit(1)
+        if (args.sr_format == "csv") and (req.projection is None):
+            writer.error("The csv format requires the request to extract fields from its responses")
+            exit(1)
+        if (len(targets) > 1) and (args.sr_batch is not None):
+            writer.error("Batches are sent to a single target, select one with --target")
+            exit(1)
+        if (args.sr_weight is not None) and (args.sr_weight <= 0):
+            writer.error("The weight of the requests must be a positive number")
+            exit(1)
+        unstreamable = (args.sr_watch is not None) or (len(targets) > 1) or (execution.cassette is not None)
+        if (execution.stream is not None) and (unstreamable):
+            writer.error("Streaming responses can not be watched, compared across targets, recorded, or replayed")
+            exit(1)
+        if (args.sr_watch is not None) or (args.sr_until is not None):
+            execution.watch = self.__get_watch(req, args, targets, writer)
+            if (session is None):
+                self.open_session()
+
+        rows = [(0, None)]
+        checkpoint = None
+        if (args.sr_batch is not None) and (args.sr_dry_run):
+            rows = read_rows(args.sr_batch)
+        elif (args.sr_batch is not None):
+            checkpoint = Checkpoint(args.sr_checkpoint or f"{args.sr_batch}{CHECKPOINT_SUFFIX}")
+            rows = execution.until_expired(self.__get_batch_rows(args, checkpoint, summary))
+            if (args.sr_workers <= 1) and (session is None):
+                self.open_session(max(POOL_SIZE, args.sr_concurrency))
+
+        # Dry runs only write plans (which are always JSON Lines), and the plans hold the signature
+        if (req.aws == True) and (args.sr_replay is None) and (not args.sr_dry_run):
+            writer.message("USING AWS AUTH")
+        if (req.projection is not None) and (not args.sr_dry_run):
+            writer.header(list(req.extract))
+
+        try:
+            if (checkpoint is not None):
+                checkpoint.open(resume=(args.sr_resume or args.sr_retry_failed))
+
+            if (checkpoint is not None) and (args.sr_workers > 1):
+                self.__execute_workers(execution, rows, summary, checkpoint)
+            elif (checkpoint is not None) and (args.sr_concurrency > 1):
+                limiter = AdaptiveLimiter(args.sr_concurrency)
+                self.__execute_concurrent(execution, rows, summary, checkpoint, limiter)
+                summary["concurrency"] = limiter.get_limit()
+            elif (len(targets) > 1):
+                self.__execute_targets(execution, targets, summary)
+            elif (execution.watch is not None):
+                status = self.__execute_watch(execution)
+                self.__complete(summary, None, 0, status)
+            else:
+                for offset, row in rows:
+                    status = self.__execute_row(execution, row)
+                    self.__complete(summary, checkpoint, offset, status)
+
+            if (checkpoint is not None) and (req.hedgeAfterMs is not None) and (summary["requests"] > 0):
+                summary["hedged"] = execution.metrics.get_hedges(args.job)
+                summary["hedge_rate"] = round(summary["hedged"] / summary["requests"], 4)
+            if (checkpoint is not None):
+                writer.summary(summary)
+            if (execution.expired) and (execution.watch is not None):
+                writer.error(f"The deadline was exceeded before the response met: {args.sr_until}")
+            elif (execution.expired):
+                writer.error("The deadline was exceeded, the remaining rows can be executed with --resume")
+        finally:
+            writer.flush()
+            if (session is None):
+                self.close_session()
+            if (checkpoint is not None):
+                checkpoint.close()
+            if (args.sr_metrics_file is not None):
+                execution.metrics.write(args.sr_metrics_file)
+            REGISTRY.merge(*execution.metrics.collect())
+
+        if (summary["failed"] > 0) or (execution.expired):
+            exit(1)
+
+    def __get_phases(self):
+        """ Get the name and function of each phase of the execution that is reported by the profiler """
+
+        return [
+            ("load", Skelerest._Skelerest__load),
+            ("addParsers", Skelerest.addParsers),
+            ("RestRequest", RestRequest.__init__),
+            ("render", RestRequest.render),
+            ("sign", add_aws_headers),
+            ("dispatch", Skelerest._Skelerest__dispatch),
+            ("send", Skelerest._Skelerest__send)
+        ]
+
+    def __get_watch(self, req, args, targets, writer):
+        """
+        Build the watch that polls the request, exiting if it can not be watched
+
+        Parameters
+        ----------
+        req : RestRequest
+            The request to be watched
+        args : argparse.Namespace
+            The arguments passed through the CLI
+        targets : list<RestTarget>
+            The targets that the request is sent to
+        writer : OutputWriter
+            The writer that errors are reported to
+
+        Returns
+        -------
+        watch : Watch
+            The watch with the interval, maximum interval, and condition from the CLI
+        """
+
+        if (args.sr_watch is None):
+            writer.error("--until can only be used with --watch")
+            exit(1)
+        if (req.method != "GET") or (args.sr_batch is not None) or (args.sr_dry_run) or (len(targets) > 1):
+            writer.error("--watch can only be used for a GET request sent to a single target without --batch or --dry-run")
+            exit(1)
+
+        try:
+            return Watch(args.sr_watch, args.sr_until, args.sr_max_interval)
+        except ValueError as error:
+            writer.error(str(error))
+            exit(1)
+
+    def __execute_watch(self, execution):
+        """
+        Poll the request until its response meets the condition of the watch
+
+        The polls are sent through the pooled session (reusing its connection) and only the
+        responses that changed are written. The watch ends once the condition is met, the
+        deadline passes (which is only reported as a failure when there is a condition), or it is
+        interrupted (with Ctrl-C).
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command (with the watch)
+
+        Returns
+        -------
+        status : int or str
+            The status code of the last response ('error' if no response was received)
+        """
+
+        watch = execution.watch
+        status = None
+        try:
+            while (True):
+                status = self.__execute_row(execution, None)
+                execution.writer.flush()
+                if (watch.done):
+                    break
+
+                delay = watch.delay
+                remaining = execution.get_remaining()
+                if (remaining is not None) and (remaining <= delay):
+                    execution.expired = (watch.condition is not None)
+                    break
+                time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+
+        return status
+
+    def __serve(self, args):
+        """
+        Run the Skelerest daemon on a Unix socket until it is interrupted
+
+        Parameters
+        ----------
+        args : argparse.Namespace
+            The arguments passed through the CLI (containing the path of the socket)
+        """
+
+        writer = get_writer("text")
+        if (is_running(args.sr_socket)):
+            writer.error(f"A Skelerest daemon is already running on {args.sr_socket}")
+            writer.flush()
+            exit(1)
+
+        writer.message(f"SERVING ON {args.sr_socket}")
+        writer.flush()
+        serve(self, args.sr_socket, args.sr_pool_size)
+
+    def __get_values(self, req, args):
+        """ Get the values of the request variables (by name) provided through the CLI """
+        return {var.name: vars(args)[var.get_clean_name()] for var in req.variables}
+
+    def __get_cassette(self, args):
+        """ Get the cassette for recording or replaying responses (None if neither is enabled) """
+
+        cassette = None
+        if (args.sr_record is not None):
+            cassette = Cassette(args.sr_record, RECORD)
+        elif (args.sr_replay is not None):
+            cassette = Cassette(args.sr_replay, REPLAY)
+        return cassette
+
+    def __get_targets(self, req, args):
+        """ Get the targets of the request (or the component) that were selected through the CLI """
+
+        targets = req.targets or self.targets or []
+        if (args.sr_target is not None):
+            targets = [target for target in targets if target.get_name() in args.sr_target]
+        return targets
+
+    def __get_setting(self, req, name, override=None):
+        """ Get a run setting from the CLI (override), falling back on the request and then the component """
+
+        for value in [override, getattr(req, name), getattr(self, name)]:
+            if (value is not None):
+                return value
+        return None
+
+    def __get_expires(self, req, args):
+        """ Get the time (from time.monotonic) at which the deadline of the run passes (None if no deadline) """
+
+        deadline = self.__get_setting(req, "deadline", args.sr_deadline)
+        return None if (deadline is None) else time.monotonic() + deadline
+
+    def get_execution(self, args, writer=None, expires=None):
+        """
+        Build the execution state shared by every request sent for the command
+
+        Parameters
+        ----------
+        args : argparse.Namespace
+            The arguments passed through the CLI
+        writer : OutputWriter (optional)
+            The writer that the results are written to
+        expires : float (optional)
+            The time (from time.monotonic) at which the deadline of the run passes
+
+        Returns
+        -------
+        execution : Execution
+            The execution with the variable values, the cassette, the timeouts, the target, the
+            stream format, and (for batches) the circuit breakers and the coalescer of the run
+        """
+
+        req = self.get_request(args.job)
+        targets = self.__get_targets(req, args)
+        connect = self.__get_setting(req, "connectTimeout", args.sr_connect_timeout)
+        read = self.__get_setting(req, "readTimeout", args.sr_read_timeout)
+        timeout = (CONNECT_TIMEOUT if (connect is None) else connect, READ_TIMEOUT if (read is None) else read)
+        execution = Execution(req, args, self.__get_values(req, args), writer, self.__get_cassette(args),
+                              timeout, expires, target=targets[0] if (len(targets) == 1) else None)
+        execution.stream = args.sr_stream or req.stream
+        execution.priority = args.sr_priority or req.priority or NORMAL
+        execution.weight = args.sr_weight or req.weight or 1
+
+        if (args.sr_batch is not None) and (not args.sr_dry_run):
+            if (not args.sr_no_circuit_breaker):
+                execution.circuits = CircuitBreakers(args.sr_circuit_threshold, args.sr_circuit_open)
+            if (not args.sr_no_coalesce) and (req.method in COALESCE_METHODS) and (execution.stream is None):
+                execution.coalescer = Coalescer()
+
+        return execution
+
+    def open_session(self, pool_size=POOL_SIZE):
+        """
+        Open a session that pools connections across all of the requests that are sent
+
+        Parameters
+        ----------
+        pool_size : int (optional)
+            The maximum number of connections kept open to each host
+        """
+
+        self.session = request_api.Session()
+        adapter = request_api.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close_session(self):
+        """ Close the pooled session (requests are sent without a session afterwards) """
+
+        if (self.session is not None):
+            self.session.close()
+            self.session = None
+
+    def execute_rows(self, execution, rows, outcomes=None):
+        """
+        Execute the request for a chunk of batch rows (used by the worker processes)
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command, kept by the worker across its
+            chunks (with the writer of the current chunk)
+        rows : list<tuple>
+            The offset and variable values of each row in the chunk
+        outcomes : list (optional)
+            The list to which the offset and status of each executed row is appended
+
+        Returns
+        -------
+        outcomes : list<tuple>
+            The offset and status of each row that was executed
+        """
+
+        outcomes = [] if (outcomes is None) else outcomes
+        for offset, row in execution.until_expired(rows):
+            outcomes.append((offset, self.__execute_row(execution, row)))
+
+        if (execution.expired):
+            execution.writer.error("The deadline was exceeded, the remaining rows can be executed with --resume")
+            exit(1)
+
+        return outcomes
+
+    def __execute_workers(self, execution, rows, summary, checkpoint):
+        """
+        Shard the batch rows across a pool of worker processes
+
+        Rows are handed to the workers in chunks, with a bounded number of chunks in-flight so
+        that only a small part of the batch is held in memory. Each worker keeps its own pooled
+        session and credential cache. The output, checkpoint entries, and metrics of each chunk
+        are merged in the order of the batch, so the output is the same as a single process run.
+
+        Parameters
+        ----------
+        execution : Execution
+            The state of the command (arguments, writer, deadline, and metrics) that the results
+            of the workers are merged into
+        rows : iterable<tuple>
+            The offset and variable values of each row of the batch
+        summary : dict
+            The counts of the requests, succeeded requests, and failed requests in the run
+        checkpoint : Checkpoint
+            The checkpoint journal of the batch
+        """
+
+        args = execution.args
+        worker_args = argparse.Namespace(**vars(args))
+        worker_args.stdout = None
+        worker_args.stderr = None
+        pending = deque()
+        initargs = (self, worker_args, execution.expires)
+        with multiprocessing.Pool(args.sr_workers, initializer=init_worker, initargs=initargs) as pool:
+            for chunk in chunk_rows(rows):
+                pending.append(pool.apply_async(execute_chunk, (chunk,)))
+                if (len(pending) >= args.sr_workers * 4):
+                    self.__merge_chunk(pending.popleft().get(), execution, summary, checkpoint)
+
+            while (pending):
+                self.__merge_chunk(pending.popleft().get(), execution, summary, checkpoint)
+
+        summary["workers"] = args.sr_workers
+
+    def __merge_chunk(self, result, execution, summary, checkpoint):
+        """
+        Merge the results of a chunk executed by a worker process into the run
+
+        Parameters
+        ----------
+        result : tuple
+            The outcomes, output, metrics, and exit code of the chunk (see execute_chunk)
+        execution : Execution
+            The state of the command, whose writer and metrics the chunk is merged into
+        summary : dict
+            The counts of the requests, succeeded requests, and failed requests in the run
+        checkpoint : Checkpoint
+            The checkpoint journal of the batch
+        """
+
+        outcomes, output, metrics, code = result
+        execution.writer.write(output)
+        execution.metrics.merge(*metrics)
+        for offset, status in outcomes:
+            self.__complete(summary, checkpoint, offset, status)
+
+        if (code is not None):
+            exit(code)
+
+    def __get_batch_rows(self, args, checkpoint, summary):
+        """
+        Get the rows of the batch file that need to be executed based on the checkpoint journal
+
+        With `--resume` every row that is already in the journal is skipped, and with
+        `--retry-failed` only the rows whose most recent outcome in the journal was a failure are
+        executed. Otherwise every row in the batch file is executed.
+
+        Parameters
+        ----------
+        args : argparse.Namespace
+            The arguments passed through the CLI
+        checkpoint : Checkpoint
+            The checkpoint journal of the batch
+        summary : dict
+            The summary of the run, to which the number of skipped rows is added
+
+        Returns
+        -------
+        rows : generator<tuple>
+            The offset and variable values of each row to be executed
+        """
+
+        if (args.sr_retry_failed):
+            outcomes = checkpoint.load()
+            failed = {offset for offset, status in outcomes.items() if not is_success(status)}
+            summary["skipped"] = len(outcomes) - len(failed)
+            return read_rows(args.sr_batch, select=failed.__contains__)
+        elif (args.sr_resume):
+            outcomes = checkpoint.load()
+            summary["skipped"] = len(outcomes)
+            return read_rows(args.sr_batch, select=lambda offset: offset not in outcomes)
+
+        return read_rows(args.sr_batch)
+
+    def __complete(self, summary, checkpoint, offset, status):
+        """
+        Count the outcome of a request in the summary of the run and record it in the checkpoint
+
+        Parameters
+        ----------
+        summary : dict
+            The counts of the requests, succeeded requests, and failed requests in the run
+        checkpoint : Checkpoint
+            The checkpoint journal of the batch (None outside of batches)
+        offset : int
+            The offset of the row in the batch file
+        status : int or str
+            The status code of the response, 'error' if no response was received, 'open' if the
+            request was short-circuited, or None if the request was not sent
+        """
+
+        if (status is not None):
+            summary["requests"] += 1
+            summary["succeeded" if is_success(status) else "failed"] += 1
+            if (status == OPEN):
+                summary["short-circuited"] = summary.get("short-circuited", 0) + 1
+            if (checkpoint is not None):
+                checkpoint.write(offset, status)
+
+    def __execute_targets(self, execution, targets, summary):
+        """
+        Send the request to every target concurrently and compare the responses side-by-side
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command
+        targets : list<RestTarget>
+            The targets that the request is sent to
+        summary : dict
+            The counts of the requests, succeeded requests, and failed requests in the run
+        """
+
+        execution.records = {}
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            futures = [pool.submit(self.__execute_target, execution, target) for target in targets]
+            statuses = [future.result() for future in futures]
+
+        for status in statuses:
+            self.__complete(summary, None, 0, status)
+
+        if (not execution.args.sr_dry_run):
+            empty = {"status": "error", "elapsed": None, "bytes": None, "body": None}
+            records = [execution.records.get(target.get_name(), dict(empty, target=target.get_name()))
+                       for target in targets]
+            execution.writer.comparison(build_comparison(records))
+
+    def __execute_target(self, execution, target):
+        """ Execute the request for a single target (see __execute_row) """
+        return self.__execute_row(execution, None, target)
+
+    def __execute_row(self, execution, row, target=None):
+        """
+        Render, sign, and send (or plan) the request for a single set of variable values
+
+        A request that fails without a response (such as a connection error or a timeout) is
+        reported and counted as a failure (rather than stopping a batch or raising). Requests
+        to a host whose circuit breaker is open are short-circuited without being sent, and rows
+        that render the same (idempotent) request as another row reuse its response.
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command
+        row : dict
+            The values of the variables provided by a batch row (None outside of batches)
+        target : RestTarget (optional)
+            The target that the request is sent to (defaults to the target of the execution)
+
+        Returns
+        -------
+        status : int or str
+            The status code of the response, 'error' if no response was received, 'open' if the
+            request was short-circuited, or None for a dry run
+        """
+
+        req = execution.req
+        target = execution.target if (target is None) else target
+        writer = execution.writer
         method = req.method
-        params = str(req.get_params_dict())
-        headers = str(req.get_headers_dict())
-        body = str(req.body_content)
-        aws = req.aws
-
-        # Populate Variables from Command Arguments
-        for var in req.variables:
-            var_key = f"{{{var.name}}}" if (var.default is None) else f"{{{var.name}:{var.default}}}"
-            var_value = vars(args)[var.get_clean_name()]
-            if (var.location == RestRequest.RestVar.Location.ENDPOINT):
-                endpoint = endpoint.replace(var_key, var_value)
-            elif (var.location == RestRequest.RestVar.Location.PARAMS):
-                params = params.replace(var_key, var_value)
-            elif (var.location == RestRequest.RestVar.Location.HEADERS):
-                headers = headers.replace(var_key, var_value)
-            elif (var.location == RestRequest.RestVar.Location.BODY):
-                body = body.replace(var_key, var_value)
-
-        body = self.__clean_body(body)
-        params = json.loads(params.replace("'", "\""))
-        headers = json.loads(headers.replace("'", "\""))
-
-        if (aws == True):
-            print("USING AWS AUTH")
+        row_values = get_row_values(req, execution.values, row)
+        missing = [f"--{var.name}" for var in req.variables if row_values[var.name] is None]
+        if (missing):
+            writer.error(f"Missing required variables: {', '.join(missing)}")
+            exit(1)
+
+        endpoint, params, headers, body = req.render(row_values)
+        if (target is not None):
+            endpoint = target.apply(endpoint)
+
+        coalescer = execution.coalescer
+        if (coalescer is None):
+            return self.__dispatch(execution, method, endpoint, params, headers, body, target)[0]
+
+        # Rows are matched on the unsigned request as the signature changes with the time
+        key = request_key(canonical_request(method, endpoint, params, headers, body))
+        leader, flight = coalescer.join(key)
+        if (not leader):
+            status, record = flight.wait()
+            if (record is not None):
+                writer.record(dict(record, coalesced=True))
+            return status
+
+        status, record = "error", None
+        try:
+            status, record = self.__dispatch(execution, method, endpoint, params, headers, body, target)
+        finally:
+            coalescer.finish(key, flight, status, record)
+        return status
+
+    def __dispatch(self, execution, method, endpoint, params, headers, body, target=None):
+        """
+        Sign and send (or plan) a rendered request through the circuit breaker of its host
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command
+        method : str
+            The REST method used in the API request (GET, POST, PUT, or DELETE)
+        endpoint : str
+            The populated http URI endpoint (pointed at the target)
+        params : dict
+            The populated query parameters
+        headers : dict
+            The populated header parameters
+        body : str
+            The populated JSON body (or 'None' if the request has no body)
+        target : RestTarget (optional)
+            The target that the request is sent to
+
+        Returns
+        -------
+        status : int or str
+            The status code of the response, 'error' if no response was received, 'open' if the
+            request was short-circuited, or None for a dry run
+        record : dict
+            The record of the response (None if no response was received)
+        """
+
+        req = execution.req
+        args = execution.args
+        writer = execution.writer
+        breaker = None
+        if (execution.circuits is not None):
+            breaker = execution.circuits.get(endpoint)
+            if (not breaker.allow()):
+                return OPEN, None
+
+        # The canonical request is taken before signing so replays do not need AWS credentials
+        recording = None
+        if (execution.cassette is not None):
+            recording = canonical_request(method, endpoint, params, headers, body)
+
+        watch = execution.watch
+        if (watch is not None):
+            headers = dict(headers, **watch.get_headers())
+
+        if (req.aws == True) and (args.sr_replay is None):
             profile = req.awsProfile
             region = req.awsRegion
-            headers = add_aws_headers(endpoint, profile, region, method, params, headers, body=body)
-
-        self.__show_execution(method, endpoint, params, headers, body)
-        if (method == "GET"):
-            response = request_api.get(endpoint, params=params, headers=headers)
-        elif (method == "POST"):
-            response = request_api.post(endpoint, data=body, params=params, headers=headers)
-        elif (method == "PUT"):
-            response = request_api.put(endpoint, data=body, params=params, headers=headers)
-        elif (method == "DELETE"):
-            response = request_api.delete(endpoint, params=params, headers=headers)
-
-        if (response.ok):
-            self.__display(f"SUCCESS: {response.status_code}:\n{response.content}")
-            if response.text is not None:
-                self.__display(response.text)
+            if (target is not None):
+                profile = target.awsProfile or profile
+                region = target.awsRegion or region
+            content_types = [value for name, value in headers.items() if name.lower() == "content-type"]
+            headers = add_aws_headers(endpoint, profile, region, method, params, headers, body=body,
+                                      content_type=content_types[0] if (content_types) else CONTENT_TYPE)
+
+        if (args.sr_dry_run):
+            writer.plan(build_plan(args.job, method, endpoint, params, headers, body))
+            return None, None
+
+        if (watch is None) or (watch.polls == 0):
+            writer.request(method, endpoint, params, headers, body)
+        status, record = "error", None
+        try:
+            response, record = self.__send(execution, method, endpoint, params, headers, body,
+                                           recording, target)
+            status = response.status_code
+        except RequestException as error:
+            writer.error(f"{method} {endpoint} : {error}")
+            if (watch is not None):
+                watch.observe_error()
+        finally:
+            if (breaker is not None) and (breaker.record(status)):
+                writer.error(f"Too many failed requests to {get_host(endpoint)}, short-circuiting its requests for {breaker.open_seconds}s")
+
+        return status, record
+
+    def __execute_limited(self, limiter, execution, row):
+        """
+        Execute the request for a single row, releasing its slot in the limiter with the outcome
+
+        Parameters
+        ----------
+        limiter : AdaptiveLimiter
+            The limiter in which a slot has been acquired for the request
+        execution, row
+            See __execute_row
+
+        Returns
+        -------
+        status : int or str
+            The status code of the response or 'error' if no response was received
+        """
+
+        status = "error"
+        start = time.perf_counter()
+        try:
+            status = self.__execute_row(execution, row)
+            return status
+        finally:
+            # Short-circuited requests were not sent, so they say nothing about the latency
+            limiter.release(None if (status == OPEN) else time.perf_counter() - start, status)
+
+    def __execute_concurrent(self, execution, rows, summary, checkpoint, limiter):
+        """
+        Execute the request for every batch row on a pool of threads
+
+        The number of requests in-flight at once is controlled by the adaptive limiter, which
+        grows while the latency stays flat and backs off when the latency rises or the API
+        responds with 429 or 5xx status codes. Completed requests are counted (and recorded in the
+        checkpoint) as they finish so that only the in-flight requests are held in memory.
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command
+        rows : iterable<tuple>
+            The offset and variable values of each row of the batch
+        summary : dict
+            The counts of the requests, succeeded requests, and failed requests in the run
+        checkpoint : Checkpoint
+            The checkpoint journal of the batch
+        limiter : AdaptiveLimiter
+            The limiter that controls the number of in-flight requests
+        """
+
+        pending = {}
+        with ThreadPoolExecutor(max_workers=execution.args.sr_concurrency) as pool:
+            for offset, row in rows:
+                limiter.acquire()
+                future = pool.submit(self.__execute_limited, limiter, execution, row)
+                pending[future] = offset
+                for done in [done for done in pending if done.done()]:
+                    self.__complete(summary, checkpoint, pending.pop(done), done.result())
+
+            for future, offset in pending.items():
+                self.__complete(summary, checkpoint, offset, future.result())
+
+    def __send(self, execution, method, endpoint, params, headers, body, recording=None,
+               target=None):
+        """
+        Send the fully populated request, recording its latency and outcome
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command (writer, cassette, timeouts)
+        method : str
+            The REST method used in the API request (GET, POST, PUT, or DELETE)
+        endpoint : str
+            The http URI endpoint through which the API can be accessed
+        params : dict
+            A dict of the query parameters used in the REST request
+        headers : dict
+            A dict of the header parameters used in the REST request
+        body : str or StreamingBody
+            The string representation of the POST/PUT body of the request (or the streaming body
+            of an upload)
+        recording : dict (optional)
+            The canonical (unsigned) form of the request used as the key in the cassette
+        target : RestTarget (optional)
+            The target that the request is sent to
+
+        Returns
+        -------
+        response : requests.Response
+            The response that was returned by the API (the first of the attempts for hedged requests)
+        record : dict
+            The record of the response that was written (see build_record), with the rows
+            extracted from successful responses (or the event counts and timing of a streaming
+            response, see build_stream_record)
+        """
+
+        command = execution.args.job
+        cassette = execution.cassette
+        hedge_after = execution.req.hedgeAfterMs
+        session = request_api if (self.session is None) else self.session
+        options = {} if (execution.stream is None) else {"stream": True}
+        scheduler = self.scheduler
+        if (cassette is not None) and (cassette.mode == REPLAY):
+            scheduler = None
+        hedged = None
+        events = None
+        status = "error"
+        if (scheduler is not None):
+            # The request waits for its turn at the shared connections before it is timed
+            scheduler.acquire(execution, execution.priority, execution.weight)
+        start = time.perf_counter()
+        try:
+            if (cassette is not None) and (cassette.mode == REPLAY):
+                response = cassette.load(recording)
+                if (response is None):
+                    execution.writer.error(f"No recorded response for {method} {endpoint} in {cassette.directory}")
+                    exit(1)
+            elif (hedge_after is not None) and (method in HEDGE_METHODS) and (execution.stream is None):
+                hedge = Hedge(lambda: session.request(method, endpoint, params=params, headers=headers,
+                                                      timeout=execution.get_timeout(), stream=True),
+                              hedge_after / 1000)
+                try:
+                    response = hedge.run()
+                finally:
+                    hedged = hedge.hedged
+                    if (hedged):
+                        execution.metrics.observe_hedge(command, method)
+            elif (method == "GET"):
+                response = session.get(endpoint, params=params, headers=headers,
+                                       timeout=execution.get_timeout(), **options)
+            elif (method == "POST"):
+                response = session.post(endpoint, data=body, params=params, headers=headers,
+                                        timeout=execution.get_timeout(), **options)
+            elif (method == "PUT"):
+                response = session.put(endpoint, data=body, params=params, headers=headers,
+                                       timeout=execution.get_timeout(), **options)
+            elif (method == "DELETE"):
+                response = session.delete(endpoint, params=params, headers=headers,
+                                          timeout=execution.get_timeout(), **options)
+            status = response.status_code
+            if (execution.stream is not None) and (response.ok):
+                events = self.__consume(execution, response, start)
+            if (cassette is not None) and (cassette.mode == RECORD):
+                cassette.save(recording, response)
+        finally:
+            elapsed = time.perf_counter() - start
+            if (scheduler is not None):
+                scheduler.release()
+            execution.metrics.observe(command, method, status, elapsed)
+            if (isinstance(body, StreamingBody)):
+                body.close()
+
+        if (events is not None):
+            record = build_stream_record(command, method, endpoint, response, elapsed, events.events,
+                                         events.first_event, events.size)
         else:
-            self.__display(f"ERROR: {response.status_code}:\n{response.content}")
-            exit(1)
+            record = build_record(command, method, endpoint, response, elapsed, hedged)
+        projection = execution.req.projection
+        if (projection is not None) and (response.ok) and (events is None):
+            rows = projection.extract(record["body"])
+            if (rows is not None):
+                record["extracted"] = rows
+        if (target is not None):
+            record["target"] = target.get_name()
+            if (execution.records is not None):
+                execution.records[record["target"]] = record
+        if (execution.watch is None) or (execution.watch.observe(response)):
+            execution.writer.record(record)
+        return response, record
+
+    def __consume(self, execution, response, start):
+        """
+        Write the events of a streaming response as they arrive
+
+        Parameters
+        ----------
+        execution : Execution
+            The state shared by every request sent for the command (writer and stream format)
+        response : requests.Response
+            The response of a request that was sent with `stream=True`
+        start : float
+            The time (from time.perf_counter) at which the request was sent
+
+        Returns
+        -------
+        events : EventStream
+            The stream that was read, with its number of events and bytes and the time to its
+            first event
+        """
+
+        command = execution.args.job
+        projection = execution.req.projection
+        events = EventStream(response, execution.stream, start)
+        try:
+            for event in events:
+                if (events.events == 1):
+                    execution.metrics.observe_first_event(command, execution.req.method, events.first_event)
+                if (projection is not None) and (isinstance(event["data"], (dict, list))):
+                    event["extracted"] = [projection.project(event["data"])]
+                execution.writer.event(event)
+                execution.writer.flush()
+        finally:
+            response.close()
+        return events
 
     def toDict(self):
         cmds = self.commands
         reqs = self.requests
+        ctls = self.catalogs
+        sess = self.session
+        schd = self.scheduler
         self.commands = None
         self.requests = [*self.requests.values()]
+        self.catalogs = None
+        self.session = None
+        self.scheduler = None
         dct = super().toDict()
         self.commands = cmds
         self.requests = reqs
+        self.catalogs = ctls
+        self.session = sess
+        self.scheduler = schd
         return dct
 
     @classmethod
@@ -224,10 +1225,25 @@ class Skelerest(Component):
             A Skelerest component object configured with the requests from the config dict
         """
 
+        # Skelebot loads the component before parsing the command line, so --profile is found in
+        # the raw arguments in order to profile the loading of the component and its parsers
+        start_profiler(sys.argv)
+        skelerest = cls.__load(config)
+        confirm_profiler(sys.argv, skelerest.commands)
+        return skelerest
+
+    @classmethod
+    def __load(cls, config):
+        """ Instantiate the class based on a configuration Dictionary (see load) """
+
         cls.validate(config)
         values = {}
         for attr, value in config.items():
             if (attr == "requests"):
                 values[attr] = RestRequest.loadList(value)
+            elif (attr == "targets"):
+                values[attr] = RestTarget.loadList(value)
+            elif (attr in ["connectTimeout", "readTimeout", "deadline", "include"]):
+                values[attr] = value
 
         return cls(**values)
@@ -0,0 +1,211 @@
+import time
+import json
+from urllib3.exceptions import ProtocolError, DecodeError, ReadTimeoutError
+from requests.exceptions import ChunkedEncodingError, ContentDecodingError, ReadTimeout
+
+CHUNK_SIZE = 64 * 1024
+SSE = "sse"
+NDJSON = "ndjson"
+STREAM_FORMATS = [SSE, NDJSON]
+
+def iter_lines(chunks):
+    """
+    Split the chunks of a streaming response into lines as they arrive
+
+    Unlike `Response.iter_lines`, which waits for a fixed number of bytes before splitting them,
+    every complete line in a chunk is passed on as soon as the chunk is received.
+
+    Parameters
+    ----------
+    chunks : iterable<bytes>
+        The chunks of the response body in the order they were received
+
+    Returns
+    -------
+    lines : generator<str>
+        The decoded lines of the body without their line endings
+    """
+
+    pending = b""
+    for chunk in chunks:
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+    if (pending):
+        yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+def parse_data(data):
+    """ Parse the data of an event as JSON, falling back to the raw text """
+
+    try:
+        return json.loads(data)
+    except ValueError:
+        return data
+
+def iter_sse(lines):
+    """
+    Parse the lines of a Server-Sent Events stream into events
+
+    Parameters
+    ----------
+    lines : iterable<str>
+        The lines of the stream (see iter_lines)
+
+    Returns
+    -------
+    events : generator<dict>
+        The type (if any), the ID (if any), and the data (parsed as JSON where possible) of each
+        event
+    """
+
+    event = {}
+    data = []
+    for line in lines:
+        if (line == ""):
+            if (data):
+                yield dict(event, data=parse_data("\n".join(data)))
+            event = {}
+            data = []
+            continue
+        if (line.startswith(":")):
+            continue
+
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if (field == "data"):
+            data.append(value)
+        elif (field == "event"):
+            event["type"] = value
+        elif (field == "id"):
+            event["id"] = value
+
+    if (data):
+        yield dict(event, data=parse_data("\n".join(data)))
+
+def iter_ndjson(lines):
+    """
+    Parse the lines of a newline-delimited JSON stream into events
+
+    Parameters
+    ----------
+    lines : iterable<str>
+        The lines of the stream (see iter_lines)
+
+    Returns
+    -------
+    events : generator<dict>
+        The data of each (non-blank) line, parsed as JSON where possible
+    """
+
+    for line in lines:
+        if (line.strip()):
+            yield {"data": parse_data(line)}
+
+def iter_events(chunks, format):
+    """
+    Parse the chunks of a streaming response into events as they arrive
+
+    Parameters
+    ----------
+    chunks : iterable<bytes>
+        The chunks of the response body in the order they were received
+    format : str
+        The format of the stream (sse or ndjson)
+
+    Returns
+    -------
+    events : generator<dict>
+        The events of the stream (see iter_sse and iter_ndjson)
+    """
+
+    lines = iter_lines(chunks)
+    return iter_sse(lines) if (format == SSE) else iter_ndjson(lines)
+
+def iter_chunks(response):
+    """
+    Read the chunks of a streaming response as they arrive
+
+    Chunked responses are read a chunk at a time, while other responses (which are streamed until
+    the connection is closed) are read as soon as any data is available rather than waiting for a
+    fixed number of bytes. The errors of urllib3 are raised as the requests exceptions that
+    `Response.iter_content` raises, so that a stalled or broken stream fails like any other request.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The response of a request that was sent with `stream=True`
+
+    Returns
+    -------
+    chunks : generator<bytes>
+        The (decoded) chunks of the response body
+    """
+
+    raw = response.raw
+    if (getattr(raw, "chunked", True)) or (not hasattr(raw, "read1")):
+        yield from response.iter_content(chunk_size=None)
+        return
+
+    try:
+        chunk = raw.read1(CHUNK_SIZE, decode_content=True)
+        while (chunk):
+            yield chunk
+            chunk = raw.read1(CHUNK_SIZE, decode_content=True)
+    except ProtocolError as error:
+        raise ChunkedEncodingError(error)
+    except DecodeError as error:
+        raise ContentDecodingError(error)
+    except ReadTimeoutError as error:
+        raise ReadTimeout(error)
+
+class EventStream:
+    """
+    Reads the events of a streaming response as they arrive, timing them from the request
+
+    The number of events, the number of bytes, and the time to the first event are updated as the
+    stream is read.
+    """
+
+    response = None
+    format = None
+    start = None
+    events = None
+    size = None
+    first_event = None
+
+    def __init__(self, response, format, start):
+        """
+        Initialize the stream
+
+        Parameters
+        ----------
+        response : requests.Response
+            The response of a request that was sent with `stream=True`
+        format : str
+            The format of the stream (sse or ndjson)
+        start : float
+            The time (from time.perf_counter) at which the request was sent
+        """
+
+        self.response = response
+        self.format = format
+        self.start = start
+        self.events = 0
+        self.size = 0
+
+    def __iter__(self):
+        for event in iter_events(self.__read(), self.format):
+            elapsed = time.perf_counter() - self.start
+            if (self.first_event is None):
+                self.first_event = elapsed
+            self.events += 1
+            yield dict(event, index=self.events, elapsed=round(elapsed, 6))
+
+    def __read(self):
+        """ Read the chunks of the response, counting their bytes """
+
+        for chunk in iter_chunks(self.response):
+            self.size += len(chunk)
+            yield chunk
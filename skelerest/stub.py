@@ -0,0 +1,261 @@
+"""
+Local stub API for exercising Skelerest offline (such as in the benchmarks)
+
+The server answers every request on a thread of its own with keep-alive connections, and can
+inject latency and errors into its responses. Its behavior is configured for the whole server,
+and can be overridden for a single request through the query parameters of the same name
+(`latency`, `jitter`, `error_rate`, and `error_status`). The routes are:
+
+- `/status/<code>` | Responds with the status code
+- `/items/<count>` | Responds with a JSON array of `count` items (for large responses)
+- `/bytes/<size>` | Responds with `size` bytes of binary data
+- `/stream/<count>` | Streams `count` events with chunked transfer encoding (or until the connection
+  is closed with `chunked=0`), as newline-delimited JSON or as Server-Sent Events with `format=sse`,
+  waiting `interval` milliseconds between events
+- Anything else | Responds with a JSON echo of the method, path, query, and size of the request body
+
+    python -m skelerest.stub --port 8080 --latency 20 --jitter 10 --error-rate 0.01
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from functools import lru_cache
+from socketserver import ThreadingMixIn
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+
+ERROR_STATUS = 503
+BYTE_CHUNK = b"\0" * 65536
+
+@lru_cache(maxsize=16)
+def build_items(count):
+    """ Build the (cached) JSON body of an array of items """
+
+    items = [{"id": i, "name": f"item-{i}", "status": "done", "owner": {"id": i % 97}} for i in range(count)]
+    return json.dumps(items).encode("utf-8")
+
+class StubHandler(BaseHTTPRequestHandler):
+    """ Handles the requests sent to the stub server """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.__handle()
+
+    def do_POST(self):
+        self.__handle()
+
+    def do_PUT(self):
+        self.__handle()
+
+    def do_DELETE(self):
+        self.__handle()
+
+    def log_message(self, format, *args):
+        return None
+
+    def __handle(self):
+        """ Read the request, wait out its latency, and send its response """
+
+        url = urlparse(self.path)
+        query = dict(parse_qsl(url.query))
+        size = self.__read_body()
+        settings = self.server.get_settings(query)
+        self.server.count()
+
+        delay = settings["latency"] + random.uniform(0, settings["jitter"])
+        if (delay > 0):
+            time.sleep(delay / 1000)
+
+        parts = url.path.strip("/").split("/")
+        route, value = parts[0], parts[1] if (len(parts) > 1) and (parts[1].isdigit()) else None
+        if (random.random() < settings["error_rate"]):
+            self.__send_json(settings["error_status"], {"error": "Injected error"})
+        elif (route == "status") and (value is not None):
+            self.__send_json(int(value), {"status": int(value)})
+        elif (route == "items") and (value is not None):
+            self.__send(200, "application/json", build_items(int(value)))
+        elif (route == "bytes") and (value is not None):
+            self.__send_bytes(int(value))
+        elif (route == "stream") and (value is not None):
+            self.__send_stream(int(value), query.get("format", "ndjson"), float(query.get("interval", 0)),
+                               query.get("chunked") != "0")
+        else:
+            self.__send_json(200, {"method": self.command, "path": url.path, "query": query, "bytes": size})
+
+    def __read_body(self):
+        """ Read (and discard) the body of the request, returning its size """
+
+        if (self.headers.get("Transfer-Encoding", "").lower() == "chunked"):
+            size = 0
+            length = int(self.rfile.readline().split(b";")[0], 16)
+            while (length > 0):
+                size += len(self.rfile.read(length))
+                self.rfile.readline()
+                length = int(self.rfile.readline().split(b";")[0], 16)
+            self.rfile.readline()
+            return size
+
+        remaining = int(self.headers.get("Content-Length", 0))
+        size = remaining
+        while (remaining > 0):
+            remaining -= len(self.rfile.read(min(remaining, len(BYTE_CHUNK))))
+        return size
+
+    def __send(self, status, content_type, content):
+        """ Send a response with a body that is held in memory """
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def __send_json(self, status, document):
+        """ Send a JSON response """
+
+        self.__send(status, "application/json", json.dumps(document).encode("utf-8"))
+
+    def __send_bytes(self, size):
+        """ Send a binary response of the given size without holding it in memory """
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        while (size > 0):
+            chunk = BYTE_CHUNK[:min(size, len(BYTE_CHUNK))]
+            self.wfile.write(chunk)
+            size -= len(chunk)
+
+    def __send_stream(self, count, format, interval, chunked=True):
+        """ Stream events (chunked, or until the connection is closed), flushing each event as it is sent """
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if (format == "sse") else "application/x-ndjson")
+        if (chunked):
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        for i in range(count):
+            if (i > 0) and (interval > 0):
+                time.sleep(interval / 1000)
+            data = json.dumps({"index": i, "status": "running" if (i < count - 1) else "done"})
+            event = f"event: update\ndata: {data}\n\n" if (format == "sse") else f"{data}\n"
+            event = event.encode("utf-8")
+            if (chunked):
+                event = f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n"
+            self.wfile.write(event)
+            self.wfile.flush()
+        if (chunked):
+            self.wfile.write(b"0\r\n\r\n")
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    """
+    Local stub API that handles every request on a thread of its own
+
+    The server can be run in the background (such as in a benchmark) with `start` and `stop`, or
+    used as a context manager.
+    """
+
+    daemon_threads = True
+    latency = None
+    jitter = None
+    error_rate = None
+    error_status = None
+    requests = None
+    lock = None
+    thread = None
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0, jitter=0, error_rate=0, error_status=ERROR_STATUS):
+        """
+        Initialize the server, binding it to its port
+
+        Parameters
+        ----------
+        host : str (optional)
+            The host that the server listens on (DEFAULT: 127.0.0.1)
+        port : int (optional)
+            The port that the server listens on (DEFAULT: a free port)
+        latency : float (optional)
+            The number of milliseconds to wait before every response
+        jitter : float (optional)
+            The maximum number of milliseconds of random latency added to the latency
+        error_rate : float (optional)
+            The fraction (0 to 1) of requests that respond with the error status
+        error_status : int (optional)
+            The status code of the injected errors (DEFAULT: 503)
+        """
+
+        super().__init__((host, port), StubHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_url(self):
+        """ Get the base URL of the server (such as http://127.0.0.1:8080) """
+
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_settings(self, query):
+        """ Get the settings for a request, overridden by the query parameters of the request """
+
+        return {
+            "latency": float(query.get("latency", self.latency)),
+            "jitter": float(query.get("jitter", self.jitter)),
+            "error_rate": float(query.get("error_rate", self.error_rate)),
+            "error_status": int(query.get("error_status", self.error_status))
+        }
+
+    def count(self):
+        """ Count a request that was received """
+
+        with self.lock:
+            self.requests += 1
+
+    def start(self):
+        """ Serve the requests on a background thread, returning the server """
+
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """ Stop serving the requests and close the socket of the server """
+
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stub API for exercising Skelerest offline")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on (DEFAULT: 127.0.0.1)")
+    parser.add_argument("--port", default=8080, type=int, help="Port to listen on (DEFAULT: 8080)")
+    parser.add_argument("--latency", default=0, type=float, help="Milliseconds to wait before every response")
+    parser.add_argument("--jitter", default=0, type=float, help="Maximum milliseconds of random latency added")
+    parser.add_argument("--error-rate", default=0, type=float, help="Fraction of requests that respond with an error")
+    parser.add_argument("--error-status", default=ERROR_STATUS, type=int, help="Status code of the injected errors (DEFAULT: 503)")
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.latency, args.jitter, args.error_rate, args.error_status)
+    print(f"Serving the stub API on {server.get_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,139 @@
+import time
+import threading
+import unittest
+from unittest import mock
+from ..aws_auth import Credentials, CredentialProvider, get_credentials, get_signature_key, resolve_credentials, PROVIDERS, SIGNING_KEYS
+
+class TestAwsAuth(unittest.TestCase):
+
+    @mock.patch('boto3.Session')
+    def test_resolve_credentials(self, mock_session):
+        mock_creds = mock_session.return_value.get_credentials.return_value
+        mock_creds.get_frozen_credentials.return_value = mock.MagicMock(access_key="a", secret_key="s", token="t")
+        mock_creds._expiry_time.timestamp.return_value = 100.0
+
+        self.assertEqual(resolve_credentials("dev"), Credentials("a", "s", "t", 100.0))
+        mock_session.assert_called_once_with(profile_name="dev")
+
+        mock_creds._expiry_time = None
+        self.assertIsNone(resolve_credentials("dev").expiry)
+
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_static(self, mock_resolve):
+        mock_resolve.return_value = Credentials("a", "s", None, None)
+
+        provider = CredentialProvider("dev")
+        self.assertEqual(provider.get(), Credentials("a", "s", None, None))
+        self.assertEqual(provider.get().access_key, "a")
+        self.assertIsNone(provider.thread)
+        mock_resolve.assert_called_once_with("dev")
+
+    def resolve_in_order(self, mock_resolve, results):
+        """ Resolve the results in order (raising the exceptions), returning an event set by the last """
+
+        resolved = threading.Event()
+        results = iter(results)
+
+        def resolve(profile):
+            result = next(results)
+            if (isinstance(result, Exception)):
+                raise result
+            if (result.access_key == "new"):
+                resolved.set()
+            return result
+
+        mock_resolve.side_effect = resolve
+        return resolved
+
+    @mock.patch('skelerest.aws_auth.MIN_INTERVAL', 0)
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_background_refresh(self, mock_resolve):
+        refreshed = self.resolve_in_order(mock_resolve, [
+            Credentials("old", "s", "t", time.time() + 0.2), Credentials("new", "s", "t", time.time() + 3600)
+        ])
+
+        provider = CredentialProvider("dev", refresh_ahead=0.1)
+        self.assertEqual(provider.get().access_key, "old")
+
+        self.assertTrue(refreshed.wait(5))
+        provider.stop()
+        self.assertEqual(provider.get().access_key, "new")
+        self.assertEqual(mock_resolve.call_count, 2)
+        self.assertFalse(provider.thread.is_alive())
+
+    @mock.patch('skelerest.aws_auth.RETRY_INTERVAL', 0.05)
+    @mock.patch('skelerest.aws_auth.MIN_INTERVAL', 0)
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_retry(self, mock_resolve):
+        # The failed refresh keeps the current credentials and is retried
+        refreshed = self.resolve_in_order(mock_resolve, [
+            Credentials("old", "s", "t", time.time() + 0.2), Exception("STS"),
+            Credentials("new", "s", "t", time.time() + 3600)
+        ])
+
+        provider = CredentialProvider("dev", refresh_ahead=0.1)
+        self.assertTrue(refreshed.wait(5))
+        provider.stop()
+        self.assertEqual(provider.get().access_key, "new")
+        self.assertEqual(mock_resolve.call_count, 3)
+
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_expired(self, mock_resolve):
+        mock_resolve.side_effect = [Credentials("old", "s", "t", time.time() + 3600),
+                                    Credentials("new", "s", "t", time.time() + 3600)]
+        provider = CredentialProvider("dev")
+        provider.stop()
+        provider.current = provider.current._replace(expiry=time.time() - 1)
+
+        # Concurrent signers share a single synchronous refresh of expired credentials
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(provider.get().access_key)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["new"] * 8)
+        self.assertEqual(mock_resolve.call_count, 2)
+
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_fork(self, mock_resolve):
+        mock_resolve.return_value = Credentials("a", "s", "t", time.time() + 3600)
+        provider = CredentialProvider("dev")
+        thread, stopped = provider.thread, provider.stopped
+
+        # A forked process has the provider without its thread, so the refresh is started again
+        provider.pid = -1
+        provider.get()
+        self.assertIsNot(provider.thread, thread)
+        self.assertTrue(provider.thread.is_alive())
+        stopped.set()
+        provider.stop()
+        self.assertEqual(mock_resolve.call_count, 1)
+
+    @mock.patch('skelerest.aws_auth.resolve_credentials')
+    def test_get_credentials(self, mock_resolve):
+        mock_resolve.return_value = Credentials("a", "s", None, None)
+        PROVIDERS.pop("test-profile", None)
+
+        self.assertEqual(get_credentials("test-profile").access_key, "a")
+        self.assertEqual(get_credentials("test-profile").access_key, "a")
+        mock_resolve.assert_called_once_with("test-profile")
+        PROVIDERS.pop("test-profile")
+
+    @mock.patch('skelerest.aws_auth.SIGNING_KEYS_SIZE', 2)
+    def test_get_signature_key(self):
+        SIGNING_KEYS.clear()
+        key = get_signature_key("secret", "20240101", "us-east-1")
+        self.assertIs(get_signature_key("secret", "20240101", "us-east-1"), key)
+        get_signature_key("secret", "20240101", "us-west-2")
+        self.assertEqual(len(SIGNING_KEYS), 2)
+
+        # The keys of past dates are dropped, and the cache never grows past its size
+        get_signature_key("secret", "20240102", "us-east-1")
+        self.assertEqual(list(SIGNING_KEYS), [("secret", "20240102", "us-east-1")])
+        for region in ["eu-west-1", "eu-west-2", "eu-west-3"]:
+            get_signature_key("secret", "20240102", region)
+        self.assertLessEqual(len(SIGNING_KEYS), 2)
+        self.assertEqual(get_signature_key("secret", "20240101", "us-east-1"), key)
+        SIGNING_KEYS.clear()
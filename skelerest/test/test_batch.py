@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+from ..batch import read_rows, get_row_values
+from ..rest_request import RestRequest
+
+class TestBatch(unittest.TestCase):
+
+    def test_read_rows_csv(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.csv")
+            with open(path, "w") as batch_file:
+                batch_file.write("id,name\n1,one\n2,two\n")
+
+            rows = list(read_rows(path))
+
+        self.assertEqual(rows, [(0, {"id": "1", "name": "one"}), (1, {"id": "2", "name": "two"})])
+
+    def test_read_rows_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                batch_file.write('{"id": 1, "name": "one"}\n\n{"id": 2}\n')
+
+            rows = list(read_rows(path))
+            selected = list(read_rows(path, select=lambda offset: offset != 0))
+
+        self.assertEqual(rows, [(0, {"id": 1, "name": "one"}), (1, {"id": 2})])
+        self.assertEqual(selected, [(1, {"id": 2})])
+
+    def test_get_row_values(self):
+        req = RestRequest("test", "http://test/{id}", "POST", body={"parent": "{parent-id}", "name": "{name:me}"})
+        values = {"id": None, "parent-id": None, "name": "me"}
+
+        self.assertIs(get_row_values(req, values, None), values)
+        self.assertEqual(get_row_values(req, values, {"id": "1", "parent_id": "2", "other": "3"}),
+                         {"id": "1", "parent-id": "2", "name": "me"})
+        self.assertEqual(get_row_values(req, values, {"parent_id": "2", "parent-id": "3"}),
+                         {"id": None, "parent-id": "3", "name": "me"})
+        self.assertEqual(values, {"id": None, "parent-id": None, "name": "me"})
+
+if __name__ == '__main__':
+    unittest.main()
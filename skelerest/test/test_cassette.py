@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ..cassette import Cassette, CassetteResponse, canonical_request, request_key, RECORD, REPLAY
+
+class TestCassette(unittest.TestCase):
+
+    def test_canonical_request(self):
+        request = canonical_request("get", "http://test", {"b": "2", "a": 1},
+                                    {"Name": "me", "Authorization": "secret", "X-Amz-Date": "now"}, "None")
+
+        self.assertEqual(request, {
+            "method": "GET",
+            "endpoint": "http://test",
+            "params": {"a": "1", "b": "2"},
+            "headers": {"name": "me"},
+            "body": "None"
+        })
+
+    def test_canonical_request_secrets(self):
+        headers = {"X-Api-Key": "key", "Cookie": "session=1", "X-Auth-Token": "token", "Accept": "text/csv"}
+        request = canonical_request("GET", "http://test", {}, headers, "None")
+
+        self.assertEqual(request["headers"], {
+            "accept": "text/csv", "cookie": "REDACTED", "x-api-key": "REDACTED", "x-auth-token": "REDACTED"
+        })
+        other = canonical_request("GET", "http://test", {}, dict(headers, **{"X-Api-Key": "other"}), "None")
+        self.assertEqual(request_key(request), request_key(other))
+
+    def test_request_key(self):
+        one = canonical_request("GET", "http://test", {"a": "1", "b": "2"}, {"Authorization": "one"}, "None")
+        two = canonical_request("GET", "http://test", {"b": "2", "a": "1"}, {"Authorization": "two"}, "None")
+        three = canonical_request("GET", "http://test", {"a": "1", "b": "3"}, {}, "None")
+
+        self.assertEqual(request_key(one), request_key(two))
+        self.assertNotEqual(request_key(one), request_key(three))
+
+    def test_cassette_response(self):
+        response = CassetteResponse(404, {}, b'{"error": "missing"}')
+
+        self.assertEqual(response.ok, False)
+        self.assertEqual(response.text, '{"error": "missing"}')
+        self.assertEqual(response.json(), {"error": "missing"})
+
+    def test_save_load(self):
+        request = canonical_request("GET", "http://test", {}, {}, "None")
+        other = canonical_request("GET", "http://other", {}, {}, "None")
+        binary = canonical_request("GET", "http://binary", {}, {}, "None")
+
+        response = mock.MagicMock()
+        response.status_code = 200
+        response.headers = {"content-type": "application/json", "Set-Cookie": "session=secret"}
+        response.content = b'{"id": 1}'
+
+        binary_response = mock.MagicMock()
+        binary_response.status_code = 200
+        binary_response.headers = {}
+        binary_response.content = b'\xff\xfe\x00'
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            directory = os.path.join(tmp_dir, "cassettes")
+            Cassette(directory, RECORD).save(request, response)
+            Cassette(directory, RECORD).save(binary, binary_response)
+
+            cassette = Cassette(directory, REPLAY)
+            replayed = cassette.load(request)
+            self.assertEqual(replayed.status_code, 200)
+            self.assertEqual(replayed.headers, {"content-type": "application/json", "Set-Cookie": "REDACTED"})
+            with open(cassette.get_path(request_key(request))) as recording_file:
+                self.assertNotIn("secret", recording_file.read())
+            self.assertEqual(replayed.content, b'{"id": 1}')
+            self.assertEqual(cassette.load(binary).content, b'\xff\xfe\x00')
+            self.assertIsNone(cassette.load(other))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+from schema import SchemaError
+from ..catalog import Catalog, CatalogIndex, expand_includes, INDEX_VERSION
+
+NOTES = """requests:
+- name: notes
+  endpoint: "http://127.0.0.1:5000/notes/{id}"
+  method: GET
+- name: notes
+  endpoint: "http://127.0.0.1:5000/notes"
+  method: POST
+  body:
+    note: "{note:hello}"
+"""
+
+USERS = """requests:
+- name: users
+  endpoint: "http://127.0.0.1:5000/users/{id}"
+  method: GET
+"""
+
+class TestCatalog(unittest.TestCase):
+
+    def write(self, path, text):
+        with open(path, "w") as catalog_file:
+            catalog_file.write(text)
+
+    def test_expand_includes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["b.yaml", "a.yaml", "c.txt"]:
+                self.write(os.path.join(tmp_dir, name), "")
+
+            paths = expand_includes([os.path.join(tmp_dir, "*.yaml"), os.path.join(tmp_dir, "a.yaml")])
+
+        self.assertEqual(paths, [os.path.join(tmp_dir, "a.yaml"), os.path.join(tmp_dir, "b.yaml")])
+
+    def test_get_requests(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "notes.yaml")
+            self.write(path, NOTES)
+            catalog = Catalog(path)
+
+            requests = catalog.get_requests()
+            self.assertEqual(list(requests), ["get-notes", "post-notes"])
+            self.assertIs(catalog.get_requests(), requests)
+
+            self.write(path, USERS + "\n")
+            self.assertEqual(list(catalog.get_requests()), ["get-users"])
+
+            self.write(path, "requests: 1\n")
+            with self.assertRaises(SchemaError):
+                catalog.get_requests()
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path = os.path.join(tmp_dir, "index.json")
+            self.write(os.path.join(tmp_dir, "notes.yaml"), NOTES)
+            self.write(os.path.join(tmp_dir, "users.yaml"), USERS)
+            patterns = [os.path.join(tmp_dir, "*.yaml")]
+
+            index = CatalogIndex(index_path)
+            index.load(patterns)
+            self.assertEqual(list(index.commands), ["get-notes", "post-notes", "get-users"])
+            self.assertEqual(index.commands["post-notes"]["variables"], [["note", "hello"]])
+            with open(index_path) as index_file:
+                cached = json.load(index_file)
+            self.assertEqual(cached["version"], INDEX_VERSION)
+            self.assertEqual(len(cached["catalogs"]), 2)
+
+            # The cached index is used without loading the catalogs
+            with mock.patch.object(Catalog, "get_requests") as get_requests:
+                cached_index = CatalogIndex(index_path)
+                cached_index.load(patterns)
+                get_requests.assert_not_called()
+            self.assertEqual(cached_index.commands, index.commands)
+
+            req = cached_index.get_request("get-users")
+            self.assertEqual(req.endpoint, "http://127.0.0.1:5000/users/{id}")
+            self.assertIsNone(cached_index.catalogs[os.path.join(tmp_dir, "notes.yaml")].requests)
+            self.assertIsNone(cached_index.get_request("get-other"))
+
+            # Only the catalogs that changed are loaded again
+            self.write(os.path.join(tmp_dir, "users.yaml"), USERS.replace("GET", "DELETE"))
+            changed_index = CatalogIndex(index_path)
+            changed_index.load(patterns)
+            self.assertEqual(list(changed_index.commands), ["get-notes", "post-notes", "delete-users"])
+            self.assertIsNone(changed_index.catalogs[os.path.join(tmp_dir, "notes.yaml")].requests)
+
+    def test_load_invalid_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            index_path = os.path.join(tmp_dir, "index.json")
+            self.write(index_path, "not json")
+            self.write(os.path.join(tmp_dir, "users.yaml"), USERS)
+
+            index = CatalogIndex(os.path.join(tmp_dir, "missing", "index.json"))
+            index.load([os.path.join(tmp_dir, "*.yaml")])
+            self.assertEqual(list(index.commands), ["get-users"])
+
+            index = CatalogIndex(index_path)
+            index.load([os.path.join(tmp_dir, "*.yaml")])
+            self.assertEqual(list(index.commands), ["get-users"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ..checkpoint import Checkpoint, is_success
+
+class TestCheckpoint(unittest.TestCase):
+
+    def test_is_success(self):
+        self.assertTrue(is_success(200))
+        self.assertTrue(is_success(302))
+        self.assertFalse(is_success(404))
+        self.assertFalse(is_success("error"))
+        self.assertFalse(is_success("open"))
+
+    def test_write_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint = Checkpoint(os.path.join(tmp_dir, "batch.checkpoint"))
+            self.assertEqual(checkpoint.load(), {})
+
+            checkpoint.open()
+            checkpoint.write(0, 200)
+            checkpoint.write(1, "error")
+            checkpoint.write(2, 503)
+            checkpoint.close()
+            self.assertEqual(checkpoint.load(), {0: 200, 1: "error", 2: 503})
+
+            checkpoint.open(resume=True)
+            checkpoint.write(1, 201)
+            checkpoint.close()
+            self.assertEqual(checkpoint.load(), {0: 200, 1: 201, 2: 503})
+
+            checkpoint.open()
+            checkpoint.close()
+            self.assertEqual(checkpoint.load(), {})
+
+    @mock.patch('skelerest.checkpoint.BLOCK_SIZE', 4)
+    def test_load_partial_line(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.checkpoint")
+            with open(path, "w") as journal:
+                journal.write("0 200\n1 200\n2 2")
+
+            self.assertEqual(Checkpoint(path).load(), {0: 200, 1: 200})
+
+            # Resuming cuts off the partial line, so the next entry is not glued onto it
+            checkpoint = Checkpoint(path)
+            checkpoint.open(resume=True)
+            checkpoint.write(2, 200)
+            checkpoint.close()
+            with open(path) as journal:
+                self.assertEqual(journal.read(), "0 200\n1 200\n2 200\n")
+
+            with open(path, "w") as journal:
+                journal.write("1")
+            checkpoint.open(resume=True)
+            checkpoint.write(2, 200)
+            checkpoint.close()
+            self.assertEqual(checkpoint.load(), {2: 200})
+
+if __name__ == '__main__':
+    unittest.main()
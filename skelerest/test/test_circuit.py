@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+from ..circuit import CircuitBreaker, CircuitBreakers, is_failure, get_host
+
+class TestCircuit(unittest.TestCase):
+
+    def test_is_failure(self):
+        self.assertTrue(is_failure("error"))
+        self.assertTrue(is_failure(503))
+        self.assertFalse(is_failure(200))
+        self.assertFalse(is_failure(404))
+        self.assertFalse(is_failure(429))
+
+    def test_get_host(self):
+        self.assertEqual(get_host("https://api.test:8443/items?id=1"), "api.test:8443")
+
+    @mock.patch('skelerest.circuit.time')
+    def test_open_half_open_close(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        breaker = CircuitBreaker(threshold=0.5, open_seconds=30, window=4, min_requests=4, probes=2)
+
+        self.assertFalse(breaker.record(200))
+        self.assertFalse(breaker.record(500))
+        self.assertFalse(breaker.record(200))
+        self.assertEqual(breaker.get_state(), "closed")
+        self.assertTrue(breaker.record("error"))
+        self.assertEqual(breaker.get_state(), "open")
+        self.assertFalse(breaker.allow())
+
+        # Requests that were in-flight when the breaker opened do not count as probes
+        self.assertFalse(breaker.record(200))
+
+        mock_time.monotonic.return_value = 131
+        self.assertEqual(breaker.get_state(), "half-open")
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record(200)
+        breaker.record(200)
+        self.assertEqual(breaker.get_state(), "closed")
+        self.assertTrue(breaker.allow())
+
+    @mock.patch('skelerest.circuit.time')
+    def test_failed_probe(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        breaker = CircuitBreaker(threshold=1, open_seconds=30, window=2, min_requests=2, probes=1)
+        breaker.record("error")
+        breaker.record("error")
+
+        mock_time.monotonic.return_value = 131
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.record(503))
+        self.assertFalse(breaker.allow())
+
+        mock_time.monotonic.return_value = 162
+        self.assertTrue(breaker.allow())
+
+    def test_breakers_per_host(self):
+        circuits = CircuitBreakers(threshold=0.1, open_seconds=5, min_requests=1)
+        breaker = circuits.get("http://one/a")
+
+        self.assertIs(circuits.get("http://one/b"), breaker)
+        self.assertIsNot(circuits.get("http://two/a"), breaker)
+        self.assertEqual(breaker.open_seconds, 5)
+        self.assertEqual(breaker.min_requests, 1)
+
+if __name__ == '__main__':
+    unittest.main()
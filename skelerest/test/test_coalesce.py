@@ -0,0 +1,74 @@
+import threading
+import unittest
+from ..coalesce import Coalescer, trim_record
+
+class TestCoalesce(unittest.TestCase):
+
+    def test_join(self):
+        coalescer = Coalescer()
+
+        leader, flight = coalescer.join("a")
+        self.assertTrue(leader)
+        follower, same = coalescer.join("a")
+        self.assertFalse(follower)
+        self.assertIs(same, flight)
+
+        coalescer.finish("a", flight, 200, {"status": 200})
+        self.assertEqual(flight.wait(), (200, {"status": 200}))
+        leader, cached = coalescer.join("a")
+        self.assertFalse(leader)
+        self.assertIs(cached, flight)
+
+    def test_join_failure(self):
+        coalescer = Coalescer()
+
+        leader, flight = coalescer.join("a")
+        coalescer.finish("a", flight, 503, {"status": 503})
+        leader, retry = coalescer.join("a")
+        self.assertTrue(leader)
+        self.assertIsNot(retry, flight)
+
+        coalescer.finish("a", retry, "error", None)
+        self.assertEqual(retry.wait(), ("error", None))
+        self.assertTrue(coalescer.join("a")[0])
+
+    def test_join_waits(self):
+        coalescer = Coalescer()
+        leader, flight = coalescer.join("a")
+        results = []
+
+        def follow():
+            results.append(coalescer.join("a")[1].wait())
+
+        thread = threading.Thread(target=follow)
+        thread.start()
+        coalescer.finish("a", flight, 200, {"status": 200})
+        thread.join(1)
+
+        self.assertEqual(results, [(200, {"status": 200})])
+
+    def test_trim_record(self):
+        record = {"status": 200, "ok": True, "body": '[{"id": 1}]', "content": b'[{"id": 1}]'}
+        self.assertEqual(trim_record(record), {"status": 200, "ok": True, "body": '[{"id": 1}]'})
+        self.assertEqual(trim_record(dict(record, extracted=[{"id": 1}])),
+                         {"status": 200, "ok": True, "extracted": [{"id": 1}]})
+
+        # Only the records of successful flights are trimmed (failed flights are not kept)
+        coalescer = Coalescer()
+        coalescer.finish("a", coalescer.join("a")[1], 200, dict(record, extracted=[{"id": 1}]))
+        self.assertEqual(coalescer.join("a")[1].record, {"status": 200, "ok": True, "extracted": [{"id": 1}]})
+        flight = coalescer.join("b")[1]
+        coalescer.finish("b", flight, 503, dict(record, status=503, ok=False))
+        self.assertEqual(flight.record["content"], b'[{"id": 1}]')
+
+    def test_size(self):
+        coalescer = Coalescer(size=2)
+        for key in ["a", "b", "c"]:
+            coalescer.finish(key, coalescer.join(key)[1], 200, None)
+
+        self.assertEqual(list(coalescer.completed), ["b", "c"])
+        self.assertEqual(coalescer.inflight, {})
+        self.assertTrue(coalescer.join("a")[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from ..commands import CommandIndex
+
+class TestCommands(unittest.TestCase):
+
+    def test_index(self):
+        requests = {"get-a": None, "post-a": None}
+        commands = CommandIndex(requests, ["serve"])
+
+        self.assertIn("get-a", commands)
+        self.assertIn("serve", commands)
+        self.assertNotIn("put-a", commands)
+        self.assertEqual(list(commands), ["get-a", "post-a", "serve"])
+        self.assertEqual(len(commands), 3)
+
+        requests["put-a"] = None
+        self.assertIn("put-a", commands)
+        self.assertEqual(len(CommandIndex({})), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from ..compare import build_comparison, diff_bodies, normalize_body
+
+class TestCompare(unittest.TestCase):
+
+    def test_normalize_body(self):
+        self.assertEqual(normalize_body('{"b": 1, "a": 2}'), normalize_body('{"a":2,"b":1}'))
+        self.assertEqual(normalize_body("not json\nat all"), ["not json", "at all"])
+        self.assertEqual(normalize_body(None), [])
+
+    def test_diff_bodies(self):
+        self.assertEqual(diff_bodies('{"a": 1}', '{"a": 1}', "dev", "prod"), [])
+
+        diff = diff_bodies('{"a": 1}', '{"a": 2}', "dev", "prod")
+        self.assertEqual(diff[:2], ["--- dev", "+++ prod"])
+        self.assertIn('-  "a": 1', diff)
+        self.assertIn('+  "a": 2', diff)
+
+        diff = diff_bodies("\n".join(map(str, range(100))), "", "dev", "prod", max_lines=10)
+        self.assertEqual(len(diff), 11)
+        self.assertEqual(diff[-1], "...")
+
+    def test_build_comparison(self):
+        records = [
+            {"target": "dev", "status": 200, "elapsed": 0.1, "bytes": 8, "body": '{"a": 1}'},
+            {"target": "prod", "status": 200, "elapsed": 0.2, "bytes": 8, "body": '{"a": 1}'},
+            {"target": "qa", "status": "error", "elapsed": None, "bytes": None, "body": None}
+        ]
+        comparison = build_comparison(records)
+
+        self.assertEqual(comparison[0], {"target": "dev", "status": 200, "elapsed": 0.1, "bytes": 8})
+        self.assertEqual(comparison[1]["diff"], [])
+        self.assertEqual(comparison[2]["status"], "error")
+        self.assertIn('-  "a": 1', comparison[2]["diff"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import threading
+import unittest
+from ..concurrency import AdaptiveLimiter, is_overload, percentile
+
+class TestConcurrency(unittest.TestCase):
+
+    def test_is_overload(self):
+        self.assertTrue(is_overload(429))
+        self.assertTrue(is_overload(503))
+        self.assertTrue(is_overload("error"))
+        self.assertFalse(is_overload(200))
+        self.assertFalse(is_overload(404))
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([5], 99), 5)
+
+    def test_increase(self):
+        limiter = AdaptiveLimiter(4)
+        for i in range(20):
+            limiter.acquire()
+            limiter.release(0.01, 200)
+
+        self.assertEqual(limiter.get_limit(), 4)
+        self.assertEqual(limiter.inflight, 0)
+
+    def test_decrease_on_overload(self):
+        limiter = AdaptiveLimiter(16, initial=8)
+        limiter.acquire()
+        limiter.release(0.01, 200)
+        for i in range(8):
+            limiter.acquire()
+            limiter.release(0.01, 503)
+
+        self.assertEqual(limiter.get_limit(), 4)
+
+        limiter.acquire()
+        limiter.release(0.01, 429)
+        self.assertEqual(limiter.get_limit(), 4)
+
+    def test_decrease_on_latency(self):
+        limiter = AdaptiveLimiter(16, initial=8, window=10)
+        for i in range(10):
+            limiter.acquire()
+            limiter.release(0.01, 200)
+        self.assertEqual(limiter.get_limit(), 9)
+
+        limiter.acquire()
+        limiter.release(1.0, 200)
+        self.assertEqual(limiter.get_limit(), 4)
+
+        for i in range(3):
+            limiter.acquire()
+            limiter.release(1.0, 200)
+        self.assertEqual(limiter.get_limit(), 4)
+
+        limiter.acquire()
+        limiter.release(1.0, 200)
+        self.assertEqual(limiter.get_limit(), 2)
+
+    def test_min_limit(self):
+        limiter = AdaptiveLimiter(8, min_limit=2, initial=2)
+        for i in range(10):
+            limiter.acquire()
+            limiter.release(0.01, 500)
+
+        self.assertEqual(limiter.get_limit(), 2)
+
+    def test_acquire_blocks(self):
+        limiter = AdaptiveLimiter(1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+
+        limiter.release(0.01, 200)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import io
+import os
+import copy
+import argparse
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from ..skelerest import Skelerest
+from ..daemon import DaemonServer, fingerprint, forward, is_running
+from ..scheduler import Scheduler
+
+class TestDaemon(unittest.TestCase):
+
+    CONFIG = {
+        "requests": [{
+            "name": "test-project",
+            "endpoint": "http://not a real {site}",
+            "method": "GET"
+        }]
+    }
+
+    def get_args(self, skelerest, cli_args):
+        parser = argparse.ArgumentParser()
+        subparsers = parser.add_subparsers(dest="job")
+        skelerest.addParsers(subparsers)
+        return parser.parse_args(cli_args)
+
+    def get_fingerprint(self, config):
+        skelerest = Skelerest.load(config)
+        return fingerprint(skelerest, skelerest.requests["get-test-project"])
+
+    def test_fingerprint(self):
+        config = copy.deepcopy(self.CONFIG)
+        config["requests"][0]["endpoint"] = "http://another {site}"
+
+        self.assertEqual(self.get_fingerprint(self.CONFIG), self.get_fingerprint(self.CONFIG))
+        self.assertNotEqual(self.get_fingerprint(self.CONFIG), self.get_fingerprint(config))
+
+        # The component settings that apply to the request are part of the fingerprint
+        for name, value in [("connectTimeout", 5), ("readTimeout", 5), ("deadline", 30),
+                            ("targets", [{"name": "eu", "host": "http://eu"}])]:
+            config = dict(copy.deepcopy(self.CONFIG), **{name: value})
+            self.assertNotEqual(self.get_fingerprint(self.CONFIG), self.get_fingerprint(config), name)
+
+    def test_forward_not_running(self):
+        skelerest = Skelerest.load(self.CONFIG)
+        args = self.get_args(skelerest, ["get-test-project", "--site", "site"])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.sock")
+            self.assertIsNone(forward(path, args, skelerest, skelerest.requests["get-test-project"]))
+            self.assertFalse(is_running(path))
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_forward(self, mock_req_api):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 404
+        mock_response.ok = False
+        mock_response.content = b"missing"
+        mock_session = mock_req_api.Session.return_value
+        mock_session.get.return_value = mock_response
+
+        daemon = Skelerest.load(self.CONFIG)
+        daemon.open_session()
+        client = Skelerest.load(self.CONFIG)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.sock")
+            server = DaemonServer(path, daemon)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                self.assertTrue(is_running(path))
+                args = self.get_args(client, ["get-test-project", "--site", "site", "--socket", path])
+                with mock.patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                    with self.assertRaises(SystemExit) as context:
+                        client.execute(None, args)
+
+                self.assertEqual(context.exception.code, 1)
+                self.assertIn("|SKELEREST| ERROR: 404:\n|SKELEREST| b'missing'", mock_stdout.getvalue())
+                mock_session.get.assert_called_with("http://not a real site", params={}, headers={}, timeout=(10, 60))
+                mock_req_api.get.assert_not_called()
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+                daemon.close_session()
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_forward_stale(self, mock_req_api):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+        mock_req_api.get.return_value = mock_response
+
+        config = copy.deepcopy(self.CONFIG)
+        config["requests"][0]["endpoint"] = "http://outdated {site}"
+        daemon = Skelerest.load(config)
+        client = Skelerest.load(self.CONFIG)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.sock")
+            server = DaemonServer(path, daemon)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                args = self.get_args(client, ["get-test-project", "--site", "site", "--socket", path,
+                                              "--format", "quiet"])
+                client.execute(None, args)
+
+                mock_req_api.get.assert_called_with("http://not a real site", params={}, headers={}, timeout=(10, 60))
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_forward_concurrent(self, mock_req_api):
+        sent = threading.Event()
+        waited = []
+
+        def get(endpoint, **kwargs):
+            # The first command only finishes once the second one was sent alongside it
+            if (endpoint.endswith("first")):
+                waited.append(sent.wait(5))
+            else:
+                sent.set()
+            return mock.MagicMock(status_code=200, ok=True)
+
+        mock_session = mock_req_api.Session.return_value
+        mock_session.get.side_effect = get
+
+        daemon = Skelerest.load(self.CONFIG)
+        daemon.open_session(4)
+        daemon.scheduler = Scheduler(4)
+        client = Skelerest.load(self.CONFIG)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "test.sock")
+            server = DaemonServer(path, daemon)
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                commands = []
+                for site, priority in [("first", "low"), ("second", "high")]:
+                    args = self.get_args(client, ["get-test-project", "--site", site, "--socket", path,
+                                                  "--format", "quiet", "--priority", priority])
+                    commands.append(threading.Thread(target=client.execute, args=(None, args)))
+                    commands[-1].start()
+                for command in commands:
+                    command.join()
+
+                self.assertEqual(waited, [True])
+                self.assertEqual(mock_session.get.call_count, 2)
+                self.assertEqual(daemon.scheduler.inflight, 0)
+            finally:
+                server.shutdown()
+                server.server_close()
+                thread.join()
+                daemon.close_session()
+
+if __name__ == '__main__':
+    unittest.main()
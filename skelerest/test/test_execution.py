@@ -0,0 +1,39 @@
+import time
+import argparse
+import unittest
+from ..execution import Execution, DeadlineExceeded, CONNECT_TIMEOUT, READ_TIMEOUT
+
+class TestExecution(unittest.TestCase):
+
+    def get_execution(self, timeout=None, expires=None):
+        return Execution(None, argparse.Namespace(), {}, None, timeout=timeout, expires=expires)
+
+    def test_get_timeout(self):
+        self.assertEqual(self.get_execution().get_timeout(), (CONNECT_TIMEOUT, READ_TIMEOUT))
+        self.assertEqual(self.get_execution((1, 2)).get_timeout(), (1, 2))
+
+    def test_get_timeout_deadline(self):
+        execution = self.get_execution((1, 30), time.monotonic() + 5)
+        connect, read = execution.get_timeout()
+
+        self.assertEqual(connect, 1)
+        self.assertLessEqual(read, 5)
+        self.assertGreater(read, 4)
+
+    def test_get_timeout_expired(self):
+        execution = self.get_execution((1, 30), time.monotonic() - 1)
+
+        with self.assertRaises(DeadlineExceeded):
+            execution.get_timeout()
+
+    def test_until_expired(self):
+        execution = self.get_execution()
+        self.assertEqual(list(execution.until_expired([(0, None), (1, None)])), [(0, None), (1, None)])
+        self.assertFalse(execution.expired)
+
+        execution = self.get_execution(expires=time.monotonic() - 1)
+        self.assertEqual(list(execution.until_expired([(0, None), (1, None)])), [])
+        self.assertTrue(execution.expired)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from ..extract import Projection, iter_items
+
+class TestExtract(unittest.TestCase):
+
+    def test_iter_items(self):
+        self.assertEqual(list(iter_items(' [ {"id": 1} , [2, 3],"a" ,null ] ')), [{"id": 1}, [2, 3], "a", None])
+        self.assertEqual(list(iter_items("[]")), [])
+        self.assertEqual(list(iter_items('{"items": [1, 2]}')), [{"items": [1, 2]}])
+        self.assertEqual(list(iter_items("7")), [7])
+
+        with self.assertRaises(ValueError):
+            list(iter_items('[{"id": 1} {"id": 2}]'))
+        with self.assertRaises(ValueError):
+            list(iter_items("[1, 2"))
+
+    def test_project(self):
+        projection = Projection({"id": "$.id", "owner": "$.owner.name", "tags": "$.tags[*]", "missing": "$.nope"})
+        row = projection.project({"id": 1, "owner": {"name": "me"}, "tags": ["a", "b"]})
+
+        self.assertEqual(row, {"id": 1, "owner": "me", "tags": ["a", "b"], "missing": None})
+        self.assertEqual(list(row), ["id", "owner", "tags", "missing"])
+
+    def test_extract(self):
+        projection = Projection({"id": "$.id"})
+
+        self.assertEqual(projection.extract('[{"id": 1}, {"id": 2}]'), [{"id": 1}, {"id": 2}])
+        self.assertEqual(projection.extract('{"id": 3}'), [{"id": 3}])
+        self.assertIsNone(projection.extract("not json"))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Projection({"id": "id"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import time
+import threading
+import unittest
+from unittest import mock
+from requests.exceptions import ConnectionError
+from ..hedge import Hedge
+
+class TestHedge(unittest.TestCase):
+
+    def get_send(self, attempts):
+        lock = threading.Lock()
+        calls = []
+
+        def send():
+            with lock:
+                delay, outcome = attempts[len(calls)]
+                calls.append(outcome)
+            time.sleep(delay)
+            if (isinstance(outcome, Exception)):
+                raise outcome
+            return outcome
+
+        return send, calls
+
+    def test_fast_response(self):
+        response = mock.MagicMock()
+        send, calls = self.get_send([(0, response)])
+        hedge = Hedge(send, 0.5)
+
+        self.assertIs(hedge.run(), response)
+        self.assertFalse(hedge.hedged)
+        self.assertEqual(len(calls), 1)
+
+    def test_slow_response(self):
+        slow = mock.MagicMock()
+        fast = mock.MagicMock()
+        send, calls = self.get_send([(0.3, slow), (0, fast)])
+        hedge = Hedge(send, 0.05)
+
+        self.assertIs(hedge.run(), fast)
+        self.assertTrue(hedge.hedged)
+
+        # The losing attempt is closed once it responds
+        time.sleep(0.4)
+        slow.close.assert_called_once_with()
+        fast.close.assert_not_called()
+
+    def test_error_before_hedge(self):
+        send, calls = self.get_send([(0, ConnectionError("down"))])
+        hedge = Hedge(send, 0.5)
+
+        with self.assertRaises(ConnectionError):
+            hedge.run()
+        self.assertEqual(len(calls), 1)
+
+    def test_error_after_hedge(self):
+        response = mock.MagicMock()
+        send, calls = self.get_send([(0.1, ConnectionError("down")), (0.2, response)])
+        hedge = Hedge(send, 0.05)
+
+        self.assertIs(hedge.run(), response)
+        self.assertTrue(hedge.hedged)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from ..jsonpath import compile_path, find, Condition
+
+class TestJsonPath(unittest.TestCase):
+
+    DOCUMENT = {
+        "job": {"status": "running", "progress": 40},
+        "tasks": [
+            {"name": "a", "status": "done", "attempts": 1},
+            {"name": "b", "status": "failed", "attempts": 3}
+        ],
+        "content-type": "job"
+    }
+
+    def test_compile_path(self):
+        self.assertEqual(compile_path("$"), [])
+        self.assertEqual(compile_path("$.tasks[-1]['name']"), [(False, "tasks"), (False, -1), (False, "name")])
+        self.assertEqual(compile_path("$..status"), [(True, "status")])
+        self.assertEqual(compile_path("$.tasks[*].*"), [(False, "tasks"), (False, "*"), (False, "*")])
+
+        for path in ["tasks", "$.tasks[", "$tasks", "$.tasks[0"]:
+            with self.assertRaises(ValueError):
+                compile_path(path)
+
+    def test_find(self):
+        self.assertEqual(find(self.DOCUMENT, "$.job.status"), ["running"])
+        self.assertEqual(find(self.DOCUMENT, "$.tasks[*].name"), ["a", "b"])
+        self.assertEqual(find(self.DOCUMENT, "$.tasks[1].attempts"), [3])
+        self.assertEqual(find(self.DOCUMENT, "$.tasks[-2].name"), ["a"])
+        self.assertEqual(find(self.DOCUMENT, '$["content-type"]'), ["job"])
+        self.assertEqual(find(self.DOCUMENT, "$..status"), ["running", "done", "failed"])
+        self.assertEqual(find(self.DOCUMENT, "$.tasks[5].name"), [])
+        self.assertEqual(find(self.DOCUMENT, "$.job.status.name"), [])
+        self.assertEqual(find([1, 2], "$[*]"), [1, 2])
+
+    def test_condition(self):
+        self.assertTrue(Condition('$.job.status == "running"').matches(self.DOCUMENT))
+        self.assertTrue(Condition("$.job.status == 'running'").matches(self.DOCUMENT))
+        self.assertTrue(Condition("$.job.status != done").matches(self.DOCUMENT))
+        self.assertTrue(Condition("$.tasks[*].status == failed").matches(self.DOCUMENT))
+        self.assertTrue(Condition("$.job.progress >= 40").matches(self.DOCUMENT))
+        self.assertFalse(Condition("$.job.progress > 40").matches(self.DOCUMENT))
+        self.assertFalse(Condition("$.job.status < 40").matches(self.DOCUMENT))
+        self.assertTrue(Condition("$.job").matches(self.DOCUMENT))
+        self.assertFalse(Condition("$.result").matches(self.DOCUMENT))
+
+        with self.assertRaises(ValueError):
+            Condition("status == done")
+
+if __name__ == '__main__':
+    unittest.main()
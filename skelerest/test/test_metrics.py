@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from ..metrics import Metrics, TEXTFILE_NAME
+
+class TestMetrics(unittest.TestCase):
+
+    def test_observe(self):
+        metrics = Metrics(buckets=[0.1, 1.0])
+        metrics.observe("get-test", "GET", 200, 0.05)
+        metrics.observe("get-test", "GET", 200, 0.5)
+        metrics.observe("get-test", "GET", 503, 2.0)
+
+        self.assertEqual(metrics.counts[("get-test", "GET", "200")], 2)
+        self.assertEqual(metrics.counts[("get-test", "GET", "503")], 1)
+        histogram = metrics.histograms[("get-test", "GET")]
+        self.assertEqual(histogram["buckets"], [1, 2])
+        self.assertEqual(histogram["sum"], 2.55)
+        self.assertEqual(histogram["count"], 3)
+
+    def test_to_openmetrics(self):
+        metrics = Metrics(buckets=[0.1, 1.0])
+        metrics.observe("get-test", "GET", 200, 0.05)
+        metrics.observe("post-test", "POST", "error", 0.5)
+
+        expected = "\n".join([
+            "# TYPE skelerest_requests counter",
+            "# HELP skelerest_requests Number of REST requests executed by Skelerest.",
+            'skelerest_requests_total{command="get-test",method="GET",status="200"} 1',
+            'skelerest_requests_total{command="post-test",method="POST",status="error"} 1',
+            "# TYPE skelerest_request_duration_seconds histogram",
+            "# HELP skelerest_request_duration_seconds Latency of REST requests executed by Skelerest.",
+            'skelerest_request_duration_seconds_bucket{command="get-test",method="GET",le="0.1"} 1',
+            'skelerest_request_duration_seconds_bucket{command="get-test",method="GET",le="1.0"} 1',
+            'skelerest_request_duration_seconds_bucket{command="get-test",method="GET",le="+Inf"} 1',
+            'skelerest_request_duration_seconds_sum{command="get-test",method="GET"} 0.05',
+            'skelerest_request_duration_seconds_count{command="get-test",method="GET"} 1',
+            'skelerest_request_duration_seconds_bucket{command="post-test",method="POST",le="0.1"} 0',
+            'skelerest_request_duration_seconds_bucket{command="post-test",method="POST",le="1.0"} 1',
+            'skelerest_request_duration_seconds_bucket{command="post-test",method="POST",le="+Inf"} 1',
+            'skelerest_request_duration_seconds_sum{command="post-test",method="POST"} 0.5',
+            'skelerest_request_duration_seconds_count{command="post-test",method="POST"} 1',
+            "# EOF",
+            ""
+        ])
+        self.assertEqual(metrics.to_openmetrics(), expected)
+
+    def test_write(self):
+        metrics = Metrics()
+        metrics.observe("get-test", "GET", 200, 0.05)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = metrics.write(os.path.join(tmp_dir, "metrics.prom"))
+            with open(path) as metrics_file:
+                self.assertEqual(metrics_file.read(), metrics.to_openmetrics())
+
+            path = metrics.write(tmp_dir)
+            self.assertEqual(path, os.path.join(tmp_dir, TEXTFILE_NAME))
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(len(os.listdir(tmp_dir)), 2)
+
+    def test_collect_merge(self):
+        worker = Metrics(buckets=[0.1, 1.0])
+        worker.observe("get-test", "GET", 200, 0.05)
+        worker.observe("get-test", "GET", 200, 0.5)
+        collected = worker.collect()
+
+        self.assertEqual(worker.counts, {})
+        self.assertEqual(worker.histograms, {})
+
+        metrics = Metrics(buckets=[0.1, 1.0])
+        metrics.observe("get-test", "GET", 200, 0.05)
+        metrics.merge(*collected)
+
+        self.assertEqual(metrics.counts[("get-test", "GET", "200")], 3)
+        histogram = metrics.histograms[("get-test", "GET")]
+        self.assertEqual(histogram["buckets"], [2, 3])
+        self.assertAlmostEqual(histogram["sum"], 0.6)
+        self.assertEqual(histogram["count"], 3)
+
+    def test_hedges(self):
+        worker = Metrics()
+        worker.observe_hedge("get-test", "GET")
+        metrics = Metrics()
+        metrics.observe_hedge("get-test", "GET")
+        metrics.observe_hedge("get-other", "GET")
+        metrics.merge(*worker.collect())
+
+        self.assertEqual(metrics.get_hedges("get-test"), 2)
+        self.assertIn('skelerest_hedged_requests_total{command="get-test",method="GET"} 2', metrics.to_openmetrics())
+        self.assertEqual(worker.hedges, {})
+
+    def test_first_events(self):
+        worker = Metrics(buckets=[0.1, 1.0])
+        worker.observe_first_event("get-test", "GET", 0.05)
+        metrics = Metrics(buckets=[0.1, 1.0])
+        metrics.observe_first_event("get-test", "GET", 0.5)
+        metrics.merge(*worker.collect())
+
+        self.assertEqual(metrics.first_events[("get-test", "GET")]["buckets"], [1, 2])
+        self.assertIn('skelerest_first_event_seconds_bucket{command="get-test",method="GET",le="0.1"} 1', metrics.to_openmetrics())
+        self.assertIn('skelerest_first_event_seconds_count{command="get-test",method="GET"} 2', metrics.to_openmetrics())
+        self.assertEqual(worker.first_events, {})
+        self.assertNotIn("first_event", Metrics().to_openmetrics())
+
+    def test_reset(self):
+        metrics = Metrics()
+        metrics.observe("get-test", "GET", 200, 0.05)
+        metrics.reset()
+
+        self.assertEqual(metrics.counts, {})
+        self.assertEqual(metrics.histograms, {})
+
+if __name__ == '__main__':
+    unittest.main()
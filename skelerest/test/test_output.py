@@ -0,0 +1,210 @@
+import io
+import json
+import unittest
+from unittest import mock
+from ..output import get_writer, build_record, build_stream_record, build_plan, TextWriter, JsonWriter, JsonlWriter, CsvWriter, QuietWriter
+
+class TestOutput(unittest.TestCase):
+
+    def get_response(self, status_code=200, ok=True):
+        response = mock.MagicMock()
+        response.status_code = status_code
+        response.ok = ok
+        response.headers = {"content-type": "application/json"}
+        response.content = b'{"id": 1}'
+        response.text = '{"id": 1}'
+        return response
+
+    def test_get_writer(self):
+        self.assertIsInstance(get_writer("text"), TextWriter)
+        self.assertIsInstance(get_writer("json"), JsonWriter)
+        self.assertIsInstance(get_writer("jsonl"), JsonlWriter)
+        self.assertIsInstance(get_writer("csv"), CsvWriter)
+        self.assertIsInstance(get_writer("quiet"), QuietWriter)
+
+    def test_build_record(self):
+        record = build_record("get-test", "GET", "http://test", self.get_response(), 0.1234567)
+
+        self.assertEqual(record["command"], "get-test")
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["endpoint"], "http://test")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["ok"], True)
+        self.assertEqual(record["elapsed"], 0.123457)
+        self.assertEqual(record["headers"], {"content-type": "application/json"})
+        self.assertEqual(record["bytes"], 9)
+        self.assertEqual(record["body"], '{"id": 1}')
+
+    def test_text_writer(self):
+        stream = io.StringIO()
+        writer = TextWriter(stream=stream)
+        writer.request("GET", "http://test", {"a": "1"}, {"b": "2"}, "None")
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(), 0.1))
+
+        self.assertEqual(stream.getvalue(), "")
+        writer.flush()
+        self.assertEqual(stream.getvalue(), "\n".join([
+            "|SKELEREST| GET http://test",
+            "|SKELEREST| PARAMS",
+            "|SKELEREST| - a : 1",
+            "|SKELEREST| HEADERS",
+            "|SKELEREST| - b : 2",
+            "|SKELEREST| SUCCESS: 200:",
+            "|SKELEREST| b'{\"id\": 1}'",
+            "|SKELEREST| {\"id\": 1}",
+            ""
+        ]))
+
+    def test_secret_headers(self):
+        headers = {"b": "2", "X-Amz-Security-Token": "session", "Authorization": "AWS4-HMAC-SHA256 ..."}
+
+        stream = io.StringIO()
+        writer = TextWriter(stream=stream)
+        writer.request("GET", "http://test", {}, headers, "None")
+        writer.flush()
+        self.assertEqual(stream.getvalue().splitlines()[-3:], [
+            "|SKELEREST| - b : 2", "|SKELEREST| - X-Amz-Security-Token : REDACTED", "|SKELEREST| - Authorization : REDACTED"
+        ])
+
+        plan = build_plan("get-test", "GET", "http://test", {}, headers, "None")
+        self.assertEqual(plan["headers"], {"b": "2", "X-Amz-Security-Token": "REDACTED", "Authorization": "REDACTED"})
+        self.assertEqual(headers["X-Amz-Security-Token"], "session")
+
+    def test_jsonl_writer(self):
+        stream = io.StringIO()
+        writer = JsonlWriter(stream=stream)
+        writer.message("USING AWS AUTH")
+        writer.request("GET", "http://test", {}, {}, "None")
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(), 0.1))
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(404, False), 0.2))
+        writer.flush()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["status"], 200)
+        self.assertEqual(json.loads(lines[1])["status"], 404)
+        self.assertEqual(json.loads(lines[1])["ok"], False)
+        self.assertNotIn("content", json.loads(lines[0]))
+
+    def test_extracted(self):
+        record = build_record("get-test", "GET", "http://test", self.get_response(), 0.1)
+        record["extracted"] = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": None}]
+
+        text = io.StringIO()
+        writer = TextWriter(stream=text)
+        writer.record(record)
+        writer.flush()
+        self.assertEqual(text.getvalue().splitlines()[-2:], [
+            '|SKELEREST| {"id": 1, "tags": ["a"]}', '|SKELEREST| {"id": 2, "tags": null}'
+        ])
+
+        # The records reused by coalesced rows are written without their raw content
+        text = io.StringIO()
+        writer = TextWriter(stream=text)
+        writer.record({key: value for key, value in record.items() if key not in ["content", "body"]})
+        writer.flush()
+        self.assertEqual(text.getvalue().splitlines()[0], "|SKELEREST| SUCCESS: 200")
+        self.assertEqual(len(text.getvalue().splitlines()), 3)
+
+        jsonl = io.StringIO()
+        writer = JsonlWriter(stream=jsonl)
+        writer.record(record)
+        writer.flush()
+        self.assertEqual(jsonl.getvalue(), '{"id": 1, "tags": ["a"]}\n{"id": 2, "tags": null}\n')
+
+    def test_csv_writer(self):
+        stream = io.StringIO()
+        errors = io.StringIO()
+        writer = CsvWriter(stream=stream, error_stream=errors)
+        record = build_record("get-test", "GET", "http://test", self.get_response(), 0.1)
+        record["extracted"] = [{"id": 1, "name": "a, b", "tags": ["x"], "none": None}]
+
+        writer.header(["id", "name", "tags", "none"])
+        writer.message("USING AWS AUTH")
+        writer.request("GET", "http://test", {}, {}, "None")
+        writer.record(record)
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(404, False), 0.2))
+        writer.summary({"requests": 2})
+        writer.flush()
+
+        self.assertEqual(stream.getvalue(), 'id,name,tags,none\n1,"a, b","[""x""]",\n')
+        self.assertEqual(errors.getvalue(), "|SKELEREST| ERROR: GET http://test : 404\n")
+
+    def test_events(self):
+        record = build_stream_record("get-test", "GET", "http://test", self.get_response(), 1.2345678, 2, 0.1234567, 30)
+        events = [
+            {"type": "tick", "data": {"n": 1}, "index": 1, "elapsed": 0.1},
+            {"data": "two", "index": 2, "elapsed": 0.2},
+            {"data": {"n": 3}, "index": 3, "elapsed": 0.3, "extracted": [{"n": 3}]}
+        ]
+
+        self.assertEqual((record["bytes"], record["events"], record["first_event"], record["elapsed"]), (30, 2, 0.123457, 1.234568))
+        self.assertIsNone(record["body"])
+
+        text = io.StringIO()
+        writer = TextWriter(stream=text)
+        for event in events:
+            writer.event(event)
+        writer.record(record)
+        writer.flush()
+        self.assertEqual(text.getvalue().splitlines(), [
+            "|SKELEREST| EVENT 1 (0.1s) tick:", '|SKELEREST| {"n": 1}',
+            "|SKELEREST| EVENT 2 (0.2s):", "|SKELEREST| two",
+            "|SKELEREST| EVENT 3 (0.3s):", '|SKELEREST| {"n": 3}',
+            "|SKELEREST| SUCCESS: 200: 2 events, first event after 0.123457s"
+        ])
+
+        jsonl = io.StringIO()
+        writer = JsonlWriter(stream=jsonl)
+        for event in events:
+            writer.event(event)
+        writer.record(record)
+        writer.flush()
+        lines = [json.loads(line) for line in jsonl.getvalue().splitlines()]
+        self.assertEqual(lines[:3], [{"event": events[0]}, {"event": events[1]}, {"n": 3}])
+        self.assertEqual(lines[3]["events"], 2)
+
+        table = io.StringIO()
+        writer = CsvWriter(stream=table)
+        for event in events:
+            writer.event(event)
+        writer.record(record)
+        writer.flush()
+        self.assertEqual(table.getvalue(), "3\n")
+
+    def test_quiet_writer(self):
+        stream = io.StringIO()
+        writer = QuietWriter(stream=stream)
+        writer.message("USING AWS AUTH")
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(), 0.1))
+        writer.flush()
+
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_text_comparison(self):
+        stream = io.StringIO()
+        writer = TextWriter(stream=stream)
+        writer.comparison([
+            {"target": "dev", "status": 200, "elapsed": 0.1, "bytes": 8},
+            {"target": "prod", "status": 200, "elapsed": 0.2, "bytes": 8, "diff": []}
+        ])
+        writer.flush()
+
+        self.assertEqual(stream.getvalue(), "\n".join([
+            "|SKELEREST| COMPARISON",
+            "|SKELEREST| - dev : 200 in 0.1s (8 bytes)",
+            "|SKELEREST| - prod : 200 in 0.2s (8 bytes)",
+            "|SKELEREST|   SAME BODY",
+            ""
+        ]))
+
+    def test_buffer_size(self):
+        stream = io.StringIO()
+        writer = JsonlWriter(stream=stream, buffer_size=2)
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(), 0.1))
+        self.assertEqual(stream.getvalue(), "")
+        writer.record(build_record("get-test", "GET", "http://test", self.get_response(), 0.1))
+        self.assertEqual(len(stream.getvalue().splitlines()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+from .. import profiling
+from ..profiling import Profiler, get_mode, start_profiler, confirm_profiler, get_profiler
+
+def work(size):
+    return [str(i) for i in range(size)]
+
+class TestProfiling(unittest.TestCase):
+
+    def tearDown(self):
+        profiler = profiling.ACTIVE.pop("profiler", None)
+        if (profiler is not None):
+            profiler.stop()
+
+    def test_get_mode(self):
+        self.assertIsNone(get_mode(["skelebot", "get-test"]))
+        self.assertEqual(get_mode(["skelebot", "get-test", "--profile"]), "cprofile")
+        self.assertEqual(get_mode(["skelebot", "get-test", "--profile", "--id", "1"]), "cprofile")
+        self.assertEqual(get_mode(["skelebot", "get-test", "--profile", "tracemalloc"]), "tracemalloc")
+        self.assertEqual(get_mode(["skelebot", "get-test", "--profile=tracemalloc"]), "tracemalloc")
+        self.assertEqual(get_mode(["skelebot", "get-test", "--sr-profile=tracemalloc"]), "tracemalloc")
+        self.assertEqual(get_mode(["skelebot", "get-test", "--sr-profile"]), "cprofile")
+
+    def test_start_profiler(self):
+        self.assertIsNone(start_profiler(["skelebot", "get-test"]))
+        self.assertIsNone(start_profiler(["skelebot", "get-test", "--profile=other"]))
+
+        profiler = start_profiler(["skelebot", "get-test", "--profile"])
+        self.assertEqual(profiler.mode, "cprofile")
+        self.assertIsNone(start_profiler(["skelebot", "get-test", "--profile"]))
+        self.assertIs(get_profiler("cprofile"), profiler)
+        self.assertNotIn("profiler", profiling.ACTIVE)
+
+        start_profiler(["skelebot", "get-test", "--profile"])
+        other = get_profiler("tracemalloc")
+        self.assertEqual(other.mode, "tracemalloc")
+        other.stop()
+
+    def test_confirm_profiler(self):
+        commands = ["get-test", "skelerest-serve"]
+        self.assertIsNone(confirm_profiler(["skelebot", "get-test"], commands))
+
+        profiler = start_profiler(["skelebot", "get-test", "--profile"])
+        self.assertIs(confirm_profiler(["skelebot", "get-test", "--profile"], commands), profiler)
+        self.assertIs(profiling.ACTIVE["profiler"], profiler)
+        get_profiler("cprofile").stop()
+
+        # Other Skelebot jobs with a --profile argument of their own are not profiled
+        profiler = start_profiler(["skelebot", "train", "--profile", "prod"])
+        with mock.patch.object(profiler, "stop", wraps=profiler.stop) as mock_stop:
+            self.assertIsNone(confirm_profiler(["skelebot", "train", "--profile", "prod"], commands))
+            mock_stop.assert_called_once_with()
+        self.assertNotIn("profiler", profiling.ACTIVE)
+
+    def test_cprofile(self):
+        profiler = Profiler("cprofile").start()
+        work(1000)
+        profiler.stop()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = profiler.write(os.path.join(tmp_dir, "run.pstats"))
+            self.assertEqual(pstats.Stats(path).total_calls, pstats.Stats(profiler.profile).total_calls)
+
+        report = profiler.get_report([("work", work), ("get_mode", get_mode)], top=5).splitlines()
+        self.assertEqual(report[0], "|SKELEREST| PROFILE PHASES (calls, cumulative seconds)")
+        self.assertTrue(report[1].startswith("|SKELEREST| - work : 1 calls, "))
+        self.assertEqual(report[2], "|SKELEREST| - get_mode : 0 calls, 0.000000s")
+        self.assertEqual(report[3], "|SKELEREST| PROFILE TOP 5 FUNCTIONS (by cumulative time)")
+        self.assertTrue(any(["test_profiling.py" in line for line in report[4:]]))
+
+    def test_tracemalloc(self):
+        profiler = Profiler("tracemalloc").start()
+        data = work(10000)
+        profiler.stop()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(profiler.peak, 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch('skelerest.profiling.PROFILE_FILES', {"tracemalloc": os.path.join(tmp_dir, "run.snapshot")}):
+                path = profiler.write()
+            self.assertEqual(len(tracemalloc.Snapshot.load(path).traces), len(profiler.snapshot.traces))
+
+        report = profiler.get_report([], top=3).splitlines()
+        self.assertTrue(report[0].startswith("|SKELEREST| PROFILE PEAK MEMORY : "))
+        self.assertLessEqual(len(report), 5)
+        self.assertIn("test_profiling.py", report[2])
+        self.assertEqual(len(data), 10000)
+
+if __name__ == '__main__':
+    unittest.main()
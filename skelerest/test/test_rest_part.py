@@ -0,0 +1,25 @@
+import unittest
+from schema import SchemaError
+from ..rest_part import RestPart
+
+class TestRestPart(unittest.TestCase):
+
+    def test_load(self):
+        value = RestPart.load({"name": "tag", "value": "{tag}"})
+        upload = RestPart.load({"name": "model", "file": "{path}", "contentType": "text/csv", "filename": "a.csv"})
+
+        self.assertEqual(str(value), "tag {tag}")
+        self.assertEqual(upload.file, "{path}")
+        self.assertEqual(upload.contentType, "text/csv")
+        self.assertEqual(upload.toDict(), {"name": "model", "file": "{path}", "contentType": "text/csv", "filename": "a.csv"})
+
+    def test_load_invalid(self):
+        with self.assertRaises(SchemaError):
+            RestPart.load({"name": "tag"})
+        with self.assertRaises(SchemaError):
+            RestPart.load({"name": "tag", "value": "a", "file": "b"})
+        with self.assertRaises(SchemaError):
+            RestPart.load({"name": "tag", "value": 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
+import copy
 import unittest
 from schema import SchemaError
 from ..rest_request import RestRequest
+from ..upload import StreamingBody
 
 class TestRestRequest(unittest.TestCase):
 
@@ -110,6 +112,23 @@ class TestRestRequest(unittest.TestCase):
             self.assertEqual(item, exp_items[i])
             i += 1
 
+    def test_variables(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["endpoint"] = "http://not a real {site}/{id}"
+        restRequest = RestRequest.load(config)
+
+        self.assertEqual([var.name for var in restRequest.variables],
+                         ["site", "id", "param-one", "param-two", "header-one", "header-two", "parent-id", "parent-name"])
+        self.assertIsNone(restRequest.variable_map)
+        self.assertIs(restRequest.get_variable("parent-id"), restRequest.variables[6])
+        self.assertIs(restRequest.get_variable("parent_id"), restRequest.variables[6])
+        self.assertIsNone(restRequest.get_variable("other"))
+        self.assertNotIn("variable_map", restRequest.toDict())
+
+        var = RestRequest.RestVar("".join(["i", "d"]), None, RestRequest.RestVar.Location.BODY)
+        self.assertIs(var.name, restRequest.variables[1].name)
+        self.assertFalse(hasattr(var, "__dict__"))
+
     def test_params_dict(self):
         restRequest = RestRequest.load(self.CONFIG_VALID)
         params_dict = restRequest.get_params_dict()
@@ -122,5 +141,120 @@ class TestRestRequest(unittest.TestCase):
 
         self.assertEqual(str(headers_dict), "{'a': '{header-one:A}', 'b': '{header-two:B}'}")
 
+    def test_render(self):
+        restRequest = RestRequest.load(copy.deepcopy(self.CONFIG_VALID))
+        endpoint, params, headers, body = restRequest.render({
+            "site": "site", "param-one": "01", "parent-id": 2, "parent-name": "you"
+        })
+
+        self.assertEqual(endpoint, "http://not a real site")
+        self.assertEqual(params, {"one": "01", "two": "2"})
+        self.assertEqual(headers, {"a": "A", "b": "B"})
+        self.assertEqual(body, '{"id": "0", "name": "test", "items": ["a", "b", "c"], "parent": {"id": "2", "name": "you"}}')
+
+        endpoint, params, headers, body = restRequest.render({"header-two": "BB"})
+        self.assertEqual(endpoint, "http://not a real {site}")
+        self.assertEqual(headers, {"a": "A", "b": "BB"})
+
+    def test_render_no_body(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        del config["body"]
+        del config["params"]
+        restRequest = RestRequest.load(config)
+        endpoint, params, headers, body = restRequest.render({"site": "site"})
+
+        self.assertEqual(endpoint, "http://not a real site")
+        self.assertEqual(params, {})
+        self.assertEqual(body, "None")
+
+    def test_render_file(self):
+        restRequest = RestRequest.load({
+            "name": "upload", "endpoint": "http://site", "method": "PUT",
+            "file": "{folder}/body.json", "contentType": "application/json"
+        })
+        endpoint, params, headers, body = restRequest.render({"folder": "skelerest/test/files"})
+
+        self.assertEqual([var.name for var in restRequest.variables], ["folder"])
+        self.assertEqual(headers, {"Content-Type": "application/json"})
+        self.assertIsInstance(body, StreamingBody)
+        self.assertEqual(str(body), "<file skelerest/test/files/body.json>")
+        with open("skelerest/test/files/body.json", "rb") as body_file:
+            self.assertEqual(b"".join(body), body_file.read())
+
+    def test_render_multipart(self):
+        restRequest = RestRequest.load({
+            "name": "upload", "endpoint": "http://site", "method": "POST",
+            "headers": [{"name": "content-type", "value": "multipart/form-data; boundary=fixed"}],
+            "multipart": [
+                {"name": "tag", "value": "{tag:v1}"},
+                {"name": "body", "file": "{path}", "filename": "{name:body.json}"}
+            ]
+        })
+        endpoint, params, headers, body = restRequest.render({"path": "skelerest/test/files/body.json"})
+
+        self.assertEqual([var.name for var in restRequest.variables], ["tag", "path", "name"])
+        self.assertEqual(headers, {"content-type": "multipart/form-data; boundary=fixed"})
+        self.assertEqual(str(body), "<multipart/form-data tag=v1, body=<file skelerest/test/files/body.json>>")
+        self.assertEqual(restRequest.toDict()["multipart"][1], {"name": "body", "file": "{path}", "filename": "{name:body.json}"})
+
+    def test_load_upload_invalid(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["file"] = "{path}"
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+        del config["body"]
+        config["multipart"] = [{"name": "tag", "value": "v1"}]
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+    def test_load_extract(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["extract"] = {"id": "$.id", "parent": "$.parent['id']"}
+        restRequest = RestRequest.load(config)
+
+        self.assertEqual(restRequest.projection.project({"id": 1, "parent": {"id": 2}}), {"id": 1, "parent": 2})
+        self.assertEqual(restRequest.toDict()["extract"], config["extract"])
+        self.assertNotIn("projection", restRequest.toDict())
+
+        config["extract"] = {"id": "id"}
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+    def test_load_stream(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["stream"] = "sse"
+        self.assertEqual(RestRequest.load(config).stream, "sse")
+
+        config["stream"] = "websocket"
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+    def test_load_priority(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["priority"] = "high"
+        config["weight"] = 2.5
+        restRequest = RestRequest.load(config)
+        self.assertEqual((restRequest.priority, restRequest.weight), ("high", 2.5))
+
+        config["priority"] = "urgent"
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+        config["priority"] = "low"
+        config["weight"] = 0
+        with self.assertRaises(SchemaError):
+            RestRequest.load(config)
+
+    def test_to_dict(self):
+        restRequest = RestRequest.load(copy.deepcopy(self.CONFIG_VALID))
+        restRequest.render({"site": "site"})
+        dct = restRequest.toDict()
+
+        self.assertNotIn("template", dct)
+        self.assertNotIn("variables", dct)
+        self.assertNotIn("body_content", dct)
+        self.assertIsNotNone(restRequest.template)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from ..rest_target import RestTarget
+
+class TestRestTarget(unittest.TestCase):
+
+    def test_get_name(self):
+        self.assertEqual(RestTarget(name="prod", host="api.test").get_name(), "prod")
+        self.assertEqual(RestTarget(host="api.test").get_name(), "api.test")
+        self.assertEqual(RestTarget(awsRegion="eu-west-1").get_name(), "eu-west-1")
+
+    def test_apply(self):
+        endpoint = "http://api.dev:5000/items/1?full=true"
+
+        self.assertEqual(RestTarget(host="api.qa").apply(endpoint), "http://api.qa/items/1?full=true")
+        self.assertEqual(RestTarget(host="https://api.prod").apply(endpoint), "https://api.prod/items/1?full=true")
+        self.assertEqual(RestTarget(awsRegion="us-west-2").apply(endpoint), endpoint)
+
+    def test_load(self):
+        targets = RestTarget.loadList([{"host": "api.qa"}, {"name": "west", "awsRegion": "us-west-2"}])
+
+        self.assertEqual([target.get_name() for target in targets], ["api.qa", "west"])
+        self.assertEqual(targets[1].toDict(), {"name": "west", "awsRegion": "us-west-2"})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,5 +9,12 @@ class TestRestTuple(unittest.TestCase):
         self.assertEqual(rest_tuple.__str__(), "name test")
         self.assertEqual(str(rest_tuple), "name test")
 
+    def test_interned(self):
+        first = RestTuple("Content-Type", "application/json")
+        second = RestTuple("-".join(["Content", "Type"]), "/".join(["application", "json"]))
+
+        self.assertIs(first.name, second.name)
+        self.assertIs(first.value, second.value)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,76 @@
+import time
+import threading
+import unittest
+from ..scheduler import Scheduler, HIGH, NORMAL, LOW
+
+class Flow:
+    """ Stands in for the execution of a command """
+
+class TestScheduler(unittest.TestCase):
+
+    def run_waiting(self, scheduler, requests):
+        """ Queue up the requests behind a held slot, returning the order in which they were served """
+
+        order = []
+
+        def send(name, flow, priority, weight):
+            scheduler.acquire(flow, priority, weight)
+            order.append(name)
+            scheduler.release()
+
+        scheduler.acquire(Flow())
+        threads = []
+        for request in requests:
+            threads.append(threading.Thread(target=send, args=request))
+            threads[-1].start()
+            while (scheduler.get_waiting() < len(threads)):
+                time.sleep(0.001)
+
+        scheduler.release()
+        for thread in threads:
+            thread.join()
+        return order
+
+    def test_acquire(self):
+        scheduler = Scheduler(2)
+        flow = Flow()
+        scheduler.acquire(flow)
+        scheduler.acquire(flow, HIGH, 2)
+        self.assertEqual((scheduler.inflight, scheduler.get_waiting()), (2, 0))
+
+        scheduler.release()
+        scheduler.release()
+        self.assertEqual(scheduler.inflight, 0)
+        self.assertEqual(Scheduler(0).capacity, 1)
+
+    def test_priority(self):
+        bulk, interactive = Flow(), Flow()
+        requests = [(f"bulk-{i}", bulk, LOW, 1) for i in range(3)]
+        requests += [(f"normal-{i}", Flow(), NORMAL, 1) for i in range(2)]
+        requests += [(f"interactive-{i}", interactive, HIGH, 1) for i in range(2)]
+
+        order = self.run_waiting(Scheduler(1), requests)
+        self.assertEqual(order, ["interactive-0", "interactive-1", "normal-0", "normal-1",
+                                 "bulk-0", "bulk-1", "bulk-2"])
+
+    def test_weight(self):
+        heavy, light = Flow(), Flow()
+        requests = [("light", light, NORMAL, 1) for i in range(4)] + [("heavy", heavy, NORMAL, 3) for i in range(4)]
+
+        order = self.run_waiting(Scheduler(1), requests)
+        self.assertEqual(order[:4].count("heavy"), 3)
+        self.assertEqual(order[-1], "light")
+
+    def test_idle_flow(self):
+        scheduler = Scheduler(1)
+        busy, idle = Flow(), Flow()
+        for i in range(10):
+            scheduler.acquire(busy)
+            scheduler.release()
+
+        # The idle flow does not get the slots it did not use (and go first twice), it takes turns with the busy flow
+        requests = [("busy", busy, NORMAL, 1), ("busy", busy, NORMAL, 1), ("idle", idle, NORMAL, 1), ("idle", idle, NORMAL, 1)]
+        self.assertEqual(self.run_waiting(scheduler, requests), ["idle", "busy", "idle", "busy"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,18 @@
+import io
+import os
+import json
+import hashlib
+import time
+import tempfile
 import argparse
 import unittest
 import copy
 from unittest import mock
 from schema import SchemaError
+from requests.exceptions import ConnectionError, ReadTimeout
 from ..skelerest import Skelerest
+from ..metrics import REGISTRY
+from .. import profiling
 
 class TestSkelerest(unittest.TestCase):
 
@@ -87,7 +96,10 @@ class TestSkelerest(unittest.TestCase):
         skelerest = Skelerest.load(self.CONFIG_VALID)
 
         self.assertEqual(len(skelerest.requests), 4)
-        self.assertEqual(skelerest.commands, ["post-test-project", "put-test-project", "get-test-project", "delete-test-project"])
+        self.assertEqual(list(skelerest.commands), ["post-test-project", "put-test-project", "get-test-project", "delete-test-project", "skelerest-serve"])
+        self.assertEqual(len(skelerest.commands), 5)
+        self.assertIn("skelerest-serve", skelerest.commands)
+        self.assertNotIn("patch-test-project", skelerest.commands)
 
     def test_load_invalid_schema(self):
         try:
@@ -119,6 +131,29 @@ class TestSkelerest(unittest.TestCase):
         self.assertNotEqual(post_parser, None)
         self.assertNotEqual(get_parser, None)
 
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_option_variables(self, mock_req_api, mock_stdout):
+        mock_req_api.get.return_value = mock.MagicMock(status_code=200, ok=True, headers={}, content=b"{}", text="{}")
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["requests"][2]["endpoint"] = "http://not a real {site}/{format}/{help:all}"
+        skelerest = Skelerest.load(config)
+
+        # The variables take the plain option strings, and the options of the component keep their prefix
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--format', 'csv', '--help', 'some',
+                                  '--sr-format', 'jsonl', '--batch', 'rows.jsonl'])
+        self.assertEqual((args.format, args.help), ("csv", "some"))
+        self.assertEqual((args.sr_format, args.sr_batch), ("jsonl", "rows.jsonl"))
+
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--format', 'csv', '--sr-format', 'jsonl'])
+        skelerest.execute(None, args)
+
+        self.assertEqual(mock_req_api.get.call_args[0][0], "http://not a real site/csv/all")
+        self.assertEqual(json.loads(mock_stdout.getvalue())["status"], 200)
+
     @mock.patch('skelerest.skelerest.request_api')
     def test_execute_get(self, mock_req_api):
         mock_response = mock.MagicMock()
@@ -143,7 +178,7 @@ class TestSkelerest(unittest.TestCase):
         endpoint = "http://not a real site"
         params = {'one': '01', 'two': '02'}
         headers = {'a': 'AA', 'b': 'BB'}
-        mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers)
+        mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers, timeout=(10, 60))
 
     @mock.patch('skelerest.aws_auth.datetime')
     @mock.patch('skelerest.aws_auth.get_credentials')
@@ -170,6 +205,7 @@ class TestSkelerest(unittest.TestCase):
         mock_creds = mock.MagicMock()
         mock_creds.access_key = "akey"
         mock_creds.secret_key = "skey"
+        mock_creds.token = None
         mock_cred.return_value = mock_creds
 
         config = copy.deepcopy(self.CONFIG_VALID)
@@ -194,7 +230,26 @@ class TestSkelerest(unittest.TestCase):
         endpoint = "http://not a real site"
         params = {'one': '01', 'two': '02'}
         headers = {'a': 'AA', 'b': 'BB', 'content-type': 'application/json', 'x-amz-date': '2022-01-01', 'Authorization': 'AWS4-HMAC-SHA256 Credential=akey/2022-01-01/us-east-2/execute-api/aws4_request, SignedHeaders=content-type;host;x-amz-date, Signature=hex-signed'}
-        mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers)
+        mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers, timeout=(10, 60))
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_timeout(self, mock_req_api, mock_stdout):
+        mock_req_api.get.side_effect = ReadTimeout("Read timed out. (read timeout=0.2)")
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--read-timeout', '0.2'])
+        with self.assertRaises(SystemExit) as context:
+            skelerest.execute(None, args)
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertIn("|SKELEREST| ERROR: GET http://not a real site : Read timed out. (read timeout=0.2)",
+                      mock_stdout.getvalue())
+        mock_req_api.get.assert_called_once_with("http://not a real site", params={'one': '1', 'two': '2'},
+                                                 headers={'a': 'A', 'b': 'B'}, timeout=(10, 0.2))
 
     @mock.patch('skelerest.skelerest.request_api')
     def test_execute_post(self, mock_req_api):
@@ -222,7 +277,39 @@ class TestSkelerest(unittest.TestCase):
         params = {'one': '01', 'two': '02'}
         headers = {'a': 'AA', 'b': 'BB'}
         data = '{"id": "1", "name": "test", "items": ["a", "b", "c"], "parent": {"id": "2", "name": "you"}}'
-        mock_req_api.post.assert_called_with(endpoint, data=data, params=params, headers=headers)
+        mock_req_api.post.assert_called_with(endpoint, data=data, params=params, headers=headers, timeout=(10, 60))
+
+    @mock.patch('skelerest.aws_auth.get_credentials')
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_upload(self, mock_req_api, mock_cred):
+        mock_req_api.put.return_value = mock.MagicMock(status_code=200, ok=True)
+        mock_cred.return_value = mock.MagicMock(access_key="akey", secret_key="skey", token="stoken")
+
+        config = {"requests": [{
+            "name": "model", "endpoint": "http://bucket/{key}", "method": "PUT", "aws": True,
+            "file": "{path}", "contentType": "application/json"
+        }]}
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['put-model', '--format', 'quiet', '--key', 'body.json',
+                                  '--path', 'skelerest/test/files/body.json'])
+        skelerest.execute(None, args)
+
+        with open("skelerest/test/files/body.json", "rb") as body_file:
+            digest = hashlib.sha256(body_file.read()).hexdigest()
+        endpoint, kwargs = mock_req_api.put.call_args
+        self.assertEqual(endpoint, ("http://bucket/body.json",))
+        self.assertEqual(str(kwargs["data"]), "<file skelerest/test/files/body.json>")
+        self.assertIsNone(kwargs["data"].handle)
+        self.assertEqual(kwargs["headers"]["content-type"], "application/json")
+        self.assertEqual(kwargs["headers"]["x-amz-content-sha256"], digest)
+        self.assertEqual(kwargs["headers"]["x-amz-security-token"], "stoken")
+        self.assertNotIn("Content-Type", kwargs["headers"])
+        self.assertIn("SignedHeaders=content-type;host;x-amz-content-sha256;x-amz-date;x-amz-security-token,",
+                      kwargs["headers"]["Authorization"])
 
     @mock.patch('skelerest.skelerest.request_api')
     def test_execute_put(self, mock_req_api):
@@ -250,7 +337,7 @@ class TestSkelerest(unittest.TestCase):
         params = {'one': '01', 'two': '02'}
         headers = {'a': 'AA', 'b': 'BB'}
         data = '{"id": "123", "name": "test", "items": ["a", "b", "c"], "parent": {"id": "2", "name": "you"}}'
-        mock_req_api.put.assert_called_with(endpoint, data=data, params=params, headers=headers)
+        mock_req_api.put.assert_called_with(endpoint, data=data, params=params, headers=headers, timeout=(10, 60))
 
     @mock.patch('skelerest.skelerest.request_api')
     def test_execute_delete(self, mock_req_api):
@@ -276,7 +363,769 @@ class TestSkelerest(unittest.TestCase):
         endpoint = "http://not a real site"
         params = {'one': '01', 'two': '02'}
         headers = {'a': 'AAA', 'b': 'BBB'}
-        mock_req_api.delete.assert_called_with(endpoint, params=params, headers=headers)
+        mock_req_api.delete.assert_called_with(endpoint, params=params, headers=headers, timeout=(10, 60))
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_format_jsonl(self, mock_req_api, mock_stdout):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+        mock_response.headers = {"content-type": "application/json"}
+        mock_response.content = b'{"id": 1}'
+        mock_response.text = '{"id": 1}'
+        mock_req_api.get.return_value = mock_response
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args([
+            'get-test-project', '--format', 'jsonl',
+            '--param-one', '01', '--param-two', '02',
+            '--header-one', 'AA', '--header-two', 'BB',
+            '--site', 'site'
+        ])
+
+        skelerest.execute(None, args)
+
+        lines = mock_stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record["command"], "get-test-project")
+        self.assertEqual(record["method"], "GET")
+        self.assertEqual(record["endpoint"], "http://not a real site")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["bytes"], 9)
+        self.assertEqual(record["body"], '{"id": 1}')
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_metrics_file(self, mock_req_api):
+        REGISTRY.reset()
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 404
+        mock_response.ok = False
+        mock_req_api.get.return_value = mock_response
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "metrics.prom")
+            args = parser.parse_args([
+                'get-test-project', '--format', 'quiet', '--metrics-file', path,
+                '--param-one', '01', '--param-two', '02',
+                '--header-one', 'AA', '--header-two', 'BB',
+                '--site', 'site'
+            ])
+
+            # Commands run in the same process (such as the daemon) each write only their own requests
+            for i in range(2):
+                with self.assertRaises(SystemExit):
+                    skelerest.execute(None, args)
+
+            with open(path) as metrics_file:
+                metrics = metrics_file.read()
+
+        self.assertIn('skelerest_requests_total{command="get-test-project",method="GET",status="404"} 1', metrics)
+        self.assertIn('skelerest_request_duration_seconds_count{command="get-test-project",method="GET"} 1', metrics)
+        self.assertEqual(REGISTRY.counts[("get-test-project", "GET", "404")], 2)
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_record_replay(self, mock_req_api):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 201
+        mock_response.ok = True
+        mock_response.headers = {"content-type": "application/json"}
+        mock_response.content = b'{"id": 1}'
+        mock_req_api.post.return_value = mock_response
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        cli_args = [
+            '--site', 'post',
+            '--param-one', '01', '--param-two', '02',
+            '--header-one', 'AA', '--header-two', 'BB',
+            '--id', '1', '--parent-id', '2', '--parent-name', 'you'
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            args = parser.parse_args(['post-test-project', '--format', 'quiet', '--record', tmp_dir] + cli_args)
+            skelerest.execute(None, args)
+            self.assertEqual(mock_req_api.post.call_count, 1)
+            self.assertEqual(len(os.listdir(tmp_dir)), 1)
+
+            with mock.patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                args = parser.parse_args(['post-test-project', '--format', 'jsonl', '--replay', tmp_dir] + cli_args)
+                skelerest.execute(None, args)
+                record = json.loads(mock_stdout.getvalue())
+
+            self.assertEqual(mock_req_api.post.call_count, 1)
+            self.assertEqual(record["status"], 201)
+            self.assertEqual(record["body"], '{"id": 1}')
+
+            args = parser.parse_args(['post-test-project', '--format', 'quiet', '--replay', tmp_dir] + cli_args[:-1] + ['me'])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+            self.assertEqual(mock_req_api.post.call_count, 1)
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.add_aws_headers')
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_dry_run_batch(self, mock_req_api, mock_aws, mock_stdout):
+        mock_aws.side_effect = lambda endpoint, profile, region, method, params, headers, body, content_type: headers
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["requests"][0]["aws"] = True
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.csv")
+            with open(path, "w") as batch_file:
+                batch_file.write("site,id,parent-id,parent_name\none,1,10,a\ntwo,2,20,b\n")
+
+            args = parser.parse_args(['post-test-project', '--dry-run', '--batch', path, '--header-one', 'AA'])
+            skelerest.execute(None, args)
+
+        # The plans of signed requests are not mixed with the text messages
+        mock_req_api.post.assert_not_called()
+        self.assertEqual(mock_aws.call_count, 2)
+        plans = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(len(plans), 2)
+        self.assertEqual(plans[0], {
+            "command": "post-test-project",
+            "method": "POST",
+            "endpoint": "http://not a real one",
+            "params": {"one": "1", "two": "2"},
+            "headers": {"a": "AA", "b": "B"},
+            "body": '{"id": "1", "name": "test", "items": ["a", "b", "c"], "parent": {"id": "10", "name": "a"}}'
+        })
+        self.assertEqual(plans[1]["endpoint"], "http://not a real two")
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch(self, mock_req_api, mock_stdout):
+        mock_session = mock_req_api.Session.return_value
+        ok_response = mock.MagicMock()
+        ok_response.status_code = 200
+        ok_response.ok = True
+        error_response = mock.MagicMock()
+        error_response.status_code = 500
+        error_response.ok = False
+        mock_session.get.side_effect = [ok_response, error_response, ok_response]
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                batch_file.write('{"site": "one"}\n{"site": "two"}\n{"site": "three"}\n')
+
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+        self.assertEqual(mock_session.get.call_count, 3)
+        mock_session.get.assert_called_with("http://not a real three", params={'one': '1', 'two': '2'},
+                                            headers={'a': 'A', 'b': 'B'}, timeout=(10, 60))
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([line["status"] for line in lines[:3]], [200, 500, 200])
+        self.assertEqual(lines[3], {"summary": {"requests": 3, "succeeded": 2, "failed": 1}})
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_concurrent(self, mock_req_api, mock_stdout):
+        mock_session = mock_req_api.Session.return_value
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+        mock_session.get.return_value = mock_response
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                for i in range(20):
+                    batch_file.write(json.dumps({"site": f"site-{i}"}) + "\n")
+
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path, '--concurrency', '4'])
+            skelerest.execute(None, args)
+
+        self.assertEqual(mock_session.get.call_count, 20)
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(sorted([line["endpoint"] for line in lines[:20]]),
+                         sorted([f"http://not a real site-{i}" for i in range(20)]))
+        self.assertEqual(lines[20], {"summary": {"requests": 20, "succeeded": 20, "failed": 0, "concurrency": 4}})
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_resume(self, mock_req_api, mock_stdout):
+        mock_session = mock_req_api.Session.return_value
+        ok_response = mock.MagicMock()
+        ok_response.status_code = 200
+        ok_response.ok = True
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                for i in range(5):
+                    batch_file.write(json.dumps({"site": f"site-{i}"}) + "\n")
+
+            # The first run fails on a connection error and is interrupted after the third row
+            mock_session.get.side_effect = [ok_response, ConnectionError("down"), ok_response, KeyboardInterrupt()]
+            args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', path])
+            with self.assertRaises(KeyboardInterrupt):
+                skelerest.execute(None, args)
+
+            with open(f"{path}.checkpoint") as journal:
+                self.assertEqual(journal.read(), "0 200\n1 error\n2 200\n")
+
+            mock_session.get.side_effect = None
+            mock_session.get.return_value = ok_response
+            mock_session.get.reset_mock()
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path, '--resume'])
+            skelerest.execute(None, args)
+
+            endpoints = [call[0][0] for call in mock_session.get.call_args_list]
+            self.assertEqual(endpoints, ["http://not a real site-3", "http://not a real site-4"])
+            summary = json.loads(mock_stdout.getvalue().splitlines()[-1])["summary"]
+            self.assertEqual(summary, {"requests": 2, "succeeded": 2, "failed": 0, "skipped": 3})
+
+            mock_session.get.reset_mock()
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path, '--retry-failed'])
+            skelerest.execute(None, args)
+
+            endpoints = [call[0][0] for call in mock_session.get.call_args_list]
+            self.assertEqual(endpoints, ["http://not a real site-1"])
+            summary = json.loads(mock_stdout.getvalue().splitlines()[-1])["summary"]
+            self.assertEqual(summary, {"requests": 1, "succeeded": 1, "failed": 0, "skipped": 4})
+
+    @mock.patch('skelerest.skelerest.forward')
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_workers(self, mock_req_api, mock_forward):
+        mock_forward.return_value = None
+        mock_session = mock_req_api.Session.return_value
+        mock_session.get.side_effect = lambda endpoint, **kwargs: mock.MagicMock(
+            status_code=200, ok=True, headers={}, content=endpoint.encode("utf-8"))
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            cassettes = os.path.join(tmp_dir, "cassettes")
+            with open(path, "w") as batch_file:
+                for i in range(150):
+                    batch_file.write(json.dumps({"site": f"site-{i}"}) + "\n")
+
+            args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', path, '--record', cassettes])
+            skelerest.execute(None, args)
+
+            # Replaying in the worker processes does not rely on the mocked request api
+            REGISTRY.reset()
+            with mock.patch('sys.stdout', new_callable=io.StringIO) as mock_stdout:
+                args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path,
+                                          '--replay', cassettes, '--workers', '2'])
+                skelerest.execute(None, args)
+                lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+
+            with open(f"{path}.checkpoint") as journal:
+                self.assertEqual(journal.read(), "".join([f"{i} 200\n" for i in range(150)]))
+
+        self.assertEqual([line["body"] for line in lines[:150]], [f"http://not a real site-{i}" for i in range(150)])
+        self.assertEqual(lines[150], {"summary": {"requests": 150, "succeeded": 150, "failed": 0, "workers": 2}})
+        self.assertEqual(REGISTRY.counts, {("get-test-project", "GET", "200"): 150})
+        # The batch with workers is never forwarded to the daemon
+        self.assertEqual(mock_forward.call_count, 1)
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_timeouts(self, mock_req_api):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+        mock_req_api.get.return_value = mock_response
+
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["connectTimeout"] = 5
+        config["readTimeout"] = 20
+        config["requests"][2]["readTimeout"] = 30
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--site', 'site'])
+        skelerest.execute(None, args)
+        self.assertEqual(mock_req_api.get.call_args[1]["timeout"], (5, 30))
+
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--site', 'site',
+                                  '--connect-timeout', '2', '--read-timeout', '3'])
+        skelerest.execute(None, args)
+        self.assertEqual(mock_req_api.get.call_args[1]["timeout"], (2, 3))
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_include(self, mock_req_api):
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+        mock_req_api.get.return_value = mock_response
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "users.yaml"), "w") as catalog_file:
+                catalog_file.write('requests:\n- name: users\n  endpoint: "http://users/{id}"\n  method: GET\n')
+
+            config = copy.deepcopy(self.CONFIG_VALID)
+            config["include"] = [os.path.join(tmp_dir, "*.yaml")]
+            with mock.patch('skelerest.catalog.INDEX_FILE', os.path.join(tmp_dir, "index.json")):
+                skelerest = Skelerest.load(config)
+                self.assertTrue(os.path.exists(os.path.join(tmp_dir, "index.json")))
+                cached = Skelerest.load(config)
+
+            self.assertIn("get-users", cached.commands)
+            self.assertEqual(list(cached.commands)[-2:], ["get-users", "skelerest-serve"])
+            self.assertEqual(len(cached.requests), 4)
+            self.assertEqual(cached.toDict()["include"], config["include"])
+            self.assertNotIn("catalogs", cached.toDict())
+
+            parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+            subparsers = parser.add_subparsers(dest="job")
+            subparsers = cached.addParsers(subparsers)
+            args = parser.parse_args(['get-users', '--format', 'quiet', '--id', '7'])
+            cached.execute(None, args)
+            self.assertIsNotNone(skelerest.get_request("get-users"))
+
+        mock_req_api.get.assert_called_once_with("http://users/7", params={}, headers={}, timeout=(10, 60))
+        self.assertIsNone(skelerest.get_request("get-other"))
+        self.assertIsNone(cached.get_request("get-users"))
+
+    @mock.patch('skelerest.skelerest.forward')
+    @mock.patch('time.sleep')
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_watch(self, mock_req_api, mock_stdout, mock_sleep, mock_forward):
+        mock_session = mock_req_api.Session.return_value
+        running = mock.MagicMock(status_code=200, ok=True, headers={"ETag": '"v1"'},
+                                 content=b'{"status": "running"}', text='{"status": "running"}')
+        unchanged = mock.MagicMock(status_code=304, ok=True, headers={}, content=b"", text="")
+        done = mock.MagicMock(status_code=200, ok=True, headers={"ETag": '"v2"'},
+                              content=b'{"status": "done"}', text='{"status": "done"}')
+        mock_session.get.side_effect = [running, unchanged, unchanged, done]
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--site', 'site',
+                                  '--watch', '2', '--until', '$.status == "done"'])
+        skelerest.execute(None, args)
+
+        self.assertEqual(mock_session.get.call_count, 4)
+        self.assertEqual(mock_session.get.call_args_list[0][1]["headers"], {'a': 'A', 'b': 'B'})
+        self.assertEqual(mock_session.get.call_args_list[3][1]["headers"], {'a': 'A', 'b': 'B', 'If-None-Match': '"v1"'})
+        self.assertEqual([call[0][0] for call in mock_sleep.call_args_list], [2, 4, 8])
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([line["body"] for line in lines], ['{"status": "running"}', '{"status": "done"}'])
+        self.assertIsNone(skelerest.session)
+        mock_forward.assert_not_called()
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_watch_invalid(self, mock_req_api, mock_stderr):
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        for argv in [['get-test-project', '--until', '$.status'],
+                     ['get-test-project', '--watch', '1', '--until', 'status'],
+                     ['post-test-project', '--watch', '1']]:
+            args = parser.parse_args(argv + ['--format', 'jsonl', '--site', 'site'])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+        self.assertEqual(len(mock_stderr.getvalue().splitlines()), 3)
+        mock_req_api.Session.return_value.get.assert_not_called()
+
+    def test_load_invalid_timeout(self):
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["deadline"] = -1
+
+        with self.assertRaises(SchemaError):
+            Skelerest.load(config)
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_deadline(self, mock_req_api):
+        mock_session = mock_req_api.Session.return_value
+        mock_response = mock.MagicMock()
+        mock_response.status_code = 200
+        mock_response.ok = True
+
+        def get(endpoint, **kwargs):
+            time.sleep(0.02)
+            return mock_response
+
+        mock_session.get.side_effect = get
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                for i in range(50):
+                    batch_file.write(json.dumps({"site": f"site-{i}"}) + "\n")
+
+            args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', path,
+                                      '--deadline', '0.1'])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+            with open(f"{path}.checkpoint") as journal:
+                completed = journal.read().splitlines()
+
+        self.assertLess(mock_session.get.call_count, 50)
+        self.assertEqual(len(completed), mock_session.get.call_count)
+        self.assertLessEqual(mock_session.get.call_args[1]["timeout"][1], 0.1)
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_circuit_breaker(self, mock_req_api, mock_stdout, mock_stderr):
+        mock_session = mock_req_api.Session.return_value
+        error_response = mock.MagicMock()
+        error_response.status_code = 503
+        error_response.ok = False
+        mock_session.get.return_value = error_response
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                for i in range(30):
+                    batch_file.write(json.dumps({"site": "down"}) + "\n")
+
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+            with open(f"{path}.checkpoint") as journal:
+                statuses = [line.split()[1] for line in journal.read().splitlines()]
+
+        self.assertEqual(mock_session.get.call_count, 10)
+        self.assertEqual(statuses, ["503"] * 10 + ["open"] * 20)
+        self.assertIn("short-circuiting its requests", mock_stderr.getvalue())
+        summary = json.loads(mock_stdout.getvalue().splitlines()[-1])["summary"]
+        self.assertEqual(summary, {"requests": 30, "succeeded": 0, "failed": 30, "short-circuited": 20})
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_hedged(self, mock_req_api, mock_stdout):
+        mock_session = mock_req_api.Session.return_value
+        slow_response = mock.MagicMock(status_code=200, ok=True, headers={}, content=b"slow", text="slow")
+        fast_response = mock.MagicMock(status_code=200, ok=True, headers={}, content=b"fast", text="fast")
+        responses = iter([(0.2, slow_response), (0, fast_response), (0, fast_response)])
+
+        def request(method, endpoint, **kwargs):
+            delay, response = next(responses)
+            # A command running alongside in the daemon hedges a request of its own
+            REGISTRY.observe_hedge("get-test-project", "GET")
+            time.sleep(delay)
+            return response
+
+        mock_session.request.side_effect = request
+
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["requests"][2]["hedgeAfterMs"] = 50
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                batch_file.write('{"site": "one"}\n{"site": "two"}\n')
+
+            REGISTRY.reset()
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path])
+            skelerest.execute(None, args)
+
+        self.assertEqual(mock_session.request.call_count, 3)
+        self.assertEqual(mock_session.request.call_args[1]["stream"], True)
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([(line["hedged"], line["body"]) for line in lines[:2]], [(True, "fast"), (False, "fast")])
+        self.assertEqual(lines[2]["summary"]["hedged"], 1)
+        self.assertEqual(lines[2]["summary"]["hedge_rate"], 0.5)
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_coalesced(self, mock_req_api, mock_stdout):
+        mock_session = mock_req_api.Session.return_value
+        ok_response = mock.MagicMock()
+        ok_response.status_code = 200
+        ok_response.ok = True
+        error_response = mock.MagicMock()
+        error_response.status_code = 500
+        error_response.ok = False
+
+        def get(endpoint, **kwargs):
+            return error_response if (endpoint.endswith("down")) else ok_response
+
+        mock_session.get.side_effect = get
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                batch_file.write('{"site": "one"}\n{"site": "one"}\n{"site": "two"}\n{"site": "one"}\n')
+                batch_file.write('{"site": "down"}\n{"site": "down"}\n')
+
+            args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', path])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+            self.assertEqual(mock_session.get.call_count, 4)
+            lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+            self.assertEqual([line.get("coalesced", False) for line in lines[:6]],
+                             [False, True, False, True, False, False])
+            self.assertEqual(lines[6]["summary"], {"requests": 6, "succeeded": 4, "failed": 2})
+
+            mock_session.get.reset_mock()
+            args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', path,
+                                      '--no-coalesce', '--no-circuit-breaker'])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+        self.assertEqual(mock_session.get.call_count, 6)
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_batch_extract(self, mock_req_api, mock_stdout, mock_stderr):
+        mock_session = mock_req_api.Session.return_value
+        items = mock.MagicMock(status_code=200, ok=True, text='[{"id": 1, "owner": {"name": "a"}}, {"id": 2}]')
+        item = mock.MagicMock(status_code=200, ok=True, text='{"id": 3, "owner": {"name": "c"}}')
+        error = mock.MagicMock(status_code=500, ok=False, text='{"id": "oops"}')
+        mock_session.get.side_effect = [items, error, item]
+
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["requests"][2]["extract"] = {"id": "$.id", "owner": "$.owner.name"}
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.jsonl")
+            with open(path, "w") as batch_file:
+                batch_file.write('{"site": "one"}\n{"site": "two"}\n{"site": "three"}\n')
+
+            args = parser.parse_args(['get-test-project', '--format', 'csv', '--batch', path])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+            args = parser.parse_args(['post-test-project', '--format', 'csv', '--site', 'site'])
+            with self.assertRaises(SystemExit):
+                skelerest.execute(None, args)
+
+        self.assertEqual(mock_stdout.getvalue(), "id,owner\n1,a\n2,\n3,c\n")
+        self.assertEqual(mock_stderr.getvalue().splitlines(), [
+            "|SKELEREST| ERROR: GET http://not a real two : 500",
+            "|SKELEREST| ERROR: The csv format requires the request to extract fields from its responses"
+        ])
+        mock_req_api.post.assert_not_called()
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_stream(self, mock_req_api, mock_stdout):
+        mock_response = mock.MagicMock(status_code=200, ok=True, headers={})
+        mock_response.raw.chunked = True
+        mock_response.iter_content.return_value = iter([b'event: tick\ndata: {"n": 1}\n\nda', b'ta: {"n": 2}\n\n'])
+        mock_req_api.get.return_value = mock_response
+        REGISTRY.reset()
+
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--site', 'site', '--stream', 'sse'])
+        skelerest.execute(None, args)
+
+        mock_req_api.get.assert_called_once_with("http://not a real site", params={'one': '1', 'two': '2'},
+                                                 headers={'a': 'A', 'b': 'B'}, timeout=(10, 60), stream=True)
+        mock_response.close.assert_called_once_with()
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual([line["event"]["data"] for line in lines[:2]], [{"n": 1}, {"n": 2}])
+        self.assertEqual(lines[0]["event"]["type"], "tick")
+        self.assertEqual((lines[2]["events"], lines[2]["bytes"], lines[2]["body"]), (2, 44, None))
+        self.assertEqual(lines[2]["first_event"], lines[0]["event"]["elapsed"])
+        self.assertEqual(REGISTRY.first_events[("get-test-project", "GET")]["count"], 1)
+
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--stream', 'ndjson', '--record', 'cassettes'])
+        with self.assertRaises(SystemExit):
+            skelerest.execute(None, args)
+        self.assertIn("Streaming responses can not be", mock_stdout.getvalue())
+        self.assertEqual(mock_req_api.get.call_count, 1)
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_priority(self, mock_req_api, mock_stdout):
+        mock_req_api.get.return_value = mock.MagicMock(status_code=200, ok=True)
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["requests"][2]["weight"] = 2
+        skelerest = Skelerest.load(config)
+        skelerest.scheduler = mock.MagicMock()
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--format', 'quiet', '--priority', 'high'])
+        skelerest.execute(None, args)
+
+        execution = skelerest.scheduler.acquire.call_args[0][0]
+        skelerest.scheduler.acquire.assert_called_once_with(execution, "high", 2)
+        skelerest.scheduler.release.assert_called_once_with()
+        self.assertEqual((execution.priority, execution.weight), ("high", 2))
+        self.assertNotIn("scheduler", skelerest.toDict())
+
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--weight', '0'])
+        with self.assertRaises(SystemExit):
+            skelerest.execute(None, args)
+        self.assertIn("The weight of the requests must be a positive number", mock_stdout.getvalue())
+        self.assertEqual(mock_req_api.get.call_count, 1)
+
+        args = parser.parse_args(['get-test-project', '--site', 'site', '--format', 'quiet'])
+        execution = skelerest.get_execution(args)
+        self.assertEqual((execution.priority, execution.weight), ("normal", 2))
+
+    def test_load_profile_other_job(self):
+        with mock.patch('sys.argv', ["skelebot", "train", "--profile", "prod"]):
+            Skelerest.load(self.CONFIG_VALID)
+        self.assertNotIn("profiler", profiling.ACTIVE)
+
+        with mock.patch('sys.argv', ["skelebot", "get-test-project", "--profile"]):
+            Skelerest.load(self.CONFIG_VALID)
+        self.assertEqual(profiling.ACTIVE["profiler"].mode, "cprofile")
+        profiling.get_profiler("cprofile").stop()
+
+    @mock.patch('sys.stderr', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.forward')
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_profile(self, mock_req_api, mock_forward, mock_stderr):
+        mock_req_api.get.return_value = mock.MagicMock(status_code=200, ok=True)
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "run.pstats")
+            args = parser.parse_args(['get-test-project', '--format', 'quiet', '--site', 'site',
+                                      '--profile', '--profile-file', path])
+            skelerest.execute(None, args)
+            self.assertTrue(os.path.exists(path))
+
+        mock_forward.assert_not_called()
+        mock_req_api.get.assert_called_once()
+        report = mock_stderr.getvalue().splitlines()
+        self.assertEqual(report[0], "|SKELEREST| PROFILE PHASES (calls, cumulative seconds)")
+        self.assertTrue(report[4].startswith("|SKELEREST| - render : 1 calls, "))
+        self.assertTrue(report[5].startswith("|SKELEREST| - sign : 0 calls, "))
+        self.assertEqual(report[-1], f"|SKELEREST| PROFILE WRITTEN TO {path}")
+
+    @mock.patch('sys.stdout', new_callable=io.StringIO)
+    @mock.patch('skelerest.skelerest.add_aws_headers')
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_targets(self, mock_req_api, mock_aws, mock_stdout):
+        mock_aws.side_effect = lambda endpoint, profile, region, method, params, headers, body, content_type: dict(headers, region=region)
+        mock_req_api.get.side_effect = lambda endpoint, **kwargs: mock.MagicMock(
+            status_code=200, ok=True, headers={}, content=b"", text='{"host": "%s"}' % endpoint)
+
+        config = copy.deepcopy(self.CONFIG_VALID)
+        config["targets"] = [
+            {"name": "east", "awsRegion": "us-east-1"},
+            {"name": "west", "host": "west.api", "awsRegion": "us-west-2"}
+        ]
+        config["requests"][2]["aws"] = True
+        skelerest = Skelerest.load(config)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--site', 'site'])
+        skelerest.execute(None, args)
+
+        regions = sorted([call[1]["headers"]["region"] for call in mock_req_api.get.call_args_list])
+        self.assertEqual(regions, ["us-east-1", "us-west-2"])
+        endpoints = sorted([call[0][0] for call in mock_req_api.get.call_args_list])
+        self.assertEqual(endpoints, ["http://not a real site", "http://west.api"])
+
+        lines = [json.loads(line) for line in mock_stdout.getvalue().splitlines()]
+        self.assertEqual(sorted([line["target"] for line in lines[:2]]), ["east", "west"])
+        comparison = lines[2]["comparison"]
+        self.assertEqual([row["target"] for row in comparison], ["east", "west"])
+        self.assertEqual(comparison[1]["status"], 200)
+        self.assertIn('+  "host": "http://west.api"', comparison[1]["diff"])
+
+        mock_req_api.get.reset_mock()
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--site', 'site', '--target', 'west'])
+        skelerest.execute(None, args)
+        mock_req_api.get.assert_called_once()
+        self.assertEqual(mock_req_api.get.call_args[0][0], "http://west.api")
+
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--site', 'site', '--target', 'north'])
+        with self.assertRaises(SystemExit):
+            skelerest.execute(None, args)
+
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', 'batch.jsonl'])
+        with self.assertRaises(SystemExit):
+            skelerest.execute(None, args)
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_missing_variable(self, mock_req_api):
+        skelerest = Skelerest.load(self.CONFIG_VALID)
+
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter)
+        subparsers = parser.add_subparsers(dest="job")
+        subparsers = skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'quiet'])
+
+        with self.assertRaises(SystemExit):
+            skelerest.execute(None, args)
+        mock_req_api.get.assert_not_called()
 
     @mock.patch('skelerest.skelerest.request_api')
     def test_execute_error_response(self, mock_req_api):
@@ -304,5 +1153,5 @@ class TestSkelerest(unittest.TestCase):
             endpoint = "http://not a real site"
             params = {'one': '01', 'two': '02'}
             headers = {'a': 'AA', 'b': 'BB'}
-            mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers)
+            mock_req_api.get.assert_called_with(endpoint, params=params, headers=headers, timeout=(10, 60))
 
@@ -0,0 +1,69 @@
+import unittest
+from unittest import mock
+from urllib3.exceptions import ReadTimeoutError, ProtocolError
+from requests.exceptions import ReadTimeout, ChunkedEncodingError
+from ..stream import EventStream, iter_lines, iter_sse, iter_ndjson, iter_chunks
+
+class TestStream(unittest.TestCase):
+
+    def test_iter_lines(self):
+        chunks = [b"one\r", b"\ntw", b"o\n\nthr", b"ee"]
+
+        self.assertEqual(list(iter_lines(chunks)), ["one", "two", "", "three"])
+        self.assertEqual(list(iter_lines([b"\xe2\x9c", b"\x93\n"])), ["✓"])
+
+    def test_iter_sse(self):
+        lines = [
+            ": keep-alive", "",
+            "event: update", "id: 7", 'data: {"n": 1}', "",
+            "data: first", "data:second", "retry: 10", "",
+            "data: last"
+        ]
+
+        self.assertEqual(list(iter_sse(lines)), [
+            {"type": "update", "id": "7", "data": {"n": 1}},
+            {"data": "first\nsecond"},
+            {"data": "last"}
+        ])
+
+    def test_iter_ndjson(self):
+        lines = ['{"n": 1}', "", "  ", "[1, 2]", "not json"]
+
+        self.assertEqual(list(iter_ndjson(lines)), [{"data": {"n": 1}}, {"data": [1, 2]}, {"data": "not json"}])
+
+    def test_iter_chunks(self):
+        response = mock.MagicMock()
+        response.raw.chunked = True
+        response.iter_content.return_value = iter([b"a", b"b"])
+        self.assertEqual(list(iter_chunks(response)), [b"a", b"b"])
+        response.iter_content.assert_called_with(chunk_size=None)
+
+        response.raw.chunked = False
+        response.raw.read1.side_effect = [b"c", b"d", b""]
+        self.assertEqual(list(iter_chunks(response)), [b"c", b"d"])
+        response.raw.read1.assert_called_with(65536, decode_content=True)
+
+        response.raw.read1.side_effect = [b"e", ReadTimeoutError(None, None, "Read timed out.")]
+        chunks = iter_chunks(response)
+        self.assertEqual(next(chunks), b"e")
+        self.assertRaises(ReadTimeout, next, chunks)
+        response.raw.read1.side_effect = ProtocolError("Connection broken")
+        self.assertRaises(ChunkedEncodingError, list, iter_chunks(response))
+
+    @mock.patch('time.perf_counter')
+    def test_event_stream(self, mock_counter):
+        mock_counter.side_effect = [1.5, 2.0]
+        response = mock.MagicMock()
+        response.raw.chunked = True
+        response.iter_content.return_value = iter([b'{"n": 1}\n{"n"', b': 2}\n'])
+        events = EventStream(response, "ndjson", 1.0)
+
+        self.assertIsNone(events.first_event)
+        self.assertEqual(list(events), [
+            {"data": {"n": 1}, "index": 1, "elapsed": 0.5},
+            {"data": {"n": 2}, "index": 2, "elapsed": 1.0}
+        ])
+        self.assertEqual((events.events, events.size, events.first_event), (2, 18, 0.5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import io
+import os
+import json
+import argparse
+import tempfile
+import unittest
+import requests
+from ..skelerest import Skelerest
+from ..stub import StubServer
+
+class TestStub(unittest.TestCase):
+
+    server = None
+    url = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer().start()
+        cls.url = cls.server.get_url()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_routes(self):
+        response = requests.post(f"{self.url}/echo/1?a=b", data=b"12345", timeout=5)
+        self.assertEqual(response.json(), {"method": "POST", "path": "/echo/1", "query": {"a": "b"}, "bytes": 5})
+
+        response = requests.put(f"{self.url}/upload", data=iter([b"123", b"45678"]), timeout=5)
+        self.assertEqual(response.json()["bytes"], 8)
+
+        response = requests.get(f"{self.url}/status/404", timeout=5)
+        self.assertEqual((response.status_code, response.json()), (404, {"status": 404}))
+
+        response = requests.get(f"{self.url}/items/3", timeout=5)
+        self.assertEqual([item["id"] for item in response.json()], [0, 1, 2])
+
+        response = requests.get(f"{self.url}/bytes/100000", timeout=5)
+        self.assertEqual(len(response.content), 100000)
+
+        response = requests.get(f"{self.url}/stream/3?format=sse", timeout=5)
+        self.assertEqual(response.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(response.text.count("event: update\n"), 3)
+
+        response = requests.get(f"{self.url}/stream/2", timeout=5)
+        self.assertEqual([json.loads(line)["status"] for line in response.text.splitlines()], ["running", "done"])
+
+        response = requests.get(f"{self.url}/stream/2?chunked=0", timeout=5)
+        self.assertNotIn("Transfer-Encoding", response.headers)
+        self.assertEqual([json.loads(line)["status"] for line in response.text.splitlines()], ["running", "done"])
+
+    def test_settings(self):
+        with StubServer(latency=5, error_rate=1, error_status=500) as server:
+            response = requests.get(f"{server.get_url()}/echo", timeout=5)
+            self.assertEqual((response.status_code, response.json()), (500, {"error": "Injected error"}))
+
+            response = requests.get(f"{server.get_url()}/echo?error_rate=0", timeout=5)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(server.get_settings({"latency": "20"}),
+                             {"latency": 20, "jitter": 0, "error_rate": 1, "error_status": 500})
+            self.assertEqual(server.requests, 2)
+
+    def test_execute(self):
+        skelerest = Skelerest.load({"requests": [
+            {"name": "echo", "endpoint": f"{self.url}/echo/{{id}}", "method": "GET"},
+            {"name": "items", "endpoint": f"{self.url}/items/{{count}}", "method": "GET", "extract": {"id": "$.id"}},
+            {"name": "events", "endpoint": f"{self.url}/stream/{{count}}", "method": "GET", "stream": "ndjson"}
+        ]})
+        parser = argparse.ArgumentParser()
+        skelerest.addParsers(parser.add_subparsers(dest="job"))
+
+        def execute(argv):
+            args = parser.parse_args(argv + ["--no-daemon"])
+            args.sr_stdout = io.StringIO()
+            skelerest.execute(None, args)
+            return args.sr_stdout.getvalue()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            batch = os.path.join(tmp_dir, "batch.jsonl")
+            with open(batch, "w") as batch_file:
+                batch_file.writelines([json.dumps({"id": i}) + "\n" for i in range(20)])
+
+            lines = [json.loads(line) for line in execute(["get-echo", "--format", "jsonl", "--concurrency", "4",
+                                                           "--batch", batch]).splitlines()]
+            paths = sorted([json.loads(line["body"])["path"] for line in lines if ("body" in line)])
+            self.assertEqual(paths, sorted([f"/echo/{i}" for i in range(20)]))
+
+        output = execute(["get-items", "--format", "csv", "--count", "3"])
+        self.assertEqual(output, "id\n0\n1\n2\n")
+
+        lines = [json.loads(line) for line in execute(["get-events", "--format", "jsonl", "--count", "3"]).splitlines()]
+        self.assertEqual([line["event"]["data"]["index"] for line in lines[:3]], [0, 1, 2])
+        self.assertEqual(lines[3]["events"], 3)
+
+    def test_execute_stalled(self):
+        skelerest = Skelerest.load({"requests": [
+            {"name": "events", "endpoint": f"{self.url}/stream/2?chunked=0&interval=1000", "method": "GET", "stream": "ndjson"}
+        ]})
+        parser = argparse.ArgumentParser()
+        skelerest.addParsers(parser.add_subparsers(dest="job"))
+
+        # A stream that stalls past the read timeout is reported as a failed request
+        args = parser.parse_args(["get-events", "--format", "jsonl", "--read-timeout", "0.2", "--no-daemon"])
+        args.sr_stdout = io.StringIO()
+        args.sr_stderr = io.StringIO()
+        with self.assertRaises(SystemExit) as context:
+            skelerest.execute(None, args)
+
+        self.assertEqual(context.exception.code, 1)
+        self.assertEqual(json.loads(args.sr_stdout.getvalue().splitlines()[0])["event"]["data"]["index"], 0)
+        self.assertIn("Read timed out", args.sr_stderr.getvalue())
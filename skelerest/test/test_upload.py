@@ -0,0 +1,74 @@
+import os
+import hashlib
+import tempfile
+import unittest
+from ..upload import FileSegment, StreamingBody, file_body, multipart_body
+
+class TestUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "model.bin")
+        self.content = bytes(range(256)) * 100
+        with open(self.path, "wb") as upload_file:
+            upload_file.write(self.content)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_file_body(self):
+        body = file_body(self.path)
+
+        self.assertEqual(len(body), len(self.content))
+        self.assertEqual(body.content_type, "application/octet-stream")
+        self.assertEqual(str(body), f"<file {self.path}>")
+        self.assertEqual(body.digest(), hashlib.sha256(self.content).hexdigest())
+        self.assertEqual(b"".join(body), self.content)
+        self.assertIsNone(body.handle)
+        self.assertEqual(body.read(10), b"")
+
+    def test_read(self):
+        body = StreamingBody([b"head", FileSegment(self.path), b"tail"], "text/plain", "test")
+
+        chunks = []
+        chunk = body.read(7)
+        self.assertIsNotNone(body.handle)
+        while (chunk):
+            self.assertLessEqual(len(chunk), 7)
+            chunks.append(chunk)
+            chunk = body.read(7)
+
+        self.assertEqual(b"".join(chunks), b"head" + self.content + b"tail")
+        self.assertEqual(len(body), len(self.content) + 8)
+        self.assertIsNone(body.handle)
+
+    def test_close(self):
+        body = file_body(self.path, "text/csv")
+        body.read(10)
+        body.close()
+
+        self.assertIsNone(body.handle)
+        self.assertEqual(body.content_type, "text/csv")
+
+    def test_multipart_body(self):
+        parts = [
+            {"name": "tag", "value": "v1"},
+            {"name": "model", "file": self.path},
+            {"name": "data", "file": self.path, "filename": "data.csv"},
+            {"name": "raw", "file": self.path, "filename": "raw", "contentType": "text/plain"}
+        ]
+        body = multipart_body(parts, "xyz")
+        content = b"".join(body)
+
+        self.assertEqual(body.content_type, "multipart/form-data; boundary=xyz")
+        self.assertEqual(len(body), len(content))
+        self.assertEqual(body.digest(), hashlib.sha256(content).hexdigest())
+        self.assertEqual(str(body), f"<multipart/form-data tag=v1, model=<file {self.path}>, data=<file {self.path}>, raw=<file {self.path}>>")
+        self.assertTrue(content.startswith(b'--xyz\r\nContent-Disposition: form-data; name="tag"\r\n\r\nv1\r\n'))
+        self.assertIn(b'name="model"; filename="model.bin"\r\nContent-Type: application/octet-stream\r\n\r\n' + self.content + b"\r\n", content)
+        self.assertIn(b'name="data"; filename="data.csv"\r\nContent-Type: text/csv\r\n\r\n', content)
+        self.assertIn(b'name="raw"; filename="raw"\r\nContent-Type: text/plain\r\n\r\n', content)
+        self.assertTrue(content.endswith(b"\r\n--xyz--\r\n"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+from ..watch import Watch
+
+class TestWatch(unittest.TestCase):
+
+    def response(self, status, content=b"", headers=None):
+        text = content.decode("utf-8")
+        return mock.MagicMock(status_code=status, ok=(status < 400), content=content, text=text,
+                              headers={} if (headers is None) else headers)
+
+    def test_observe(self):
+        watch = Watch(1, '$.status == "done"')
+        self.assertEqual(watch.get_headers(), {})
+        self.assertEqual(watch.max_interval, 8)
+
+        self.assertTrue(watch.observe(self.response(200, b'{"status": "running"}', {"ETag": '"v1"'})))
+        self.assertEqual(watch.get_headers(), {"If-None-Match": '"v1"'})
+        self.assertEqual(watch.delay, 1)
+
+        self.assertFalse(watch.observe(self.response(304)))
+        self.assertFalse(watch.observe(self.response(200, b'{"status": "running"}', {"Last-Modified": "Mon"})))
+        self.assertEqual(watch.get_headers(), {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"})
+        self.assertEqual(watch.delay, 4)
+        watch.observe_error()
+        watch.observe_error()
+        self.assertEqual(watch.delay, 8)
+        self.assertFalse(watch.done)
+
+        self.assertTrue(watch.observe(self.response(200, b'{"status": "done"}')))
+        self.assertEqual(watch.delay, 1)
+        self.assertTrue(watch.done)
+        self.assertEqual((watch.polls, watch.changes), (6, 2))
+
+    def test_observe_not_json(self):
+        watch = Watch(0.5, "$.status", max_interval=1)
+
+        self.assertTrue(watch.observe(self.response(200, b"done")))
+        self.assertFalse(watch.done)
+        self.assertTrue(watch.observe(self.response(500, b'{"status": "done"}')))
+        self.assertFalse(watch.done)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            Watch(0)
+        with self.assertRaises(ValueError):
+            Watch(1, "status == done")
+
+if __name__ == '__main__':
+    unittest.main()
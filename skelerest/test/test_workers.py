@@ -0,0 +1,73 @@
+import argparse
+import unittest
+from unittest import mock
+from ..skelerest import Skelerest
+from ..metrics import REGISTRY
+from ..workers import chunk_rows, init_worker, execute_chunk, WORKER
+
+class TestWorkers(unittest.TestCase):
+
+    CONFIG = {
+        "requests": [{
+            "name": "test-project",
+            "endpoint": "http://not a real {site}",
+            "method": "GET"
+        }]
+    }
+
+    def test_chunk_rows(self):
+        rows = [(i, {"id": i}) for i in range(5)]
+
+        self.assertEqual(list(chunk_rows(rows, size=2)), [rows[0:2], rows[2:4], rows[4:5]])
+        self.assertEqual(list(chunk_rows([], size=2)), [])
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_chunk(self, mock_req_api):
+        ok_response = mock.MagicMock()
+        ok_response.status_code = 200
+        ok_response.ok = True
+        error_response = mock.MagicMock()
+        error_response.status_code = 404
+        error_response.ok = False
+        mock_session = mock_req_api.Session.return_value
+        mock_session.get.side_effect = [ok_response, error_response]
+
+        skelerest = Skelerest.load(self.CONFIG)
+        parser = argparse.ArgumentParser()
+        subparsers = parser.add_subparsers(dest="job")
+        skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'jsonl', '--batch', 'batch.jsonl'])
+
+        REGISTRY.observe("other", "GET", 200, 0.1)
+        init_worker(skelerest, args)
+        self.assertIs(WORKER["skelerest"], skelerest)
+        self.assertIsNotNone(WORKER["execution"].coalescer)
+        self.assertIsNotNone(skelerest.session)
+
+        outcomes, output, metrics, code = execute_chunk([(3, {"site": "a"}), (4, {"site": "b"})])
+        skelerest.close_session()
+
+        self.assertEqual(outcomes, [(3, 200), (4, 404)])
+        self.assertEqual(len(output.splitlines()), 2)
+        self.assertEqual(metrics[0], {("get-test-project", "GET", "200"): 1, ("get-test-project", "GET", "404"): 1})
+        self.assertIsNone(code)
+        self.assertEqual(WORKER["execution"].metrics.counts, {})
+        REGISTRY.reset()
+
+    @mock.patch('skelerest.skelerest.request_api')
+    def test_execute_chunk_exit(self, mock_req_api):
+        skelerest = Skelerest.load(self.CONFIG)
+        parser = argparse.ArgumentParser()
+        subparsers = parser.add_subparsers(dest="job")
+        skelerest.addParsers(subparsers)
+        args = parser.parse_args(['get-test-project', '--format', 'quiet', '--batch', 'batch.jsonl'])
+
+        init_worker(skelerest, args)
+        outcomes, output, metrics, code = execute_chunk([(0, {"other": "a"})])
+        skelerest.close_session()
+
+        self.assertEqual(outcomes, [])
+        self.assertEqual(code, 1)
+
+if __name__ == '__main__':
+    unittest.main()
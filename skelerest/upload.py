@@ -0,0 +1,211 @@
+import os
+import uuid
+import hashlib
+import mimetypes
+
+CHUNK_SIZE = 1024 * 1024
+BINARY_TYPE = "application/octet-stream"
+MULTIPART_TYPE = "multipart/form-data"
+
+class FileSegment:
+    """ A segment of a streaming body that is read from a file on disk """
+
+    path = None
+
+    def __init__(self, path):
+        """
+        Initialize the segment with the path of its file (which is not opened until it is read)
+
+        Parameters
+        ----------
+        path : str
+            The path of the file
+        """
+
+        self.path = path
+
+    def __len__(self):
+        return os.path.getsize(self.path)
+
+class StreamingBody:
+    """
+    Request body that is streamed from disk in chunks rather than held in memory
+
+    The body is a sequence of segments (bytes held in memory and files read from disk) whose total
+    length is known before it is sent, so the request is sent with a Content-Length header while
+    only a single chunk of the body is ever held in memory. The files are opened lazily as the body
+    is read, and each file is closed as soon as it has been read to the end.
+    """
+
+    segments = None
+    content_type = None
+    description = None
+    position = None
+    offset = None
+    handle = None
+
+    def __init__(self, segments, content_type, description):
+        """
+        Initialize the body with its segments
+
+        Parameters
+        ----------
+        segments : list<bytes or FileSegment>
+            The segments of the body in order
+        content_type : str
+            The value of the Content-Type header of the body
+        description : str
+            The description of the body shown in place of its content (such as in the output)
+        """
+
+        self.segments = segments
+        self.content_type = content_type
+        self.description = description
+        self.position = 0
+        self.offset = 0
+
+    def __len__(self):
+        return sum([len(segment) for segment in self.segments])
+
+    def __str__(self):
+        return self.description
+
+    def __iter__(self):
+        chunk = self.read(CHUNK_SIZE)
+        while (chunk):
+            yield chunk
+            chunk = self.read(CHUNK_SIZE)
+
+    def read(self, size=-1):
+        """
+        Read the next chunk of the body
+
+        Parameters
+        ----------
+        size : int (optional)
+            The maximum number of bytes to read (the whole body if negative, which should be
+            avoided for large files)
+
+        Returns
+        -------
+        chunk : bytes
+            The next chunk of the body (empty once the whole body has been read)
+        """
+
+        chunks = []
+        while (self.position < len(self.segments)) and (size != 0):
+            segment = self.segments[self.position]
+            if (isinstance(segment, bytes)):
+                end = len(segment) if (size < 0) else min(len(segment), self.offset + size)
+                chunk = segment[self.offset:end]
+                self.offset = end
+                exhausted = (end >= len(segment))
+            else:
+                if (self.handle is None):
+                    self.handle = open(segment.path, "rb")
+                chunk = self.handle.read(size)
+                exhausted = (size < 0) or (len(chunk) < size)
+
+            if (exhausted):
+                self.__next_segment()
+            chunks.append(chunk)
+            if (size > 0):
+                size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def digest(self):
+        """
+        Calculate the SHA-256 hex digest of the whole body (in a separate pass over the files)
+
+        Returns
+        -------
+        digest : str
+            The hex digest used to sign the body
+        """
+
+        sha = hashlib.sha256()
+        for segment in self.segments:
+            if (isinstance(segment, bytes)):
+                sha.update(segment)
+                continue
+
+            with open(segment.path, "rb") as segment_file:
+                for chunk in iter(lambda: segment_file.read(CHUNK_SIZE), b""):
+                    sha.update(chunk)
+        return sha.hexdigest()
+
+    def close(self):
+        """ Close the file that is currently being read (if any) """
+
+        if (self.handle is not None):
+            self.handle.close()
+            self.handle = None
+
+    def __next_segment(self):
+        """ Move on to the next segment, closing the file of the current one """
+
+        self.close()
+        self.position += 1
+        self.offset = 0
+
+def file_body(path, content_type=None):
+    """
+    Build the body that streams a single file as the raw binary payload of a request
+
+    Parameters
+    ----------
+    path : str
+        The path of the file
+    content_type : str (optional)
+        The Content-Type of the file (DEFAULT: application/octet-stream)
+
+    Returns
+    -------
+    body : StreamingBody
+        The body that streams the file
+    """
+
+    content_type = BINARY_TYPE if (content_type is None) else content_type
+    return StreamingBody([FileSegment(path)], content_type, f"<file {path}>")
+
+def multipart_body(parts, boundary=None):
+    """
+    Build the multipart/form-data body of a request, with the file parts streamed from disk
+
+    Parameters
+    ----------
+    parts : list<dict>
+        The name and either the value or the file of each part, with an optional content type
+        and filename for file parts (see RestPart)
+    boundary : str (optional)
+        The boundary between the parts (DEFAULT: a random boundary)
+
+    Returns
+    -------
+    body : StreamingBody
+        The body that streams the parts
+    """
+
+    boundary = uuid.uuid4().hex if (boundary is None) else boundary
+    segments = []
+    described = []
+    for part in parts:
+        name = part["name"]
+        disposition = f'form-data; name="{name}"'
+        header = f"--{boundary}\r\nContent-Disposition: {disposition}"
+        if (part.get("file") is None):
+            segments.append(f"{header}\r\n\r\n{part['value']}\r\n".encode("utf-8"))
+            described.append(f"{name}={part['value']}")
+            continue
+
+        path = part["file"]
+        filename = part.get("filename") or os.path.basename(path)
+        content_type = part.get("contentType") or mimetypes.guess_type(filename)[0] or BINARY_TYPE
+        header = f'{header}; filename="{filename}"\r\nContent-Type: {content_type}\r\n\r\n'
+        segments.extend([header.encode("utf-8"), FileSegment(path), b"\r\n"])
+        described.append(f"{name}=<file {path}>")
+
+    segments.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return StreamingBody(segments, f"{MULTIPART_TYPE}; boundary={boundary}",
+                         f"<{MULTIPART_TYPE} {', '.join(described)}>")
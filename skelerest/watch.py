@@ -0,0 +1,128 @@
+import json
+import hashlib
+from .jsonpath import Condition
+
+BACKOFF_LIMIT = 8
+NOT_MODIFIED = 304
+
+class Watch:
+    """
+    Holds the state of a request that is polled until its response meets a condition
+
+    Every poll is sent as a conditional request with the validators (ETag and Last-Modified) of
+    the previous response, so that an unchanged resource can be answered with an empty 304 Not
+    Modified. Responses that are not modified (or whose body has not changed) are not written,
+    and the polling interval is doubled while the response stays the same (up to BACKOFF_LIMIT
+    times the interval), going back to the interval as soon as it changes.
+    """
+
+    interval = None
+    max_interval = None
+    condition = None
+    delay = None
+    etag = None
+    modified = None
+    digest = None
+    polls = None
+    changes = None
+    done = None
+
+    def __init__(self, interval, until=None, max_interval=None):
+        """
+        Initialize the watch with the polling interval and the condition that ends it
+
+        Parameters
+        ----------
+        interval : float
+            The number of seconds between polls while the response keeps changing
+        until : str (optional)
+            The JSONPath condition on the response body that ends the watch (see Condition)
+        max_interval : float (optional)
+            The maximum number of seconds between polls (DEFAULT: BACKOFF_LIMIT times the interval)
+
+        Raises
+        ------
+        ValueError
+            If the interval is not positive or the condition can not be parsed
+        """
+
+        if (interval <= 0):
+            raise ValueError("The watch interval must be a positive number of seconds")
+
+        self.interval = interval
+        self.max_interval = interval * BACKOFF_LIMIT if (max_interval is None) else max_interval
+        self.condition = None if (until is None) else Condition(until)
+        self.delay = interval
+        self.polls = 0
+        self.changes = 0
+        self.done = False
+
+    def get_headers(self):
+        """
+        Get the conditional headers built from the validators of the previous response
+
+        Returns
+        -------
+        headers : dict
+            The If-None-Match and/or If-Modified-Since headers (empty before the first response)
+        """
+
+        headers = {}
+        if (self.etag is not None):
+            headers["If-None-Match"] = self.etag
+        if (self.modified is not None):
+            headers["If-Modified-Since"] = self.modified
+        return headers
+
+    def observe(self, response):
+        """
+        Track the response to a poll, adapting the interval and checking the condition
+
+        Parameters
+        ----------
+        response : requests.Response
+            The response to the poll
+
+        Returns
+        -------
+        changed : bool
+            True if the response is different from the previous one (and should be written)
+        """
+
+        self.polls += 1
+        changed = False
+        if (response.status_code != NOT_MODIFIED):
+            content = response.content
+            if (not isinstance(content, bytes)):
+                content = str(content).encode("utf-8")
+            digest = hashlib.sha256(content).hexdigest()
+            changed = (digest != self.digest)
+            self.digest = digest
+            self.etag = response.headers.get("ETag", self.etag)
+            self.modified = response.headers.get("Last-Modified", self.modified)
+
+        if (changed):
+            self.changes += 1
+            self.delay = self.interval
+            self.done = self.__matches(response)
+        else:
+            self.delay = min(self.delay * 2, self.max_interval)
+        return changed
+
+    def observe_error(self):
+        """ Track a poll that failed without a response, backing off as if it was unchanged """
+
+        self.polls += 1
+        self.delay = min(self.delay * 2, self.max_interval)
+
+    def __matches(self, response):
+        """ Determine if the body of a response meets the condition of the watch """
+
+        if (self.condition is None) or (not response.ok):
+            return False
+
+        try:
+            document = json.loads(response.text)
+        except ValueError:
+            return False
+        return self.condition.matches(document)
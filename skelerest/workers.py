@@ -0,0 +1,92 @@
+import io
+from .output import get_writer
+
+CHUNK_SIZE = 64
+WORKER = {}
+
+def chunk_rows(rows, size=CHUNK_SIZE):
+    """
+    Group the rows of a batch into chunks that are handed to the worker processes
+
+    Parameters
+    ----------
+    rows : iterable<tuple>
+        The offset and variable values of each row of the batch
+    size : int (optional)
+        The maximum number of rows in each chunk
+
+    Returns
+    -------
+    chunks : generator<list>
+        The lists of rows in the order they appear in the batch
+    """
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if (len(chunk) >= size):
+            yield chunk
+            chunk = []
+
+    if (chunk):
+        yield chunk
+
+def init_worker(skelerest, args, expires=None):
+    """
+    Initialize a worker process with its own copy of the component, its pooled session, and its
+    execution state (such as the circuit breakers and the coalescer) that is kept across chunks
+
+    Parameters
+    ----------
+    skelerest : Skelerest
+        The component holding the request that is executed for each row
+    args : argparse.Namespace
+        The arguments passed through the CLI
+    expires : float (optional)
+        The time (from time.monotonic) at which the deadline of the run passes
+    """
+
+    # Each worker process has its own pool, so the scheduler of the parent process is not shared
+    skelerest.scheduler = None
+    skelerest.open_session()
+    WORKER["skelerest"] = skelerest
+    WORKER["execution"] = skelerest.get_execution(args, expires=expires)
+
+def execute_chunk(chunk):
+    """
+    Execute the request for a chunk of rows inside of a worker process
+
+    The output of the chunk is rendered into a string (so that the main process can write the
+    output of every chunk in the order of the batch) and the metrics recorded in the worker are
+    handed back to be merged into the metrics of the command in the main process.
+
+    Parameters
+    ----------
+    chunk : list<tuple>
+        The offset and variable values of each row in the chunk
+
+    Returns
+    -------
+    outcomes : list<tuple>
+        The offset and status of each row that was executed
+    output : str
+        The output written for the rows in the chunk
+    metrics : tuple
+        The counters and histograms recorded while executing the chunk
+    code : int
+        The exit code if a row stopped the batch (None otherwise)
+    """
+
+    skelerest = WORKER["skelerest"]
+    execution = WORKER["execution"]
+    stream = io.StringIO()
+    execution.writer = get_writer(execution.args.sr_format, stream=stream)
+    outcomes = []
+    code = None
+    try:
+        outcomes = skelerest.execute_rows(execution, chunk, outcomes)
+    except SystemExit as error:
+        code = error.code
+
+    execution.writer.flush()
+    return outcomes, stream.getvalue(), execution.metrics.collect(), code